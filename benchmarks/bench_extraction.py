@@ -0,0 +1,143 @@
+"""
+Benchmark of per-page HTML extraction.
+
+Compares the CPU time of extracting text, links, images, metadata and the
+canonical URL from a page with one parse (html_extractor.extract_page)
+against the previous approach of one BeautifulSoup parse per field, and
+checks that both produce the same data. The single pass is also timed with
+each installed parser backend.
+
+Usage:
+    python benchmarks/bench_extraction.py [--pages N] [--rounds N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, List
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.html_extractor import HTMLExtractor, LexborHTMLParser, clean_text, extract_page, lxml_html
+
+SITE_URL = "https://example.com/"
+
+WORDS = ("freight rates shipping port container vessel market demand capacity carrier "
+         "the of and to in for on with by from about after week year report").split()
+
+
+def make_page(rng: random.Random, paragraphs: int) -> str:
+    """Build a news-like article page with navigation, text, links and images."""
+    def sentence(words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    nav = "".join(f'<li><a href="/section/{i}">{sentence(2)}</a></li>' for i in range(20))
+    body = []
+    for i in range(paragraphs):
+        body.append(f"<p>{sentence(25)} <a href=\"/news/story-{rng.randint(1, 10 ** 6)}\">{sentence(4)}</a> "
+                    f"{sentence(15)}</p>")
+        if i % 5 == 0:
+            body.append(f'<figure><img src="/img/{i}.jpg" alt="{sentence(3)}"><figcaption>{sentence(6)}'
+                        f"</figcaption></figure>")
+    return (
+        "<!DOCTYPE html><html><head><title>" + sentence(6) + "</title>"
+        '<meta charset="utf-8"><meta name="description" content="' + sentence(12) + '">'
+        '<meta property="og:type" content="article"><link rel="canonical" href="/news/article">'
+        "<style>body { font-family: sans-serif; }</style>"
+        "<script>window.dataLayer = [];</script></head><body>"
+        f"<nav><ul>{nav}</ul></nav><article><h1>{sentence(8)}</h1>{''.join(body)}</article>"
+        '<footer><a href="https://other.com/">Partner</a> <a href="#top">Top</a></footer>'
+        "<!-- rendered by cms --></body></html>"
+    )
+
+
+def extract_per_field(html: str, page_url: str, site_url: str) -> Dict[str, Any]:
+    """Extract the page data with one parse per field, as the crawler used to."""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = clean_text(soup.get_text())
+
+    links = []
+    for link in BeautifulSoup(html, "html.parser").find_all("a", href=True):
+        href = link["href"]
+        if not href or href.startswith("#") or href.startswith("javascript:"):
+            continue
+        absolute_url = urllib.parse.urljoin(page_url, href)
+        if absolute_url.startswith(site_url):
+            links.append(absolute_url)
+
+    images = [{"url": urllib.parse.urljoin(page_url, img["src"]), "alt_text": img.get("alt", "")}
+              for img in BeautifulSoup(html, "html.parser").find_all("img", src=True)]
+
+    soup = BeautifulSoup(html, "html.parser")
+    metadata = {}
+    title_tag = soup.find("title")
+    if title_tag:
+        metadata["title"] = title_tag.string
+    for meta in soup.find_all("meta"):
+        name, property_name, content = meta.get("name"), meta.get("property"), meta.get("content")
+        if name and content:
+            metadata[name] = content
+        elif property_name and content:
+            metadata[property_name] = content
+
+    canonical_url = None
+    for link in BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("link")).find_all("link", href=True):
+        if "canonical" in [rel.lower() for rel in link.get("rel", [])]:
+            canonical_url = urllib.parse.urljoin(page_url, link["href"])
+            break
+
+    return {"text": text, "links": links, "images": images, "metadata": metadata, "canonical_url": canonical_url}
+
+
+def extract_single_pass(html: str, page_url: str, site_url: str) -> Dict[str, Any]:
+    """Extract the page data with one parse."""
+    extracted = extract_page(html, page_url, site_url)
+    del extracted["link_contexts"], extracted["main_text"]
+    return extracted
+
+
+def cpu_time_per_page(extract: Callable[[str, str, str], Dict[str, Any]], pages: List[str], rounds: int) -> float:
+    """Get the best mean CPU time per page in milliseconds over several rounds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.process_time()
+        for html in pages:
+            extract(html, SITE_URL + "news/article", SITE_URL)
+        best = min(best, (time.process_time() - start) / len(pages))
+    return best * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a table of CPU times per page size."""
+    parser = argparse.ArgumentParser(description="Benchmark single-pass HTML extraction")
+    parser.add_argument("--pages", type=int, default=20, help="Pages per size")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per measurement (the best is kept)")
+    args = parser.parse_args()
+
+    parsers = [parser for parser, installed in (("lxml", lxml_html), ("selectolax", LexborHTMLParser)) if installed]
+    extractors = {parser: HTMLExtractor(parser) for parser in parsers}
+
+    rng = random.Random(0)
+    print(f"{'page size':>10} {'per-field ms':>13} {'single-pass ms':>15} {'saving':>7}"
+          + "".join(f" {parser + ' ms':>14}" for parser in parsers))
+    for paragraphs in (10, 50, 200):
+        pages = [make_page(rng, paragraphs) for _ in range(args.pages)]
+        for html in pages:
+            assert extract_per_field(html, SITE_URL, SITE_URL) == extract_single_pass(html, SITE_URL, SITE_URL)
+        size = sum(len(html) for html in pages) // len(pages)
+        per_field = cpu_time_per_page(extract_per_field, pages, args.rounds)
+        single_pass = cpu_time_per_page(extract_single_pass, pages, args.rounds)
+        backends = [cpu_time_per_page(extractors[parser].extract, pages, args.rounds) for parser in parsers]
+        print(f"{size // 1024:>8}KB {per_field:>13.2f} {single_pass:>15.2f} {1 - single_pass / per_field:>7.0%}"
+              + "".join(f" {cpu_ms:>14.2f}" for cpu_ms in backends))
+
+
+if __name__ == "__main__":
+    main()
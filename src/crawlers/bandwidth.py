@@ -0,0 +1,74 @@
+"""
+Per-run accounting of transferred bytes.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+
+def _new_counter() -> Dict[str, Any]:
+    """Create an empty byte counter."""
+    return {"responses": 0, "wire_bytes": 0, "decoded_bytes": 0, "encodings": {}}
+
+
+def _add(counter: Dict[str, Any], wire_bytes: int, decoded_bytes: int, encoding: str) -> None:
+    """Add one response to a byte counter."""
+    counter["responses"] += 1
+    counter["wire_bytes"] += wire_bytes
+    counter["decoded_bytes"] += decoded_bytes
+    counter["encodings"][encoding] = counter["encodings"].get(encoding, 0) + 1
+
+
+def _report(counter: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a byte counter and add its compression ratio."""
+    decoded = counter["decoded_bytes"]
+    return {
+        **counter,
+        "encodings": dict(counter["encodings"]),
+        "compression_ratio": counter["wire_bytes"] / decoded if decoded else None
+    }
+
+
+class BandwidthMeter:
+    """Counts compressed (wire) and uncompressed (decoded) body bytes per host and content type."""
+
+    def __init__(self):
+        """Initialize the meter."""
+        self._lock = threading.Lock()
+        self._total = _new_counter()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._content_types: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, host: str, content_type: str, wire_bytes: int, decoded_bytes: int,
+               content_encoding: Optional[str] = None) -> None:
+        """
+        Record the body of one response.
+
+        Args:
+            host: Host the response came from
+            content_type: MIME type of the response
+            wire_bytes: Body bytes received from the network
+            decoded_bytes: Body bytes after transfer decoding
+            content_encoding: Content-Encoding of the response (None for identity)
+        """
+        encoding = (content_encoding or "identity").strip().lower()
+        with self._lock:
+            _add(self._total, wire_bytes, decoded_bytes, encoding)
+            _add(self._hosts.setdefault(host, _new_counter()), wire_bytes, decoded_bytes, encoding)
+            _add(self._content_types.setdefault(content_type, _new_counter()), wire_bytes, decoded_bytes, encoding)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the byte totals.
+
+        Returns:
+            Dict[str, Any]: Totals for the run and per host and content type, each with
+                responses, wire_bytes, decoded_bytes, encodings and compression_ratio
+        """
+        with self._lock:
+            return {
+                "total": _report(self._total),
+                "hosts": {host: _report(counter) for host, counter in self._hosts.items()},
+                "content_types": {
+                    content_type: _report(counter) for content_type, counter in self._content_types.items()
+                }
+            }
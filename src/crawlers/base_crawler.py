@@ -1,18 +1,48 @@
 import os
 import random
+import threading
 import time
+import functools
+import itertools
+import posixpath
 import requests
 import hashlib
+import urllib.parse
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, Iterator, List, Optional, Any, Set, Tuple, Union
 
 import src.utils.config as config
+from src.crawlers.bandwidth import BandwidthMeter
+from src.crawlers.fetch_engine import AsyncFetchEngine
+from src.crawlers.politeness import PolitenessScheduler
+from src.crawlers.revisit import RevisitIndex
+from src.crawlers.retry_policy import PROBE_POLL_SECONDS, CircuitBreaker, HTTPStatusError, RetryPolicy, parse_retry_after
+from src.crawlers.robots import RobotsCache, RobotsRules
+from src.crawlers.transport import get_transport, get_wire_bytes
+from src.crawlers.validator_cache import ValidatorStore
+from src.crawlers.warc import TeeStream, WarcArchive, WarcWriter, build_response
+from src.crawlers.html_stream import extract_stream
+from src.utils.encoding import decode_html, iter_decoded
+from src.utils.url_utils import get_host
+
+
+FETCH_MODES = ("live", "record", "replay")
+
+# Headers that no longer describe a body stored after transfer decoding
+_DECODED_BODY_HEADERS = frozenset(["content-encoding", "transfer-encoding", "content-length"])
 
 
 class BaseCrawler(ABC):
     """Base crawler class that all specific crawlers will inherit from."""
     
+    # Shared by all crawlers so that requests to the same host are spaced out,
+    # robots.txt is fetched once per host and a failing host is paused for
+    # every crawler instance
+    scheduler = PolitenessScheduler()
+    robots_cache = RobotsCache()
+    circuit_breaker = CircuitBreaker()
+    
     def __init__(self, website_config: Dict[str, Any]):
         """
         Initialize the base crawler with website configuration.
@@ -22,22 +52,95 @@ class BaseCrawler(ABC):
                 - name: Website name
                 - url: Base URL
                 - dynamic: Whether the website uses JavaScript rendering
+                - max_concurrency: Maximum requests in flight (optional)
+                - per_host_concurrency: Maximum requests in flight per host (optional)
+                - rate: Requests per second allowed to the host (optional)
+                - burst: Requests the host may receive back to back (optional)
+                - conditional_requests: Whether re-crawls revalidate with ETag/Last-Modified
+                  (default: True)
+                - max_page_bytes: Maximum bytes read per page (default: config.MAX_PAGE_BYTES)
+                - stream_max_page_bytes: Maximum bytes read per streamed page
+                  (default: config.STREAM_MAX_PAGE_BYTES)
+                - fetch_mode: "live", "record" or "replay" (default: config.FETCH_MODE)
+                - revisit_scheduling: Whether re-crawls only re-fetch known pages likely
+                  to have changed (default: config.REVISIT_SCHEDULING)
         """
         self.name = website_config.get("name", "")
         self.base_url = website_config.get("url", "")
+        self.host = get_host(self.base_url)
         self.is_dynamic = website_config.get("dynamic", False)
-        self.session = requests.Session()
         self.user_agents = config.USER_AGENTS
+        self.user_agent: Optional[str] = None
         self.delay = config.REQUEST_DELAY
         self.max_retries = config.MAX_RETRIES
+        self.retry_policy = RetryPolicy(self.max_retries)
+        self.metrics: Dict[str, Any] = {}
+        self._metrics_lock = threading.Lock()
+        self.fetch_engine = AsyncFetchEngine(
+            website_config.get("max_concurrency", config.MAX_CONCURRENT_REQUESTS),
+            website_config.get("per_host_concurrency", config.MAX_REQUESTS_PER_HOST)
+        )
+        # Connection pools are shared across crawlers and sized so every
+        # request in flight to a host can keep its connection alive
+        self.transport = get_transport(self.fetch_engine.per_host_concurrency)
+        self.bandwidth = BandwidthMeter()
+        self.scheduler.configure(
+            self.host,
+            website_config.get("rate"),
+            website_config.get("burst")
+        )
+        self.fetch_mode = website_config.get("fetch_mode", config.FETCH_MODE)
+        if self.fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode: {self.fetch_mode}")
+        # Recordings must hold full responses and replays must reprocess every
+        # page, so revalidation is only used for live crawls
+        self.conditional_requests = (website_config.get("conditional_requests", True)
+                                     and self.fetch_mode == "live")
+        self._warc_writer: Optional[WarcWriter] = None
+        self._warc_archive: Optional[WarcArchive] = None
+        self.max_page_bytes = website_config.get("max_page_bytes", config.MAX_PAGE_BYTES)
+        # Pages larger than this many bytes are extracted while they download
+        # (None: always buffered); subclasses that use the extracted data set it
+        self.stream_threshold: Optional[int] = None
+        self.stream_max_page_bytes = website_config.get("stream_max_page_bytes", config.STREAM_MAX_PAGE_BYTES)
+        # Characters of text kept around each link of a streamed page (None: no link contexts)
+        self.link_context_chars: Optional[int] = None
+        # Whether streamed pages also have their main content extracted
+        self.main_content = False
+        self._validator_store: Optional[ValidatorStore] = None
+        # Pages that are not re-fetched are served from their stored
+        # validators and links, so this needs conditional requests
+        self.revisit_scheduling = (website_config.get("revisit_scheduling", config.REVISIT_SCHEDULING)
+                                   and self.conditional_requests)
+        self._revisit_index: Optional[RevisitIndex] = None
+        # Known URLs picked for re-fetching in this run (None: every URL)
+        self._revisit_due: Optional[Set[str]] = None
         
         # Set random user agent
         self._rotate_user_agent()
     
     def _rotate_user_agent(self) -> None:
-        """Rotate the user agent for the session."""
+        """Rotate the user agent sent with this crawler's requests."""
         if self.user_agents:
-            self.session.headers.update({"User-Agent": random.choice(self.user_agents)})
+            self.user_agent = random.choice(self.user_agents)
+    
+    def _get_request_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Build the headers of a request.
+        
+        The transport is shared by all crawlers, so the user agent is sent
+        per request rather than set on a session.
+        
+        Args:
+            headers: Extra request headers (optional)
+            
+        Returns:
+            Dict[str, str]: Request headers
+        """
+        request_headers = dict(headers or {})
+        if self.user_agent:
+            request_headers["User-Agent"] = self.user_agent
+        return request_headers
     
     def _respect_robots_txt(self, url: str) -> bool:
         """
@@ -49,9 +152,252 @@ class BaseCrawler(ABC):
         Returns:
             bool: True if allowed, False otherwise
         """
-        # TODO: Implement robots.txt checking
-        # This is a placeholder implementation
-        return True
+        return self._get_robots_rules(url).is_allowed(url)
+    
+    def _get_robots_rules(self, url: str) -> RobotsRules:
+        """
+        Get the compiled robots.txt rules for the host of a URL.
+        
+        Any Crawl-delay is applied to the host's request spacing.
+        
+        Args:
+            url: Any URL on the host
+            
+        Returns:
+            RobotsRules: Compiled rules from the shared cache
+        """
+        rules = self.robots_cache.get_rules(url, self._fetch_robots_txt)
+        if rules.crawl_delay:
+            self.scheduler.limit_rate(get_host(url), 1.0 / rules.crawl_delay)
+        return rules
+    
+    def _fetch_robots_txt(self, robots_url: str) -> Optional[Tuple[int, str]]:
+        """
+        Download a robots.txt file.
+        
+        Args:
+            robots_url: URL of the robots.txt file
+            
+        Returns:
+            Optional[Tuple[int, str]]: Status code and body, or None if the host is unreachable
+        """
+        try:
+            if self.fetch_mode != "replay":
+                self.scheduler.wait(robots_url)
+            response = self._send_request(robots_url, page=False)
+            text = response.text
+            self._account_transfer(robots_url, response, len(response.content))
+            return response.status_code, text
+        except requests.RequestException as e:
+            print(f"Failed to fetch {robots_url}: {str(e)}")
+            return None
+    
+    def _record_metric(self, name: str, amount: int = 1) -> None:
+        """
+        Increment a crawl metric; safe to call from fetch threads.
+        
+        Args:
+            name: Metric name
+            amount: Amount to add
+        """
+        with self._metrics_lock:
+            self.metrics[name] = self.metrics.get(name, 0) + amount
+    
+    def _fetch_with_retries(self, url: str, attempt_fetch: Callable[[str], Optional[Dict[str, Any]]],
+                            slot_reserved: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Run fetch attempts under the retry policy and the host's circuit breaker.
+        
+        Retryable errors (timeouts, connection errors, 429 and 5xx responses) are
+        retried after a jittered exponential backoff that honours Retry-After;
+        other errors fail the URL at once. Failed attempts, failed URLs and
+        breaker trips are counted in the metrics.
+        
+        Args:
+            url: URL to fetch
+            attempt_fetch: Performs one attempt; raises on failure
+            slot_reserved: Whether the caller already waited for the first request slot
+            
+        Returns:
+            Optional[Dict[str, Any]]: Result of the successful attempt or None if failed
+        """
+        for attempt in range(self.retry_policy.max_attempts):
+            allowed = self.circuit_breaker.allow_request(url)
+            # Another request is probing the half-open circuit; its outcome
+            # decides whether this one is sent
+            while not allowed and self.circuit_breaker.is_probing(url):
+                time.sleep(PROBE_POLL_SECONDS)
+                allowed = self.circuit_breaker.allow_request(url)
+            if not allowed:
+                print(f"Circuit open for {get_host(url)}, not fetching {url}")
+                break
+            started = time.monotonic()
+            
+            # Wait for a request slot on this host; replays send no requests
+            if self.fetch_mode != "replay" and (attempt > 0 or not slot_reserved):
+                self.scheduler.wait(url)
+            
+            try:
+                result = attempt_fetch(url)
+            except Exception as e:
+                print(f"Attempt {attempt + 1}/{self.retry_policy.max_attempts} failed for {url}: {str(e)}")
+                self._record_metric("failed_attempts")
+                
+                if self.retry_policy.is_host_failure(e):
+                    if self.circuit_breaker.record_failure(url, started):
+                        print(f"Circuit opened for {get_host(url)} after repeated failures")
+                        self._record_metric("breaker_trips")
+                elif self.retry_policy.is_host_response(e):
+                    # The host answered, so a probe of it succeeded
+                    self.circuit_breaker.record_success(url)
+                
+                if not self.retry_policy.is_retryable(e) or attempt + 1 >= self.retry_policy.max_attempts:
+                    break
+                error = e
+            else:
+                self.circuit_breaker.record_success(url)
+                return result
+            finally:
+                # A probe must not stay pending whatever the attempt's outcome
+                self.circuit_breaker.release_probe(url, started)
+            
+            time.sleep(self.retry_policy.get_delay(attempt, error))
+        
+        self._record_metric("failed_crawls")
+        return None
+    
+    def _get_warc_dir(self) -> str:
+        """Get the directory holding this website's WARC archives."""
+        return os.path.join(config.WARC_DIR, self.name or self.host)
+    
+    def _get_warc_archive(self) -> WarcArchive:
+        """Get the index of recorded responses, building it on first use."""
+        if self._warc_archive is None:
+            self._warc_archive = WarcArchive(self._get_warc_dir())
+            print(f"Replaying {len(self._warc_archive)} recorded responses from {self._get_warc_dir()}")
+        return self._warc_archive
+    
+    def _get_warc_writer(self) -> WarcWriter:
+        """Get the writer for this crawler's recording, creating it on first use."""
+        if self._warc_writer is None:
+            timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+            filename = f"{self.name or self.host}-{timestamp}-{os.getpid()}.warc.gz"
+            self._warc_writer = WarcWriter(os.path.join(self._get_warc_dir(), filename))
+        return self._warc_writer
+    
+    def _send_request(self, url: str, headers: Optional[Dict[str, str]] = None,
+                      page: bool = True) -> requests.Response:
+        """
+        Send a GET request according to the fetch mode.
+        
+        In replay mode the response comes from the WARC archives and URLs that
+        were never recorded are answered with a 404. In record mode the live
+        response is written to the archive and returned from memory.
+        
+        Args:
+            url: URL to fetch
+            headers: Extra request headers (optional)
+            page: Whether the URL is a page (streamed and size-limited) rather than
+                an auxiliary file such as robots.txt
+            
+        Returns:
+            requests.Response: The response; page bodies are streamed in live mode
+        """
+        if self.fetch_mode == "replay":
+            archived = self._get_warc_archive().get_response(url)
+            if archived is None:
+                return build_response(url, 404, "Not Recorded", [], b"")
+            return build_response(url, *archived)
+        
+        response = self.transport.get(url, headers=self._get_request_headers(headers), timeout=30, stream=True)
+        if self.fetch_mode == "record":
+            response = self._record_response(url, response, page)
+        return response
+    
+    def _record_response(self, url: str, response: requests.Response, page: bool) -> requests.Response:
+        """
+        Write a live response to the WARC archive.
+        
+        Page bodies are read one byte past the page byte limit, so a replay
+        truncates them exactly like the live crawl did. Bodies of error
+        responses and of pages that would be skipped are not stored. Other
+        bodies, such as sitemaps, are recorded as the caller streams them.
+        
+        Args:
+            url: Requested URL
+            response: Streamed live response
+            page: Whether the URL is a page (see _send_request)
+            
+        Returns:
+            requests.Response: Equivalent response read from memory, or streamed
+                through to the archive for bodies other than pages
+        """
+        if not page:
+            return self._tee_response(url, response)
+        
+        body, truncated = b"", False
+        headers = list(response.headers.items())
+        try:
+            if response.status_code < 300 and not self._get_skip_reason(response):
+                body, truncated = self._read_body(response, self._get_page_byte_limit() + 1)
+            self._account_transfer(url, response, len(body))
+        finally:
+            response.close()
+        
+        if body:
+            # The stored body is already decoded and possibly cut off
+            headers = [(name, value) for name, value in headers if name.lower() not in _DECODED_BODY_HEADERS]
+            if not truncated:
+                headers.append(("Content-Length", str(len(body))))
+        
+        request = response.request
+        self._get_warc_writer().write_exchange(
+            url,
+            list(request.headers.items()) if request is not None else [],
+            response.status_code,
+            response.reason or "",
+            headers,
+            body,
+            truncated
+        )
+        return build_response(url, response.status_code, response.reason or "", headers, body)
+    
+    def _tee_response(self, url: str, response: requests.Response) -> requests.Response:
+        """
+        Stream a live response to the caller while copying its body to the WARC archive.
+        
+        The exchange is written once the caller has read the body or closed
+        the response; a body closed early is recorded as truncated.
+        
+        Args:
+            url: Requested URL
+            response: Streamed live response
+            
+        Returns:
+            requests.Response: Response streaming the decoded body
+        """
+        # The recorded and returned body is already decoded
+        headers = [(name, value) for name, value in response.headers.items()
+                   if name.lower() not in _DECODED_BODY_HEADERS]
+        request = response.request
+        
+        def _write_exchange(body, complete: bool) -> None:
+            length = body.tell()
+            self._account_transfer(url, response, length)
+            response.close()
+            self._get_warc_writer().write_exchange(
+                url,
+                list(request.headers.items()) if request is not None else [],
+                response.status_code,
+                response.reason or "",
+                headers + [("Content-Length", str(length))] if complete else headers,
+                body,
+                not complete
+            )
+        
+        chunks = response.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE)
+        return build_response(url, response.status_code, response.reason or "", headers,
+                              TeeStream(chunks, _write_exchange))
     
     def _get_url_hash(self, url: str) -> str:
         """
@@ -65,41 +411,437 @@ class BaseCrawler(ABC):
         """
         return hashlib.md5(url.encode()).hexdigest()
     
-    def get_page(self, url: str) -> Optional[str]:
+    def is_fetchable_url(self, url: str) -> bool:
         """
-        Get the HTML content of a page with retries and delays.
+        Check whether a URL may point to an HTML page, judging by its file extension.
         
         Args:
-            url: URL to fetch
+            url: URL to check
             
         Returns:
-            Optional[str]: HTML content of the page or None if failed
+            bool: False if the extension marks an obvious non-HTML resource
         """
-        if not self._respect_robots_txt(url):
-            print(f"URL {url} is not allowed by robots.txt")
-            return None
+        path = urllib.parse.urlsplit(url).path
+        extension = posixpath.splitext(path)[1].lower()
+        return extension not in config.NON_HTML_EXTENSIONS
+    
+    def _read_body(self, response: requests.Response, limit: Optional[int] = None) -> Tuple[bytes, bool]:
+        """
+        Read a streamed response body up to the page byte limit.
         
-        for attempt in range(self.max_retries):
-            try:
-                # Rotate user agent on each attempt
-                self._rotate_user_agent()
-                
-                # Add delay between requests
-                if attempt > 0:
-                    time.sleep(self.delay * (attempt + 1))  # Exponential backoff
-                
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                
-                # Add delay after successful request
-                time.sleep(self.delay)
-                
-                return response.text
-            except requests.RequestException as e:
-                print(f"Attempt {attempt + 1}/{self.max_retries} failed for {url}: {str(e)}")
+        Args:
+            response: Streamed response
+            limit: Maximum bytes to read (default: max_page_bytes)
+            
+        Returns:
+            Tuple[bytes, bool]: Body and whether it was truncated at the limit
+        """
+        limit = limit or self.max_page_bytes
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE):
+            if size + len(chunk) > limit:
+                chunks.append(chunk[:limit - size])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks), False
+    
+    def _account_transfer(self, url: str, response: requests.Response, decoded_bytes: int) -> None:
+        """
+        Count the body bytes of a network response in the crawl's bandwidth totals.
+        
+        Responses served from memory (recordings and replays) carry no wire
+        byte count and are not counted again.
+        
+        Args:
+            url: Requested URL
+            response: Response whose body has been read
+            decoded_bytes: Body bytes after transfer decoding
+        """
+        wire_bytes = get_wire_bytes(response)
+        if wire_bytes is None:
+            return
+        content_type = response.headers.get("Content-Type", "")
+        mime_type = content_type.split(";", 1)[0].strip().lower() or "unknown"
+        self.bandwidth.record(get_host(url), mime_type, wire_bytes, decoded_bytes,
+                              response.headers.get("Content-Encoding"))
+        self._record_metric("wire_bytes", wire_bytes)
+        self._record_metric("decoded_bytes", decoded_bytes)
+    
+    def _get_page_byte_limit(self) -> int:
+        """Get the most bytes read per page: max_page_bytes, or stream_max_page_bytes when streaming."""
+        return self.stream_max_page_bytes if self.stream_threshold else self.max_page_bytes
+    
+    def _get_skip_reason(self, response: requests.Response) -> Optional[str]:
+        """
+        Decide from the response headers whether the body should be downloaded.
+        
+        Args:
+            response: Streamed response whose body has not been read yet
+            
+        Returns:
+            Optional[str]: Reason to skip the page, or None to read it
+        """
+        content_type = response.headers.get("Content-Type", "")
+        mime_type = content_type.split(";", 1)[0].strip().lower()
+        if mime_type and mime_type not in config.HTML_CONTENT_TYPES:
+            return f"content type {mime_type}"
+        
+        content_length = response.headers.get("Content-Length", "")
+        limit = self._get_page_byte_limit()
+        if content_length.isdigit() and int(content_length) > limit:
+            return f"content length {content_length} exceeds {limit} bytes"
         
         return None
     
+    def _fetch_result(self, url: str, html: Optional[str] = None, status_code: Optional[int] = None,
+                      headers: Optional[Any] = None, **fields: Any) -> Dict[str, Any]:
+        """
+        Build a fetch result dictionary (see fetch_page).
+        
+        Args:
+            url: The URL
+            html: HTML content
+            status_code: HTTP status code
+            headers: Response headers
+            **fields: Any of encoding, not_modified, links, cached, skipped, truncated and extracted
+            
+        Returns:
+            Dict[str, Any]: Fetch result
+        """
+        return {
+            "url": url,
+            "html": html,
+            "status_code": status_code,
+            "headers": headers if headers is not None else {},
+            "encoding": fields.get("encoding"),
+            "not_modified": fields.get("not_modified", False),
+            "links": fields.get("links", []),
+            "cached": fields.get("cached", False),
+            "skipped": fields.get("skipped"),
+            "truncated": fields.get("truncated", False),
+            "extracted": fields.get("extracted")
+        }
+    
+    def _get_validator_store(self) -> ValidatorStore:
+        """Get the response validator store, opening it on first use."""
+        if self._validator_store is None:
+            self._validator_store = ValidatorStore()
+        return self._validator_store
+    
+    def _get_revisit_index(self) -> RevisitIndex:
+        """Get the page change history index, opening it on first use."""
+        if self._revisit_index is None:
+            self._revisit_index = RevisitIndex()
+        return self._revisit_index
+    
+    def select_revisits(self, budget: int) -> List[str]:
+        """
+        Pick the known pages of the website to re-fetch in this run.
+        
+        Other pages with a change history are treated as unchanged by
+        fetch_page(conditional=True) without sending a request.
+        
+        Args:
+            budget: Maximum number of known pages re-fetched
+            
+        Returns:
+            List[str]: URLs due for a re-fetch, most likely changed first
+        """
+        if not self.revisit_scheduling:
+            return []
+        due = [url for url, _ in self._get_revisit_index().select_due(self.base_url, budget)]
+        self._revisit_due = set(due)
+        return due
+    
+    def get_revisit_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get revisit scheduling statistics for the website.
+        
+        Returns:
+            Optional[Dict[str, Any]]: Tracked URLs, checks and detected changes, URLs due
+                and deferred in this run, and index size (None if scheduling is off)
+        """
+        if not self.revisit_scheduling:
+            return None
+        stats = self._get_revisit_index().get_stats(self.base_url)
+        stats["due"] = len(self._revisit_due) if self._revisit_due is not None else None
+        stats["deferred"] = self.metrics.get("revisits_deferred", 0)
+        return stats
+    
+    def _is_revisit_deferred(self, url: str) -> bool:
+        """Check whether a known page was left out of this run's revisits."""
+        if self._revisit_due is None or url in self._revisit_due:
+            return False
+        return self._get_url_hash(url) in self._get_revisit_index()
+    
+    def record_revisit(self, result: Dict[str, Any], content_hash: Optional[str]) -> None:
+        """
+        Add a fetched page to its change history for the revisit scheduler.
+        
+        Args:
+            result: Fetch result returned by fetch_page
+            content_hash: Hash of the page's text content (ignored for unchanged pages)
+        """
+        if not self.revisit_scheduling or result["skipped"] or result["cached"]:
+            return
+        if result["not_modified"]:
+            content_hash = None
+        elif content_hash is None:
+            return
+        url = result["url"]
+        self._get_revisit_index().record(self._get_url_hash(url), url, content_hash)
+    
+    def fetch_page(self, url: str, slot_reserved: bool = False, conditional: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a page with retries, per-host politeness and a per-host circuit breaker.
+        
+        The body is streamed: URLs with non-HTML extensions are skipped before any
+        request, responses with a non-HTML Content-Type or an oversized
+        Content-Length are skipped before the body is read, and other bodies are
+        cut off at max_page_bytes. When stream_threshold is set, larger pages are
+        extracted as they download instead (see _stream_page) and cut off at
+        stream_max_page_bytes.
+        
+        With conditional=True, validators stored by earlier crawls are used: while
+        the stored copy is fresh, or the revisit scheduler did not pick the page
+        for this run, no request is sent at all, otherwise the request carries
+        If-None-Match/If-Modified-Since and a 304 is reported as unchanged.
+        
+        Args:
+            url: URL to fetch
+            slot_reserved: Whether the caller already waited for the first request slot
+            conditional: Whether to revalidate against stored validators
+            
+        Returns:
+            Optional[Dict[str, Any]]: Fetch result or None if failed
+                - url: The URL
+                - html: HTML content (None if unchanged or streamed)
+                - status_code: HTTP status code
+                - headers: Response headers
+                - encoding: Codec the body was decoded with
+                - not_modified: Whether the page is unchanged since the last crawl
+                - links: Links stored for an unchanged page
+                - cached: Whether an unchanged page was served without a request
+                - skipped: Reason the page was not downloaded (None if it was)
+                - truncated: Whether the body was cut off at the page byte limit
+                - extracted: Page data of a streamed page (see html_stream.extract_stream;
+                  None otherwise)
+        """
+        if not self.is_fetchable_url(url):
+            return self._fetch_result(url, skipped="non-HTML extension")
+        
+        headers = {}
+        entry = None
+        
+        if conditional and self.conditional_requests:
+            store = self._get_validator_store()
+            entry = store.get(self._get_url_hash(url))
+            if store.is_fresh(entry):
+                return self._unchanged_result(url, entry, None)
+            if entry and self._is_revisit_deferred(url):
+                self._record_metric("revisits_deferred")
+                return self._unchanged_result(url, entry, None)
+            headers = store.get_conditional_headers(entry)
+        
+        attempt_fetch = functools.partial(self._fetch_once, headers=headers, entry=entry)
+        return self._fetch_with_retries(url, attempt_fetch, slot_reserved)
+    
+    def _fetch_once(self, url: str, headers: Dict[str, str], entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Make a single fetch attempt (see fetch_page).
+        
+        Args:
+            url: URL to fetch
+            headers: Extra request headers
+            entry: Stored validator entry used for the conditional request (optional)
+            
+        Returns:
+            Dict[str, Any]: Fetch result
+            
+        Raises:
+            HTTPStatusError: If the server answered with an error status
+            requests.RequestException: If the request failed
+        """
+        # Rotate user agent on each attempt
+        self._rotate_user_agent()
+        
+        response = self._send_request(url, headers)
+        
+        try:
+            if response.status_code == 304 and entry:
+                self._get_validator_store().refresh(self._get_url_hash(url), response.headers)
+                return self._unchanged_result(url, entry, response.headers)
+            
+            if response.status_code >= 400:
+                raise HTTPStatusError(response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+            
+            skip_reason = self._get_skip_reason(response)
+            if skip_reason:
+                return self._fetch_result(url, status_code=response.status_code,
+                                          headers=response.headers, skipped=skip_reason)
+            
+            return self._read_page(url, response)
+        finally:
+            response.close()
+    
+    def _read_page(self, url: str, response: requests.Response) -> Dict[str, Any]:
+        """
+        Read and decode a page body, streaming pages past stream_threshold.
+        
+        Args:
+            url: Requested URL
+            response: Streamed response to a page that is not skipped
+            
+        Returns:
+            Dict[str, Any]: Fetch result
+        """
+        if self.stream_threshold:
+            chunks = response.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE)
+            content_length = response.headers.get("Content-Length", "")
+            if content_length.isdigit() and int(content_length) > self.stream_threshold:
+                return self._stream_page(url, response, chunks)
+            
+            # Without a Content-Length, the page streams once it outgrows the threshold
+            head = []
+            size = 0
+            for chunk in chunks:
+                head.append(chunk)
+                size += len(chunk)
+                if size > self.stream_threshold:
+                    return self._stream_page(url, response, itertools.chain(head, chunks))
+            body, truncated = b"".join(head), False
+            del head
+        else:
+            body, truncated = self._read_body(response)
+        self._account_transfer(url, response, len(body))
+        
+        # Decode once from the raw bytes instead of response.text, which
+        # falls back to slow statistical guessing when no charset is sent
+        html, encoding = decode_html(body, response.headers.get("Content-Type"))
+        del body
+        return self._fetch_result(url, html, response.status_code, response.headers,
+                                  encoding=encoding, truncated=truncated)
+    
+    def _stream_page(self, url: str, response: requests.Response, chunks: Iterator[bytes]) -> Dict[str, Any]:
+        """
+        Extract a page's data while its body downloads, without keeping the body.
+        
+        The body is decoded and tokenized piece by piece, so memory stays bounded
+        however large the page is; it is cut off at stream_max_page_bytes.
+        
+        Args:
+            url: Requested URL
+            response: Streamed response to the page
+            chunks: Body chunks not read yet (including any already taken from the response)
+            
+        Returns:
+            Dict[str, Any]: Fetch result without HTML, with the page data in "extracted"
+        """
+        limit = self.stream_max_page_bytes
+        size = 0
+        truncated = False
+        
+        def _limited_chunks() -> Iterator[bytes]:
+            nonlocal size, truncated
+            for chunk in chunks:
+                if size + len(chunk) > limit:
+                    chunk = chunk[:limit - size]
+                    truncated = True
+                size += len(chunk)
+                yield chunk
+                if truncated:
+                    return
+        
+        encoding, pieces = iter_decoded(_limited_chunks(), response.headers.get("Content-Type"))
+        extracted = extract_stream(pieces, url, self.base_url, self.link_context_chars,
+                                   main_content=self.main_content)
+        self._account_transfer(url, response, size)
+        self._record_metric("streamed_pages")
+        return self._fetch_result(url, None, response.status_code, response.headers,
+                                  encoding=encoding, truncated=truncated, extracted=extracted)
+    
+    def _unchanged_result(self, url: str, entry: Dict[str, Any], headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Build the fetch result for a page that has not changed since the last crawl.
+        
+        Args:
+            url: The URL
+            entry: Stored validator entry
+            headers: Headers of the 304 response (None if no request was sent)
+            
+        Returns:
+            Dict[str, Any]: Fetch result with not_modified set
+        """
+        return self._fetch_result(url, status_code=304, headers=headers, not_modified=True,
+                                  links=entry["links"], cached=headers is None)
+    
+    def store_validators(self, result: Dict[str, Any], content_hash: Optional[str], links: List[str]) -> None:
+        """
+        Remember the validators of a fetched page for the next conditional crawl.
+        
+        Args:
+            result: Fetch result returned by fetch_page
+            content_hash: Hash of the page's text content (optional)
+            links: Links extracted from the page
+        """
+        if not self.conditional_requests or result["not_modified"] or result["skipped"]:
+            return
+        url = result["url"]
+        self._get_validator_store().update(self._get_url_hash(url), url, result["headers"], content_hash, links)
+    
+    def get_page(self, url: str, slot_reserved: bool = False) -> Optional[str]:
+        """
+        Get the HTML content of a page with retries and per-host politeness.
+        
+        Args:
+            url: URL to fetch
+            slot_reserved: Whether the caller already waited for the first request slot
+            
+        Returns:
+            Optional[str]: HTML content of the page or None if failed (or streamed,
+                see fetch_page)
+        """
+        result = self.fetch_page(url, slot_reserved=slot_reserved)
+        return result["html"] if result else None
+    
+    def _get_request_scheduler(self) -> Optional[PolitenessScheduler]:
+        """Get the politeness scheduler for outgoing requests (None when replaying)."""
+        return self.scheduler if self.fetch_mode != "replay" else None
+    
+    async def get_page_async(self, url: str) -> Optional[str]:
+        """
+        Async counterpart of get_page that runs under the fetch engine's concurrency caps.
+        
+        The politeness wait and any circuit breaker pause happen on the event
+        loop, so a rate-limited or failing host never ties up a fetch thread.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Optional[str]: HTML content of the page or None if failed
+        """
+        await self.circuit_breaker.wait_async(url)
+        fetch = functools.partial(self.get_page, slot_reserved=True)
+        return await self.fetch_engine.run(url, fetch, self._get_request_scheduler())
+    
+    async def fetch_page_async(self, url: str, conditional: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Async counterpart of fetch_page that runs under the fetch engine's concurrency caps.
+        
+        Args:
+            url: URL to fetch
+            conditional: Whether to revalidate against stored validators
+            
+        Returns:
+            Optional[Dict[str, Any]]: Fetch result or None if failed
+        """
+        await self.circuit_breaker.wait_async(url)
+        fetch = functools.partial(self.fetch_page, slot_reserved=True, conditional=conditional)
+        return await self.fetch_engine.run(url, fetch, self._get_request_scheduler())
+    
     @abstractmethod
     def crawl(self) -> Dict[str, Any]:
         """
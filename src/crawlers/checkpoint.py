@@ -0,0 +1,166 @@
+"""
+Crawl checkpoints for resuming long-running crawls.
+
+A checkpoint is one JSON document replaced atomically, so a crash while it is
+written leaves the previous checkpoint intact. Crawled pages go to an
+append-only spool whose length is recorded in the checkpoint.
+"""
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from src.crawlers.disk_frontier import DiskURLSet
+from src.crawlers.url_set import BloomURLSet
+
+CHECKPOINT_VERSION = 3
+
+
+def dump_url_set(urls: Any) -> Dict[str, Any]:
+    """
+    Get a URL set in JSON-serializable form.
+
+    Args:
+        urls: Python set, BloomURLSet or DiskURLSet
+
+    Returns:
+        Dict[str, Any]: Saved set state
+    """
+    if isinstance(urls, (set, frozenset)):
+        return {"mode": "exact", "urls": list(urls)}
+    return urls.get_state()
+
+
+def load_url_set(state: Dict[str, Any]) -> Any:
+    """
+    Rebuild a URL set saved with dump_url_set.
+
+    Args:
+        state: Saved set state
+
+    Returns:
+        Any: Python set, BloomURLSet or reopened DiskURLSet
+
+    Raises:
+        ValueError: If the set mode is unknown
+    """
+    if state["mode"] == "exact":
+        return set(state["urls"])
+    if state["mode"] == "bloom":
+        return BloomURLSet.from_state(state)
+    if state["mode"] == "disk":
+        return DiskURLSet(state["path"], reset=False)
+    raise ValueError(f"Unknown URL set mode: {state['mode']}")
+
+
+class CheckpointStore:
+    """Saves and loads the checkpoint of one website's crawl."""
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the checkpoint and page spool
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, "checkpoint.json")
+        self.spool_path = os.path.join(directory, "pages.jsonl")
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """
+        Replace the checkpoint atomically.
+
+        Args:
+            state: JSON-serializable crawl state
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".checkpoint-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CHECKPOINT_VERSION, **state}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the checkpoint.
+
+        Returns:
+            Optional[Dict[str, Any]]: Saved crawl state, or None if there is no usable checkpoint
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if state.get("version") == CHECKPOINT_VERSION else None
+
+    def clear(self) -> None:
+        """Delete the checkpoint and page spool."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class PageSpool:
+    """Append-only JSON Lines file of crawled pages."""
+
+    def __init__(self, path: str, offset: Optional[int] = None):
+        """
+        Open the spool.
+
+        Args:
+            path: Spool file
+            offset: Length recorded in a checkpoint to resume from; pages written
+                after it are dropped (default: start an empty spool)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if offset is None:
+            self._file = open(path, "wb")
+        else:
+            self._file = open(path, "r+b")
+            self._file.truncate(offset)
+            self._file.seek(offset)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Read the pages written so far.
+
+        Returns:
+            List[Dict[str, Any]]: Spooled pages in crawl order
+        """
+        self._file.flush()
+        with open(self.path, "rb") as f:
+            return [json.loads(line) for line in f.read(self._file.tell()).splitlines()]
+
+    def append(self, page: Dict[str, Any]) -> None:
+        """
+        Add a crawled page.
+
+        Args:
+            page: Page data
+        """
+        self._file.write(json.dumps(page, default=str).encode("utf-8") + b"\n")
+
+    def offset(self) -> int:
+        """
+        Flush the spool and get its length.
+
+        Returns:
+            int: Bytes written so far
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self) -> None:
+        """Close the spool."""
+        self._file.close()
@@ -0,0 +1,461 @@
+"""
+SQLite-backed crawl frontier and URL set for crawls larger than memory.
+
+Both keep a bounded hot window in memory and spill everything else to a local
+SQLite file, so memory use stays flat however many URLs a crawl discovers.
+They are not thread-safe themselves: during a crawl they are shared by the
+fetch loop and the parse, NLP and upload pipeline threads, which must hold
+StaticCrawler._state_lock around every call (the SQLite connection is opened
+with check_same_thread=False for this).
+
+Changes are committed every FRONTIER_COMMIT_INTERVAL writes, so the
+write-ahead log stays small however rarely the crawl checkpoints. Rows are
+tagged with the number of flushes before them (the generation) instead of
+being deleted when they leave the queue, so reopening a store rolls back
+everything committed since the last flush(): a reopened store is exactly as
+of the last flush, which is the last checkpoint.
+"""
+import heapq
+import itertools
+import os
+import sqlite3
+import sys
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import src.utils.config as config
+from src.crawlers.frontier import STRATEGIES
+from src.utils.url_utils import get_host
+
+
+def _connect(path: str, reset: bool) -> sqlite3.Connection:
+    """
+    Open a SQLite database tuned for a single writer.
+
+    Args:
+        path: Database file
+        reset: Whether to delete any existing database first
+
+    Returns:
+        sqlite3.Connection: Open connection
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if reset:
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    return conn
+
+
+def _get_generation(conn: sqlite3.Connection) -> int:
+    """Get the number of flushes of a database."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    return row[0] if row else 0
+
+
+def _set_generation(conn: sqlite3.Connection, generation: int) -> None:
+    """Record the number of flushes of a database, in the current transaction."""
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)", (generation,))
+
+
+class DiskFrontier:
+    """
+    Frontier with the same interface and ordering as Frontier, stored in SQLite.
+
+    Each host keeps at most a few hot windows of URLs in memory. BFS pushes
+    go straight to disk once the host has URLs there; DFS and priority pushes
+    enter the hot window and its least urgent URLs are spilled when it grows
+    too large. The seen-set lives on disk only.
+    """
+
+    def __init__(self, path: str, strategy: Optional[str] = None, hot_window: Optional[int] = None,
+                 reset: bool = True, commit_interval: Optional[int] = None):
+        """
+        Open the frontier.
+
+        Args:
+            path: SQLite database file
+            strategy: "bfs", "dfs" or "priority" (default: config.FRONTIER_STRATEGY)
+            hot_window: URLs per host loaded into memory at once (default: config.FRONTIER_HOT_WINDOW)
+            reset: Whether to start empty instead of reopening a flushed frontier
+            commit_interval: Row writes between commits (default: config.FRONTIER_COMMIT_INTERVAL)
+
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        self.strategy = strategy or config.FRONTIER_STRATEGY
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown frontier strategy: {self.strategy}")
+        self.path = path
+        self.hot_window = max(1, hot_window or config.FRONTIER_HOT_WINDOW)
+        self.commit_interval = max(1, commit_interval or config.FRONTIER_COMMIT_INTERVAL)
+
+        self._conn = _connect(path, reset)
+        # removed is the generation in which a row was loaded into memory (NULL while queued)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS queue (seq INTEGER PRIMARY KEY, host TEXT NOT NULL, url TEXT NOT NULL, "
+            "priority REAL NOT NULL, added INTEGER NOT NULL, removed INTEGER)"
+        )
+        if self.strategy == "priority":
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS queue_order ON queue (host, priority DESC, seq) WHERE removed IS NULL"
+            )
+        else:
+            self._conn.execute("CREATE INDEX IF NOT EXISTS queue_order ON queue (host, seq) WHERE removed IS NULL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY, added INTEGER NOT NULL) WITHOUT ROWID")
+
+        # Roll back the changes committed since the last flush
+        self._generation = _get_generation(self._conn)
+        self._conn.execute("DELETE FROM queue WHERE added >= ?", (self._generation,))
+        self._conn.execute("UPDATE queue SET removed = NULL WHERE removed IS NOT NULL")
+        self._conn.execute("DELETE FROM seen WHERE added >= ?", (self._generation,))
+        self._conn.commit()
+        self._changes = 0
+
+        self._hot: Dict[str, Any] = {}
+        # Highest priority each host may still have on disk ("priority" only)
+        self._spill_floors: Dict[str, float] = dict(
+            self._conn.execute("SELECT host, MAX(priority) FROM queue GROUP BY host").fetchall()
+        )
+        self._disk_counts: Dict[str, int] = dict(
+            self._conn.execute("SELECT host, COUNT(*) FROM queue GROUP BY host").fetchall()
+        )
+        self._ready_hosts = deque(self._disk_counts)
+        self._size = sum(self._disk_counts.values())
+        self._seen_count = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        max_seq = self._conn.execute("SELECT MAX(seq) FROM queue").fetchone()[0]
+        self._counter = itertools.count((max_seq or 0) + 1)
+
+    def __len__(self) -> int:
+        """Get the number of queued URLs."""
+        return self._size
+
+    def __bool__(self) -> bool:
+        """Check whether any URL is queued."""
+        return self._size > 0
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL has ever been added to the frontier."""
+        return self._conn.execute("SELECT 1 FROM seen WHERE url = ?", (url,)).fetchone() is not None
+
+    def _new_window(self) -> Any:
+        """Create an empty hot window for the strategy."""
+        return [] if self.strategy == "priority" else deque()
+
+    def _record_changes(self, count: int) -> None:
+        """Count written rows and commit once there are enough of them."""
+        self._changes += count
+        if self._changes >= self.commit_interval:
+            self._conn.commit()
+            self._changes = 0
+
+    def _write(self, rows: List[Tuple[int, str, str, float]]) -> None:
+        """Insert queue rows, or put back rows loaded since the last flush."""
+        self._conn.executemany(
+            "INSERT INTO queue (seq, host, url, priority, added) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (seq) DO UPDATE SET removed = NULL",
+            [(*row, self._generation) for row in rows]
+        )
+        self._record_changes(len(rows))
+
+    def _spill(self, host: str) -> None:
+        """Move the least urgent half of an overfull hot window to disk."""
+        window = self._hot[host]
+        if self.strategy == "priority":
+            window.sort()
+            spilled = window[self.hot_window:]
+            del window[self.hot_window:]
+            rows = [(seq, host, url, -priority) for priority, seq, url in spilled]
+            # Everything on disk must rank below everything in the window
+            floor = -spilled[0][0]
+            if self._disk_counts.get(host):
+                floor = max(floor, self._spill_floors[host])
+            self._spill_floors[host] = floor
+        else:
+            # The oldest URLs sit at the left and are crawled last in DFS order
+            rows = [(seq, host, url, 0.0) for seq, url in
+                    (window.popleft() for _ in range(len(window) - self.hot_window))]
+        self._write(rows)
+        self._disk_counts[host] = self._disk_counts.get(host, 0) + len(rows)
+
+    def _load(self, host: str) -> None:
+        """Fill a host's empty hot window with its most urgent URLs on disk."""
+        order = {"bfs": "seq", "dfs": "seq DESC", "priority": "priority DESC, seq"}[self.strategy]
+        rows = self._conn.execute(
+            f"SELECT seq, url, priority FROM queue WHERE host = ? AND removed IS NULL ORDER BY {order} LIMIT ?",
+            (host, self.hot_window)
+        ).fetchall()
+        # Kept until the next flush, so reopening can put them back
+        self._conn.executemany("UPDATE queue SET removed = ? WHERE seq = ?",
+                               [(self._generation, row[0]) for row in rows])
+        self._record_changes(len(rows))
+        self._disk_counts[host] -= len(rows)
+
+        if self.strategy == "priority":
+            # Rows are sorted by urgency, which is already a valid heap
+            self._hot[host] = [(-priority, seq, url) for seq, url, priority in rows]
+            if rows:
+                self._spill_floors[host] = rows[-1][2]
+        elif self.strategy == "dfs":
+            self._hot[host] = deque((seq, url) for seq, url, _ in reversed(rows))
+        else:
+            self._hot[host] = deque((seq, url) for seq, url, _ in rows)
+
+    def push(self, url: str, priority: float = 0.0) -> bool:
+        """
+        Add a URL unless it has been added before.
+
+        Args:
+            url: URL to crawl
+            priority: Priority for the "priority" strategy (higher is crawled sooner)
+
+        Returns:
+            bool: True if the URL was added
+        """
+        if self._conn.execute("INSERT OR IGNORE INTO seen (url, added) VALUES (?, ?)",
+                              (url, self._generation)).rowcount == 0:
+            return False
+        self._record_changes(1)
+        self._seen_count += 1
+        self.requeue(url, priority)
+        return True
+
+    def requeue(self, url: str, priority: float = 0.0) -> None:
+        """
+        Queue a URL again even though it has been added before.
+
+        Used for URLs that were in flight when a crawl stopped.
+
+        Args:
+            url: URL to crawl
+            priority: Priority for the "priority" strategy (higher is crawled sooner)
+        """
+        host = get_host(url)
+        seq = next(self._counter)
+        if host not in self._hot and not self._disk_counts.get(host):
+            self._ready_hosts.append(host)
+        window = self._hot.setdefault(host, self._new_window())
+
+        on_disk = self._disk_counts.get(host, 0)
+        if self.strategy == "priority" and not (on_disk and priority <= self._spill_floors[host]):
+            heapq.heappush(window, (-priority, seq, url))
+        elif self.strategy == "dfs" or (self.strategy == "bfs" and not on_disk and len(window) < self.hot_window):
+            window.append((seq, url))
+        else:
+            self._write([(seq, host, url, priority)])
+            self._disk_counts[host] = on_disk + 1
+
+        if len(window) > 2 * self.hot_window:
+            self._spill(host)
+        self._size += 1
+
+    def extend(self, urls: Iterable[str]) -> int:
+        """
+        Add several URLs with the default priority.
+
+        Args:
+            urls: URLs to crawl
+
+        Returns:
+            int: Number of URLs added
+        """
+        return sum(self.push(url) for url in urls)
+
+    def pop(self) -> Optional[str]:
+        """
+        Take the next URL, rotating between hosts.
+
+        Returns:
+            Optional[str]: Next URL or None if the frontier is empty
+        """
+        if not self._ready_hosts:
+            return None
+
+        host = self._ready_hosts.popleft()
+        if not self._hot.get(host):
+            self._load(host)
+        window = self._hot[host]
+
+        if self.strategy == "priority":
+            url = heapq.heappop(window)[2]
+        elif self.strategy == "dfs":
+            url = window.pop()[1]
+        else:
+            url = window.popleft()[1]
+        self._size -= 1
+
+        if window or self._disk_counts.get(host):
+            self._ready_hosts.append(host)
+        else:
+            del self._hot[host]
+            self._disk_counts.pop(host, None)
+            self._spill_floors.pop(host, None)
+        return url
+
+    def flush(self) -> None:
+        """Write the hot windows back to disk and commit, so the frontier can be reopened as it is now."""
+        for host, window in self._hot.items():
+            if self.strategy == "priority":
+                rows = [(seq, host, url, -priority) for priority, seq, url in window]
+            else:
+                rows = [(seq, host, url, 0.0) for seq, url in window]
+            self._write(rows)
+            self._disk_counts[host] = self._disk_counts.get(host, 0) + len(rows)
+            if rows:
+                # The whole host is on disk now
+                self._spill_floors[host] = max(row[3] for row in rows)
+        self._hot = {}
+        self._conn.execute("DELETE FROM queue WHERE removed IS NOT NULL")
+        self._generation += 1
+        _set_generation(self._conn, self._generation)
+        self._conn.commit()
+        self._changes = 0
+
+    def close(self, flush: bool = True) -> None:
+        """
+        Close the database.
+
+        Args:
+            flush: Whether to flush first; otherwise changes since the last flush are discarded
+        """
+        if flush:
+            self.flush()
+        self._conn.close()
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Flush the frontier and describe how to reopen it.
+
+        Returns:
+            Dict[str, Any]: Backend, strategy and database path
+        """
+        self.flush()
+        return {"backend": "disk", "strategy": self.strategy, "path": self.path}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get frontier statistics.
+
+        Returns:
+            Dict[str, Any]: Strategy, queued, in-memory and seen URLs and hosts with queued URLs
+        """
+        return {
+            "strategy": self.strategy,
+            "backend": "disk",
+            "queued": self._size,
+            "in_memory": sum(len(window) for window in self._hot.values()),
+            "seen": self._seen_count,
+            "hosts": len(self._ready_hosts)
+        }
+
+
+class DiskURLSet:
+    """Set of URLs stored in SQLite, with a bounded in-memory buffer of recent additions."""
+
+    mode = "disk"
+
+    def __init__(self, path: str, hot_window: Optional[int] = None, reset: bool = True,
+                 commit_interval: Optional[int] = None):
+        """
+        Open the set.
+
+        Args:
+            path: SQLite database file
+            hot_window: URLs buffered in memory before they are written (default: config.FRONTIER_HOT_WINDOW)
+            reset: Whether to start empty instead of reopening an existing set
+            commit_interval: Row writes between commits (default: config.FRONTIER_COMMIT_INTERVAL)
+        """
+        self.path = path
+        self.hot_window = max(1, hot_window or config.FRONTIER_HOT_WINDOW)
+        self.commit_interval = max(1, commit_interval or config.FRONTIER_COMMIT_INTERVAL)
+        self._conn = _connect(path, reset)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, added INTEGER NOT NULL) WITHOUT ROWID")
+
+        # Roll back the URLs committed since the last flush
+        self._generation = _get_generation(self._conn)
+        self._conn.execute("DELETE FROM urls WHERE added >= ?", (self._generation,))
+        self._conn.commit()
+        self._changes = 0
+        self._buffer = set()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def __len__(self) -> int:
+        """Get the number of URLs."""
+        return self._size
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL is in the set."""
+        if url in self._buffer:
+            return True
+        return self._conn.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the URLs without loading them all into memory."""
+        self._write_buffer()
+        for (url,) in self._conn.execute("SELECT url FROM urls"):
+            yield url
+
+    def add(self, url: str) -> None:
+        """
+        Add a URL.
+
+        Args:
+            url: URL to add
+        """
+        if url in self:
+            return
+        self._buffer.add(url)
+        self._size += 1
+        if len(self._buffer) >= self.hot_window:
+            self._write_buffer()
+
+    def memory_bytes(self) -> int:
+        """Get the memory used by the in-memory buffer."""
+        return sys.getsizeof(self._buffer) + sum(sys.getsizeof(url) for url in self._buffer)
+
+    def _write_buffer(self) -> None:
+        """Move buffered URLs to the database, committing once enough rows were written."""
+        if self._buffer:
+            self._conn.executemany("INSERT OR IGNORE INTO urls (url, added) VALUES (?, ?)",
+                                   [(url, self._generation) for url in self._buffer])
+            self._changes += len(self._buffer)
+            self._buffer = set()
+            if self._changes >= self.commit_interval:
+                self._conn.commit()
+                self._changes = 0
+
+    def flush(self) -> None:
+        """Write buffered URLs to disk and commit, so the set can be reopened as it is now."""
+        self._write_buffer()
+        self._generation += 1
+        _set_generation(self._conn, self._generation)
+        self._conn.commit()
+        self._changes = 0
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Flush the set and describe how to reopen it.
+
+        Returns:
+            Dict[str, Any]: Mode and database path
+        """
+        self.flush()
+        return {"mode": self.mode, "path": self.path}
+
+    def close(self, flush: bool = True) -> None:
+        """
+        Close the database.
+
+        Args:
+            flush: Whether to flush first; otherwise changes since the last flush are discarded
+        """
+        if flush:
+            self.flush()
+        self._conn.close()
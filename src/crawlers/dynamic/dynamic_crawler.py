@@ -1,9 +1,10 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 import time
 from playwright.sync_api import sync_playwright, Page
-import urllib.parse
 from datetime import datetime
 
+from src.crawlers.base_crawler import BaseCrawler
+from src.crawlers.retry_policy import HTTPStatusError, parse_retry_after
 from src.crawlers.static.static_crawler import StaticCrawler
 
 
@@ -19,6 +20,7 @@ class DynamicCrawler(StaticCrawler):
         """
         super().__init__(website_config)
         self.wait_time = website_config.get("wait_time", 5)  # Time to wait for JS to render
+        self.conditional_requests = False  # Rendered pages carry no HTTP validators
         # Initialize metrics if not already initialized by parent
         if not hasattr(self, 'metrics'):
             self.metrics = {
@@ -26,58 +28,86 @@ class DynamicCrawler(StaticCrawler):
                 "end_time": None,
                 "total_pages": 0,
                 "successful_crawls": 0,
-                "failed_crawls": 0
+                "failed_crawls": 0,
+                "failed_attempts": 0,
+                "breaker_trips": 0,
+                "unchanged_pages": 0,
+                "skipped_urls": 0,
+                "truncated_pages": 0,
+                "wire_bytes": 0,
+                "decoded_bytes": 0
             }
     
-    def get_page(self, url: str) -> Optional[str]:
+    def fetch_page(self, url: str, slot_reserved: bool = False, conditional: bool = False) -> Optional[Dict[str, Any]]:
         """
-        Get the HTML content of a page using Playwright for JavaScript rendering.
+        Fetch a page using Playwright for JavaScript rendering.
+        
+        Rendered pages are always fetched in full, so conditional is ignored.
+        In record mode the rendered DOM is archived as the page's response, so
+        replays serve it through BaseCrawler.fetch_page without a browser.
         
         Args:
             url: URL to fetch
+            slot_reserved: Whether the caller already waited for the first request slot
+            conditional: Unused, kept for compatibility with BaseCrawler.fetch_page
             
         Returns:
-            Optional[str]: HTML content of the page or None if failed
+            Optional[Dict[str, Any]]: Fetch result (see BaseCrawler.fetch_page) or None if failed
         """
-        if not self._respect_robots_txt(url):
-            print(f"URL {url} is not allowed by robots.txt")
-            return None
+        if self.fetch_mode == "replay":
+            return BaseCrawler.fetch_page(self, url, slot_reserved=slot_reserved)
+        
+        if not self.is_fetchable_url(url):
+            return self._fetch_result(url, skipped="non-HTML extension")
         
-        for attempt in range(self.max_retries):
+        return self._fetch_with_retries(url, self._render_page, slot_reserved)
+    
+    def _render_page(self, url: str) -> Dict[str, Any]:
+        """
+        Render a page once with Playwright.
+        
+        Args:
+            url: URL to render
+            
+        Returns:
+            Dict[str, Any]: Fetch result
+            
+        Raises:
+            HTTPStatusError: If the server answered with an error status
+        """
+        with sync_playwright() as playwright:
+            # Launch browser
+            browser = playwright.chromium.launch(headless=True)
             try:
-                with sync_playwright() as playwright:
-                    # Launch browser
-                    browser = playwright.chromium.launch(headless=True)
-                    context = browser.new_context(
-                        user_agent=self.session.headers.get("User-Agent")
-                    )
-                    page = context.new_page()
-                    
-                    # Navigate to the page
-                    page.goto(url, wait_until="domcontentloaded")
-                    
-                    # Wait for JavaScript to render
-                    time.sleep(self.wait_time)
-                    
-                    # Get content
-                    html = page.content()
-                    
-                    # Close browser
-                    context.close()
-                    browser.close()
-                    
-                    # Add delay after successful request
-                    time.sleep(self.delay)
-                    
-                    return html
-            except Exception as e:
-                print(f"Attempt {attempt + 1}/{self.max_retries} failed for {url}: {str(e)}")
+                context = browser.new_context(
+                    user_agent=self.user_agent
+                )
+                page = context.new_page()
+                
+                # Navigate to the page
+                response = page.goto(url, wait_until="domcontentloaded")
+                if response is not None and response.status >= 400:
+                    raise HTTPStatusError(response.status, parse_retry_after(response.headers.get("retry-after")))
                 
-                if attempt < self.max_retries - 1:
-                    # Exponential backoff
-                    time.sleep(self.delay * (attempt + 1))
+                # Wait for JavaScript to render
+                time.sleep(self.wait_time)
+                
+                # Get content
+                html = page.content()
+                
+                context.close()
+            finally:
+                # Close browser
+                browser.close()
+        
+        if self.fetch_mode == "record":
+            headers = [("Content-Type", "text/html; charset=utf-8")]
+            body = html.encode("utf-8")
+            self._get_warc_writer().write_exchange(
+                url, list(self._get_request_headers().items()), 200, "OK", headers, body
+            )
         
-        return None
+        return self._fetch_result(url, html, 200)
     
     def scroll_page(self, page: Page) -> None:
         """
@@ -0,0 +1,135 @@
+"""
+Asyncio fetch engine that keeps many page requests in flight at once.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+
+import src.utils.config as config
+from src.crawlers.politeness import PolitenessScheduler
+from src.utils.url_utils import get_host
+
+T = TypeVar("T")
+
+
+class AsyncFetchEngine:
+    """Run blocking fetches on a thread pool under global and per-host concurrency caps."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, per_host_concurrency: Optional[int] = None):
+        """
+        Initialize the fetch engine.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight across all hosts
+                (default: config.MAX_CONCURRENT_REQUESTS)
+            per_host_concurrency: Maximum number of requests in flight to a single host
+                (default: config.MAX_REQUESTS_PER_HOST)
+        """
+        self.max_concurrency = max(1, max_concurrency or config.MAX_CONCURRENT_REQUESTS)
+        self.per_host_concurrency = max(1, min(
+            per_host_concurrency or config.MAX_REQUESTS_PER_HOST,
+            self.max_concurrency
+        ))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Bind the concurrency slots to the running event loop.
+
+        Semaphores belong to the loop they were first used on, so they are
+        recreated whenever the engine is driven from a new loop.
+
+        Returns:
+            asyncio.AbstractEventLoop: The running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global_slots = asyncio.Semaphore(self.max_concurrency)
+            self._host_slots = {}
+        return loop
+
+    def _get_host_slots(self, url: str) -> asyncio.Semaphore:
+        """
+        Get the concurrency slots for the host of a URL.
+
+        Args:
+            url: URL being fetched
+
+        Returns:
+            asyncio.Semaphore: Semaphore limiting requests to the host
+        """
+        host = get_host(url)
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_slots[host]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="fetch"
+            )
+        return self._executor
+
+    async def run(self, url: str, fetch: Callable[[str], T],
+                  scheduler: Optional[PolitenessScheduler] = None) -> T:
+        """
+        Run a blocking fetch for a URL once a host slot and a global slot are free.
+
+        The host slot and the politeness wait are taken first so that requests
+        queued behind a busy or rate-limited host never hold a global slot that
+        another host could use.
+
+        Args:
+            url: URL to fetch
+            fetch: Blocking callable taking the URL
+            scheduler: Politeness scheduler to wait on before fetching (optional)
+
+        Returns:
+            T: Result of the fetch callable
+        """
+        loop = self._bind_loop()
+        async with self._get_host_slots(url):
+            if scheduler is not None:
+                await scheduler.wait_async(url)
+            async with self._global_slots:
+                return await loop.run_in_executor(self._get_executor(), fetch, url)
+
+    def close(self) -> None:
+        """Shut down the thread pool. It is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def iterate_async(async_iterable: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Drive an async iterator from synchronous code on a private event loop.
+
+    Work started by the async iterator keeps running on the engine's threads
+    while the caller processes each item.
+
+    Args:
+        async_iterable: Async iterator to consume
+
+    Yields:
+        T: Items produced by the async iterator
+    """
+    loop = asyncio.new_event_loop()
+    iterator = async_iterable.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        aclose: Any = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.close()
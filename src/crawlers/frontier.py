@@ -0,0 +1,203 @@
+"""
+Crawl frontier with constant-time enqueue, dequeue and membership checks.
+"""
+import heapq
+import itertools
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+
+import src.utils.config as config
+from src.utils.url_utils import get_host
+
+STRATEGIES = ("bfs", "dfs", "priority")
+
+
+class Frontier:
+    """
+    Queue of URLs to crawl, split into one sub-queue per host.
+
+    Hosts are served round-robin, so one host with many queued links cannot
+    starve the others. Within a host, URLs are ordered breadth-first,
+    depth-first or by priority (highest first). Every URL is accepted at most
+    once over the frontier's lifetime, so a URL is never crawled twice.
+    """
+
+    def __init__(self, strategy: Optional[str] = None, seen: Optional[Any] = None):
+        """
+        Initialize the frontier.
+
+        Args:
+            strategy: "bfs", "dfs" or "priority" (default: config.FRONTIER_STRATEGY)
+            seen: Empty set-like object remembering added URLs, e.g. a BloomURLSet
+                (default: a Python set)
+
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        self.strategy = strategy or config.FRONTIER_STRATEGY
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown frontier strategy: {self.strategy}")
+
+        self._queues: Dict[str, Any] = {}
+        self._ready_hosts: Deque[str] = deque()
+        self._seen = seen if seen is not None else set()
+        self._size = 0
+        # Tie-breaker that keeps equal priorities in insertion order
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        """Get the number of queued URLs."""
+        return self._size
+
+    def __bool__(self) -> bool:
+        """Check whether any URL is queued."""
+        return self._size > 0
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL has ever been added to the frontier."""
+        return url in self._seen
+
+    def push(self, url: str, priority: float = 0.0) -> bool:
+        """
+        Add a URL unless it has been added before.
+
+        Args:
+            url: URL to crawl
+            priority: Priority for the "priority" strategy (higher is crawled sooner)
+
+        Returns:
+            bool: True if the URL was added
+        """
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        self.requeue(url, priority)
+        return True
+
+    def requeue(self, url: str, priority: float = 0.0) -> None:
+        """
+        Queue a URL again even though it has been added before.
+
+        Used for URLs that were in flight when a crawl stopped.
+
+        Args:
+            url: URL to crawl
+            priority: Priority for the "priority" strategy (higher is crawled sooner)
+        """
+        host = get_host(url)
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = [] if self.strategy == "priority" else deque()
+            self._queues[host] = queue
+            self._ready_hosts.append(host)
+
+        if self.strategy == "priority":
+            heapq.heappush(queue, (-priority, next(self._counter), url))
+        else:
+            queue.append(url)
+        self._size += 1
+
+    def extend(self, urls: Iterable[str]) -> int:
+        """
+        Add several URLs with the default priority.
+
+        Args:
+            urls: URLs to crawl
+
+        Returns:
+            int: Number of URLs added
+        """
+        return sum(self.push(url) for url in urls)
+
+    def pop(self) -> Optional[str]:
+        """
+        Take the next URL, rotating between hosts.
+
+        Returns:
+            Optional[str]: Next URL or None if the frontier is empty
+        """
+        if not self._ready_hosts:
+            return None
+
+        host = self._ready_hosts.popleft()
+        queue = self._queues[host]
+        if self.strategy == "priority":
+            url = heapq.heappop(queue)[2]
+        elif self.strategy == "dfs":
+            url = queue.pop()
+        else:
+            url = queue.popleft()
+        self._size -= 1
+
+        if queue:
+            self._ready_hosts.append(host)
+        else:
+            del self._queues[host]
+        return url
+
+    def close(self, flush: bool = True) -> None:
+        """
+        Release resources (nothing to release for the in-memory frontier).
+
+        Args:
+            flush: Accepted for interface parity with DiskFrontier
+        """
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the frontier's contents in JSON-serializable form.
+
+        Returns:
+            Dict[str, Any]: Backend, strategy, per-host queues in service order and the seen-set
+        """
+        return {
+            "backend": "memory",
+            "strategy": self.strategy,
+            "queues": [[host, list(self._queues[host])] for host in self._ready_hosts],
+            "seen": (
+                {"mode": "exact", "urls": list(self._seen)} if isinstance(self._seen, set)
+                else self._seen.get_state()
+            )
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], seen: Any) -> "Frontier":
+        """
+        Rebuild a frontier saved with get_state.
+
+        Args:
+            state: Saved frontier state
+            seen: Seen-set restored from state["seen"]
+
+        Returns:
+            Frontier: Frontier with the saved queues
+        """
+        frontier = cls(state["strategy"], seen=seen)
+        last_seq = -1
+        for host, entries in state["queues"]:
+            if frontier.strategy == "priority":
+                # Saved in heap order, which stays a valid heap
+                queue = [tuple(entry) for entry in entries]
+                last_seq = max([last_seq] + [entry[1] for entry in queue])
+            else:
+                queue = deque(entries)
+            frontier._queues[host] = queue
+            frontier._ready_hosts.append(host)
+            frontier._size += len(queue)
+        frontier._counter = itertools.count(last_seq + 1)
+        return frontier
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get frontier statistics.
+
+        Returns:
+            Dict[str, Any]: Strategy, queued and seen URLs and hosts with queued URLs
+        """
+        return {
+            "strategy": self.strategy,
+            "backend": "memory",
+            "queued": self._size,
+            "seen": len(self._seen),
+            "hosts": len(self._queues)
+        }
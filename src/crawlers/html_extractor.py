@@ -0,0 +1,540 @@
+"""
+Single-pass extraction of page data from HTML.
+
+A page is parsed once and its tree walked once, collecting the text, links,
+images, metadata and declared canonical URL together, instead of building a
+separate parse tree for each of them.
+
+The document can be parsed by one of several backends: BeautifulSoup's
+pure-Python "html.parser", "lxml" (libxml2) or "selectolax" (Lexbor). All of
+them feed the same collector, so they extract the same data up to how each
+parser repairs broken markup and keeps whitespace; documents the faster
+parsers reject are extracted with "html.parser".
+
+The collector can also pick out the page's main content (see main_content)
+in the same pass.
+"""
+import urllib.parse
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, NavigableString
+
+import src.utils.config as config
+from src.crawlers.main_content import MainContentExtractor
+
+try:
+    from lxml import etree as lxml_etree, html as lxml_html
+except ImportError:
+    lxml_etree = lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+PARSERS = ("auto", "html.parser", "lxml", "selectolax")
+
+# Elements whose text is scored as the context of the links inside them
+LINK_CONTEXT_TAGS = ["p", "li", "td", "dd", "dt", "h1", "h2", "h3", "h4", "h5", "h6",
+                     "blockquote", "figcaption", "caption"]
+
+# Elements whose content is not part of the page text
+HIDDEN_TAGS = frozenset(("script", "style", "template"))
+
+
+def clean_text(text: str) -> str:
+    """
+    Normalize extracted text to one phrase per line.
+
+    Args:
+        text: Raw text of a document
+
+    Returns:
+        str: Text without surrounding whitespace or blank lines
+    """
+    # Break into lines and remove leading and trailing space on each
+    lines = (line.strip() for line in text.splitlines())
+
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+
+    # Remove blank lines
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+def is_link_target(href: str) -> bool:
+    """Check whether an href leads to another document (not empty, a fragment or javascript)."""
+    return bool(href) and not href.startswith("#") and not href.startswith("javascript:")
+
+
+class _ParserBackend(ABC):
+    """Parses documents and gives the collector uniform access to their nodes."""
+
+    name = None
+
+    @abstractmethod
+    def walk(self, html: str, collector: "_PageCollector") -> None:
+        """
+        Parse a document and feed it to a collector in document order.
+
+        The collector gets the start and the end of every element and every
+        string of visible text; the contents of hidden elements (HIDDEN_TAGS)
+        and templates are left out.
+
+        Args:
+            html: HTML document
+            collector: Collector of the page data
+        """
+        pass
+
+    @abstractmethod
+    def get_attr(self, node: Any, name: str) -> Optional[str]:
+        """
+        Get an attribute of an element.
+
+        Args:
+            node: Element of the parsed document
+            name: Attribute name
+
+        Returns:
+            Optional[str]: Attribute value, multiple values joined by spaces (None if it is missing)
+        """
+        pass
+
+    @abstractmethod
+    def get_text(self, node: Any) -> str:
+        """
+        Get the visible text of an element.
+
+        Args:
+            node: Element of the parsed document
+
+        Returns:
+            str: Stripped strings of the element joined by spaces
+        """
+        pass
+
+    @abstractmethod
+    def get_string(self, node: Any) -> Optional[str]:
+        """
+        Get the only string of an element such as <title>.
+
+        Args:
+            node: Element of the parsed document
+
+        Returns:
+            Optional[str]: The string, or None if the element has no child or more than one
+        """
+        pass
+
+    @abstractmethod
+    def get_block(self, node: Any) -> Tuple[Hashable, Any]:
+        """
+        Get the text block around a link.
+
+        Args:
+            node: Link element
+
+        Returns:
+            Tuple[Hashable, Any]: Key identifying the block and the block: the nearest
+                enclosing LINK_CONTEXT_TAGS element, or else the link's parent
+        """
+        pass
+
+
+class _PageCollector:
+    """Collects page data from the strings and elements of a document in document order."""
+
+    def __init__(self, backend: _ParserBackend, page_url: str, site_url: str, context_chars: Optional[int],
+                 main_content: bool = False):
+        """
+        Initialize the collector.
+
+        Args:
+            backend: Backend parsing the document
+            page_url: URL the page was fetched from, to resolve relative links
+            site_url: URL prefix of the website; links outside it are dropped
+            context_chars: Characters of text kept around each link, or None to skip
+                link contexts
+            main_content: Whether to also extract the main content
+        """
+        self.backend = backend
+        self.page_url = page_url
+        self.site_url = site_url
+        self.context_chars = context_chars
+        self.strings: List[str] = []
+        self.links: List[str] = []
+        self.link_contexts: Optional[List[Dict[str, str]]] = [] if context_chars is not None else None
+        self.images: List[Dict[str, str]] = []
+        self.meta_tags: Dict[str, str] = {}
+        self.has_title = False
+        self.title = None
+        self.canonical_url = None
+        self._block_texts: Dict[Hashable, str] = {}
+        self.main_content = MainContentExtractor() if main_content else None
+
+    def add_string(self, text: str) -> None:
+        """Collect a string of visible text."""
+        self.strings.append(text)
+        if self.main_content is not None:
+            self.main_content.add_text(text)
+
+    def end_element(self, name: str) -> None:
+        """Handle the end of an element started with add_element."""
+        if self.main_content is not None:
+            self.main_content.end_element(name)
+
+    def add_element(self, node: Any, name: str) -> None:
+        """Collect the data of an element at its start."""
+        get_attr = self.backend.get_attr
+        if self.main_content is not None:
+            self.main_content.start_element(name, node, get_attr)
+        if name == "a":
+            href = get_attr(node, "href")
+            if href is None or not is_link_target(href):
+                return
+            absolute_url = urllib.parse.urljoin(self.page_url, href)
+            if not absolute_url.startswith(self.site_url):
+                return
+            self.links.append(absolute_url)
+            if self.link_contexts is not None:
+                # Links of one block share its text
+                key, block = self.backend.get_block(node)
+                if key not in self._block_texts:
+                    self._block_texts[key] = self.backend.get_text(block)[:self.context_chars] if block is not None else ""
+                self.link_contexts.append({
+                    "url": absolute_url,
+                    "anchor": self.backend.get_text(node) or get_attr(node, "title") or "",
+                    "context": self._block_texts[key]
+                })
+        elif name == "img":
+            src = get_attr(node, "src")
+            if src is not None:
+                self.images.append({"url": urllib.parse.urljoin(self.page_url, src), "alt_text": get_attr(node, "alt") or ""})
+        elif name == "meta":
+            key = get_attr(node, "name") or get_attr(node, "property")
+            content = get_attr(node, "content")
+            if key and content:
+                self.meta_tags[key] = content
+        elif name == "title":
+            if not self.has_title:
+                self.has_title = True
+                self.title = self.backend.get_string(node)
+        elif name == "link" and self.canonical_url is None:
+            href = get_attr(node, "href")
+            if href is not None and "canonical" in (get_attr(node, "rel") or "").lower().split():
+                self.canonical_url = urllib.parse.urljoin(self.page_url, href)
+
+    def get_result(self) -> Dict[str, Any]:
+        """Get the collected page data (see HTMLExtractor.extract)."""
+        # The title comes first and named meta tags may override it
+        metadata = {"title": self.title} if self.has_title else {}
+        metadata.update(self.meta_tags)
+        main_text = None
+        if self.main_content is not None:
+            self.main_content.finish()
+            main_text = self.main_content.get_text()
+        return {
+            "text": clean_text("".join(self.strings)),
+            "main_text": main_text,
+            "links": self.links,
+            "link_contexts": self.link_contexts,
+            "images": self.images,
+            "metadata": metadata,
+            "canonical_url": self.canonical_url
+        }
+
+
+class HTMLParserBackend(_ParserBackend):
+    """BeautifulSoup with Python's built-in html.parser; slow but accepts anything."""
+
+    name = "html.parser"
+
+    def walk(self, html: str, collector: _PageCollector) -> None:
+        """Parse a document with BeautifulSoup and walk its tree with an explicit stack (see _ParserBackend.walk)."""
+        soup = BeautifulSoup(html, "html.parser")
+        # The string types get_text keeps: no comments, doctypes, scripts or styles
+        string_types = soup.interesting_string_types
+        if isinstance(string_types, type):
+            string_types = (string_types,)
+        stack = list(reversed(soup.contents))
+        while stack:
+            node = stack.pop()
+            # Plain strings on the stack mark the end of an element
+            if type(node) is str:
+                collector.end_element(node)
+                continue
+            if isinstance(node, NavigableString):
+                if type(node) in string_types:
+                    collector.add_string(node)
+                continue
+            collector.add_element(node, node.name)
+            stack.append(node.name)
+            # Template contents are inert, as in the HTML5 parsers
+            if node.name != "template":
+                stack.extend(reversed(node.contents))
+
+    def get_attr(self, node: Any, name: str) -> Optional[str]:
+        """Get an attribute of a Tag (see _ParserBackend.get_attr)."""
+        value = node.get(name)
+        # Multi-valued attributes such as rel come as lists
+        return " ".join(value) if isinstance(value, list) else value
+
+    def get_text(self, node: Any) -> str:
+        """Get the visible text of a Tag (see _ParserBackend.get_text)."""
+        return node.get_text(" ", strip=True)
+
+    def get_string(self, node: Any) -> Optional[str]:
+        """Get the only string of a Tag (see _ParserBackend.get_string)."""
+        return node.string
+
+    def get_block(self, node: Any) -> Tuple[Hashable, Any]:
+        """Get the text block around a link Tag, keyed by its id() (see _ParserBackend.get_block)."""
+        block = node.find_parent(LINK_CONTEXT_TAGS) or node.parent
+        return id(block), block
+
+
+class LxmlBackend(_ParserBackend):
+    """lxml's libxml2 HTML parser."""
+
+    name = "lxml"
+
+    def walk(self, html: str, collector: _PageCollector) -> None:
+        """Parse a document with lxml and walk its elements, texts and tails (see _ParserBackend.walk)."""
+        root = lxml_html.document_fromstring(html)
+        add_string = collector.add_string
+        # Element, whether its start was handled (only its end and tail are
+        # left) and whether it is inside a hidden element
+        stack = [(root, False, False)]
+        while stack:
+            node, started, hidden = stack.pop()
+            if started:
+                if isinstance(node.tag, str) and node.tag != "template":
+                    collector.end_element(node.tag)
+                if node.tail and not hidden:
+                    add_string(node.tail)
+                continue
+            stack.append((node, True, hidden))
+            # Comments and processing instructions only have a tail
+            if not isinstance(node.tag, str):
+                continue
+            # Template contents are inert, as in the HTML5 parsers
+            if node.tag == "template":
+                continue
+            collector.add_element(node, node.tag)
+            hidden = hidden or node.tag in HIDDEN_TAGS
+            if node.text and not hidden:
+                add_string(node.text)
+            stack.extend((child, False, hidden) for child in reversed(node))
+
+    def get_attr(self, node: Any, name: str) -> Optional[str]:
+        """Get an attribute of an lxml element (see _ParserBackend.get_attr)."""
+        return node.get(name)
+
+    def get_text(self, node: Any) -> str:
+        """Get the visible text of an lxml element, skipping hidden elements (see _ParserBackend.get_text)."""
+        texts = []
+        hidden = 0
+        for event, element in lxml_etree.iterwalk(node, events=("start", "end")):
+            is_element = isinstance(element.tag, str)
+            if event == "start":
+                if is_element and element.tag in HIDDEN_TAGS:
+                    hidden += 1
+                elif is_element and element.text and not hidden:
+                    texts.append(element.text.strip())
+                continue
+            if is_element and element.tag in HIDDEN_TAGS:
+                hidden -= 1
+            if element is not node and element.tail and not hidden:
+                texts.append(element.tail.strip())
+        return " ".join(text for text in texts if text)
+
+    def get_string(self, node: Any) -> Optional[str]:
+        """Get the text of an lxml element without children (see _ParserBackend.get_string)."""
+        return node.text if len(node) == 0 else None
+
+    def get_block(self, node: Any) -> Tuple[Hashable, Any]:
+        """Get the text block around a link element, keyed by the block itself (see _ParserBackend.get_block)."""
+        block = next((parent for parent in node.iterancestors() if parent.tag in LINK_CONTEXT_TAGS), None)
+        if block is None:
+            block = node.getparent()
+        # The element itself is the key: keeping it referenced keeps its proxy
+        return block, block
+
+
+class SelectolaxBackend(_ParserBackend):
+    """selectolax's bindings of the Lexbor HTML5 parser."""
+
+    name = "selectolax"
+
+    def walk(self, html: str, collector: _PageCollector) -> None:
+        """Parse a document with Lexbor and walk its nodes with an explicit stack (see _ParserBackend.walk)."""
+        root = LexborHTMLParser(html).root
+        if root is None:
+            return
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            # Tag names on the stack mark the end of an element
+            if type(node) is str:
+                collector.end_element(node)
+                continue
+            tag = node.tag
+            if tag == "-text":
+                # Template contents are not part of the tree, and scripts and
+                # styles only hold text
+                if node.parent.tag not in HIDDEN_TAGS:
+                    collector.add_string(node.text_content)
+            elif not tag.startswith("-"):
+                collector.add_element(node, tag)
+                stack.append(tag)
+                stack.extend(reversed(list(node.iter(include_text=True))))
+
+    def get_attr(self, node: Any, name: str) -> Optional[str]:
+        """Get an attribute of a Lexbor node (see _ParserBackend.get_attr)."""
+        attributes = node.attributes
+        if name not in attributes:
+            return None
+        # Attributes without a value, such as <a href>, are empty
+        return attributes[name] or ""
+
+    def get_text(self, node: Any) -> str:
+        """Get the visible text of a Lexbor node, skipping hidden elements (see _ParserBackend.get_text)."""
+        texts = (child.text_content.strip() for child in node.traverse(include_text=True)
+                 if child.tag == "-text" and child.parent.tag not in HIDDEN_TAGS)
+        return " ".join(text for text in texts if text)
+
+    def get_string(self, node: Any) -> Optional[str]:
+        """Get the text of a Lexbor node whose only child is a text node (see _ParserBackend.get_string)."""
+        child = node.child
+        if child is None or child.next is not None or child.tag != "-text":
+            return None
+        return child.text_content
+
+    def get_block(self, node: Any) -> Tuple[Hashable, Any]:
+        """Get the text block around a link node, keyed by its mem_id (see _ParserBackend.get_block)."""
+        block = node.parent
+        while block is not None and block.tag not in LINK_CONTEXT_TAGS:
+            block = block.parent
+        if block is None:
+            block = node.parent
+        return (block.mem_id if block is not None else None), block
+
+
+def create_backend(parser: Optional[str] = None) -> _ParserBackend:
+    """
+    Create an HTML parser backend.
+
+    Args:
+        parser: "html.parser", "lxml", "selectolax" or "auto" (default: config.HTML_PARSER).
+            "auto" uses the fastest installed parser.
+
+    Returns:
+        _ParserBackend: New backend
+
+    Raises:
+        ValueError: If the parser is unknown
+        ImportError: If "lxml" or "selectolax" is requested without the package installed
+    """
+    parser = parser or config.HTML_PARSER
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown HTML parser: {parser}")
+
+    if parser == "selectolax" and LexborHTMLParser is None:
+        raise ImportError("The selectolax parser requires selectolax (pip install selectolax)")
+    if parser == "lxml" and lxml_html is None:
+        raise ImportError("The lxml parser requires lxml (pip install lxml)")
+    if parser == "selectolax" or (parser == "auto" and LexborHTMLParser is not None):
+        return SelectolaxBackend()
+    if parser == "lxml" or (parser == "auto" and lxml_html is not None):
+        return LxmlBackend()
+    return HTMLParserBackend()
+
+
+class HTMLExtractor:
+    """Extracts page data with a parser backend, falling back to html.parser for documents it rejects."""
+
+    def __init__(self, parser: Optional[str] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            parser: Parser backend (see create_backend)
+        """
+        self.backend = create_backend(parser)
+        self._fallback = self.backend if isinstance(self.backend, HTMLParserBackend) else HTMLParserBackend()
+        self.pages = 0
+        self.fallbacks = 0
+
+    def extract(self, html: str, page_url: str, site_url: str,
+                context_chars: Optional[int] = None, main_content: bool = False) -> Dict[str, Any]:
+        """
+        Extract the data of a page in one pass over its document.
+
+        Args:
+            html: HTML content
+            page_url: URL the page was fetched from, to resolve relative links
+            site_url: URL prefix of the website; links outside it are dropped
+            context_chars: Characters of text kept around each link, or None to skip
+                link contexts
+            main_content: Whether to also extract the main content
+
+        Returns:
+            Dict[str, Any]: Page data
+                - text: Visible text without scripts and styles (see clean_text)
+                - main_text: Text of the main content without navigation, sidebars,
+                  footers and the like (None unless main_content is set, or if too
+                  little of the page looks like main content)
+                - links: Absolute same-site links in document order
+                - link_contexts: Links with their anchor text and the text of the paragraph,
+                  list item or heading around them (None unless context_chars is given)
+                - images: Image URLs and alt texts
+                - metadata: Title and named meta tags
+                - canonical_url: Absolute URL of the first <link rel="canonical">, or None
+        """
+        self.pages += 1
+        collector = _PageCollector(self.backend, page_url, site_url, context_chars, main_content)
+        try:
+            self.backend.walk(html, collector)
+        except Exception:
+            # Empty documents, encoding declarations lxml refuses in text and
+            # the like: html.parser takes anything
+            if self.backend is self._fallback:
+                raise
+            self.fallbacks += 1
+            collector = _PageCollector(self._fallback, page_url, site_url, context_chars, main_content)
+            self._fallback.walk(html, collector)
+        return collector.get_result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get extraction statistics.
+
+        Returns:
+            Dict[str, Any]: Backend, pages extracted and pages extracted with html.parser
+                after the backend rejected them
+        """
+        return {"parser": self.backend.name, "pages": self.pages, "fallbacks": self.fallbacks}
+
+
+_REFERENCE_EXTRACTOR = HTMLExtractor("html.parser")
+
+
+def extract_page(html: str, page_url: str, site_url: str,
+                 context_chars: Optional[int] = None, main_content: bool = False) -> Dict[str, Any]:
+    """
+    Extract the data of a page with html.parser (see HTMLExtractor.extract).
+
+    Args:
+        html: HTML content
+        page_url: URL the page was fetched from, to resolve relative links
+        site_url: URL prefix of the website; links outside it are dropped
+        context_chars: Characters of text kept around each link, or None to skip
+            link contexts
+        main_content: Whether to also extract the main content
+
+    Returns:
+        Dict[str, Any]: Page data
+    """
+    return _REFERENCE_EXTRACTOR.extract(html, page_url, site_url, context_chars, main_content)
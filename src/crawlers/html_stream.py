@@ -0,0 +1,391 @@
+"""
+Incremental extraction of page data from HTML as it downloads.
+
+Very large pages (full-text books, long lists) are tokenized piece by piece
+instead of being decoded into one string and parsed into a tree. Text
+chunks, links and images are emitted as soon as they are complete, so the
+memory used by the tokenizer stays bounded however large the page is.
+"""
+import urllib.parse
+from collections import deque
+from html.parser import HTMLParser
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import src.utils.config as config
+from src.crawlers.html_extractor import HIDDEN_TAGS, LINK_CONTEXT_TAGS, clean_text, is_link_target
+from src.crawlers.main_content import MainContentExtractor
+
+_LINK_CONTEXT_TAGS = frozenset(LINK_CONTEXT_TAGS)
+
+# Elements without content or end tag, closed as soon as they open (as by BeautifulSoup)
+VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link",
+                       "menuitem", "meta", "param", "source", "track", "wbr", "basefont", "bgsound",
+                       "command", "frame", "image", "isindex", "nextid", "spacer"))
+
+# Bounds on the state kept for link contexts: open elements tracked, characters
+# of anchor text kept and links waiting for the rest of their block's text
+_MAX_OPEN_ELEMENTS = 256
+_MAX_ANCHOR_CHARS = 1000
+_MAX_PENDING_LINKS = 100
+
+
+class _OpenElement:
+    """Element whose text is collected, up to a limit, while it is open."""
+
+    __slots__ = ("tag", "texts", "size", "limit", "closed")
+
+    def __init__(self, tag: str, limit: int):
+        self.tag = tag
+        self.texts: List[str] = []
+        self.size = 0
+        self.limit = limit
+        self.closed = False
+
+    @property
+    def complete(self) -> bool:
+        """Whether the collected text can no longer change (within the limit)."""
+        return self.closed or self.size > self.limit
+
+    def add_text(self, text: str) -> None:
+        """Collect a stripped string of the element."""
+        if self.size <= self.limit:
+            self.texts.append(text)
+            self.size += len(text) + 1
+
+    def get_text(self) -> str:
+        """Get the collected strings joined by spaces."""
+        return " ".join(self.texts)
+
+
+class HTMLStreamExtractor(HTMLParser):
+    """
+    Tokenizes an HTML document incrementally and emits its data as it goes.
+
+    Feed decoded pieces of the document with push() and call finish() at the
+    end; both return the events completed so far:
+        - ("text", str): Chunk of page text, cut at line ends (see clean_text)
+        - ("link", str): Absolute same-site link
+        - ("link_context", Dict[str, str]): Link with its anchor text and the text of
+          the paragraph, list item or heading around it (only with context_chars)
+        - ("image", Dict[str, str]): Image URL and alt text
+    The title, meta tags and canonical URL are kept in the metadata and
+    canonical_url attributes once finish() returns, and the main content in
+    main_content (with main_content set).
+
+    Elements nest as in BeautifulSoup's html.parser tree (an end tag closes the
+    latest open element of its name, nothing is closed implicitly), so the
+    data matches html_extractor.extract_page's.
+    """
+
+    def __init__(self, page_url: str, site_url: str, context_chars: Optional[int] = None,
+                 chunk_chars: Optional[int] = None, max_buffer_chars: Optional[int] = None,
+                 main_content: bool = False, max_main_chars: Optional[int] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            page_url: URL the page was fetched from, to resolve relative links
+            site_url: URL prefix of the website; links outside it are dropped
+            context_chars: Characters of text kept around each link, or None to skip
+                link contexts
+            chunk_chars: Characters of text per emitted chunk (default:
+                config.STREAM_TEXT_CHUNK_CHARS)
+            max_buffer_chars: Most characters of an unfinished token (such as an
+                unterminated comment) buffered before the rest of the page is
+                dropped (default: config.STREAM_MAX_BUFFER_CHARS)
+            main_content: Whether to also extract the main content
+            max_main_chars: Most characters of main content kept (default:
+                config.STREAM_MAX_TEXT_CHARS)
+        """
+        super().__init__(convert_charrefs=True)
+        self.page_url = page_url
+        self.site_url = site_url
+        self.context_chars = context_chars
+        self.chunk_chars = chunk_chars or config.STREAM_TEXT_CHUNK_CHARS
+        self.max_buffer_chars = max_buffer_chars or config.STREAM_MAX_BUFFER_CHARS
+        self.metadata: Dict[str, Optional[str]] = {}
+        self.canonical_url: Optional[str] = None
+        # Whether the rest of the page was dropped because a token did not end
+        self.truncated = False
+        self._events: List[Tuple[str, Any]] = []
+        self._texts: List[str] = []
+        self._text_size = 0
+        # Depth inside elements whose content is not page text
+        self._hidden = 0
+        # Strings of the first <title> (None before it is seen)
+        self._title: Optional[List[str]] = None
+        self._in_title = False
+        self._meta_tags: Dict[str, str] = {}
+        self.main_content = MainContentExtractor(
+            max_chars=max_main_chars or config.STREAM_MAX_TEXT_CHARS
+        ) if main_content else None
+        # Open elements (only tracked for link contexts and main content) and
+        # links, in document order, waiting for the text of their anchor and block
+        self._track = context_chars is not None or main_content
+        self._open: List[_OpenElement] = []
+        # Pieces of the current string; the tokenizer splits strings where the
+        # document was split, so they are joined up before being collected
+        self._string: List[str] = []
+        self._string_size = 0
+        self._pending: Deque[Tuple[Dict[str, str], _OpenElement, Optional[_OpenElement], str]] = deque()
+
+    def push(self, data: str) -> List[Tuple[str, Any]]:
+        """
+        Tokenize the next piece of the document.
+
+        Args:
+            data: Decoded piece of the document
+
+        Returns:
+            List[Tuple[str, Any]]: Events completed by this piece
+        """
+        if not self.truncated:
+            self.feed(data)
+            if len(self.rawdata) > self.max_buffer_chars:
+                self.truncated = True
+                self.rawdata = ""
+        return self._take_events()
+
+    def finish(self) -> List[Tuple[str, Any]]:
+        """
+        Tokenize the rest of the document.
+
+        Returns:
+            List[Tuple[str, Any]]: Remaining events
+        """
+        if not self.truncated:
+            self.close()
+        self._end_string()
+        self._close_elements(0)
+        if self.main_content is not None:
+            self.main_content.finish()
+        self._flush_text(final=True)
+
+        # The title comes first and named meta tags may override it
+        if self._title is not None:
+            self.metadata["title"] = "".join(self._title) or None
+        self.metadata.update(self._meta_tags)
+        return self._take_events()
+
+    def _take_events(self) -> List[Tuple[str, Any]]:
+        """Hand over the events collected so far."""
+        events, self._events = self._events, []
+        return events
+
+    def _flush_text(self, final: bool = False) -> None:
+        """Emit the buffered text, keeping an unfinished last line unless final."""
+        text = "".join(self._texts)
+        cut = len(text) if final else (text.rfind("\n") + 1 or len(text))
+        self._texts = [text[cut:]] if cut < len(text) else []
+        self._text_size = len(text) - cut
+        chunk = clean_text(text[:cut])
+        if chunk:
+            self._events.append(("text", chunk))
+
+    def _emit_link_contexts(self, force: bool = False) -> None:
+        """Emit the waiting links whose anchor and block text is complete, in order."""
+        while self._pending:
+            link, anchor, block, title = self._pending[0]
+            if not force and not (anchor.complete and (block is None or block.complete)):
+                break
+            self._pending.popleft()
+            link["anchor"] = anchor.get_text() or title
+            link["context"] = block.get_text()[:self.context_chars] if block is not None else ""
+            self._events.append(("link_context", link))
+            force = force and len(self._pending) >= _MAX_PENDING_LINKS
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._end_string()
+        if tag in HIDDEN_TAGS:
+            self._hidden += 1
+            return
+        # Template contents are inert, as in the tree-building backends
+        if self._hidden:
+            return
+
+        # Attributes without a value count as empty and the first of a name wins
+        attributes = {name: value or "" for name, value in reversed(attrs)}
+        anchor = None
+        if tag == "a":
+            href = attributes.get("href")
+            if href is not None and is_link_target(href):
+                absolute_url = urllib.parse.urljoin(self.page_url, href)
+                if absolute_url.startswith(self.site_url):
+                    self._events.append(("link", absolute_url))
+                    if self.context_chars is not None:
+                        anchor = self._add_link_context(absolute_url, attributes.get("title", ""))
+        elif tag == "img":
+            if "src" in attributes:
+                self._events.append(("image", {
+                    "url": urllib.parse.urljoin(self.page_url, attributes["src"]),
+                    "alt_text": attributes.get("alt", "")
+                }))
+        elif tag == "meta":
+            key = attributes.get("name") or attributes.get("property")
+            if key and attributes.get("content"):
+                self._meta_tags[key] = attributes["content"]
+        elif tag == "title":
+            if self._title is None:
+                self._title = []
+                self._in_title = True
+        elif tag == "link" and self.canonical_url is None:
+            if "href" in attributes and "canonical" in attributes.get("rel", "").lower().split():
+                self.canonical_url = urllib.parse.urljoin(self.page_url, attributes["href"])
+
+        if tag in VOID_TAGS:
+            if self.main_content is not None:
+                self.main_content.start_element(tag, attributes, dict.get)
+                self.main_content.end_element(tag)
+        elif self._track and len(self._open) < _MAX_OPEN_ELEMENTS:
+            self._open.append(anchor or _OpenElement(tag, self.context_chars or 0))
+            if self.main_content is not None:
+                self.main_content.start_element(tag, attributes, dict.get)
+        elif anchor is not None:
+            anchor.closed = True
+
+    def _add_link_context(self, url: str, title: str) -> _OpenElement:
+        """Queue the link context of an <a> and get the element collecting its anchor text."""
+        # The block is the innermost open text block, or else the link's parent
+        block = next((element for element in reversed(self._open) if element.tag in _LINK_CONTEXT_TAGS),
+                     self._open[-1] if self._open else None)
+        anchor = _OpenElement("a", _MAX_ANCHOR_CHARS)
+        self._pending.append(({"url": url}, anchor, block, title))
+        if len(self._pending) > _MAX_PENDING_LINKS:
+            self._emit_link_contexts(force=True)
+        return anchor
+
+    def handle_endtag(self, tag: str) -> None:
+        self._end_string()
+        if tag in HIDDEN_TAGS:
+            self._hidden = max(self._hidden - 1, 0)
+            return
+        if self._hidden:
+            return
+
+        if tag == "title":
+            self._in_title = False
+        # Close the latest open element of this name and any left open inside it
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index].tag == tag:
+                self._close_elements(index)
+                break
+
+    def _close_elements(self, index: int) -> None:
+        """Close the open elements from an index of the stack on, innermost first."""
+        for element in reversed(self._open[index:]):
+            element.closed = True
+            if self.main_content is not None:
+                self.main_content.end_element(element.tag)
+        del self._open[index:]
+        self._emit_link_contexts()
+
+    def handle_data(self, data: str) -> None:
+        if self._hidden:
+            return
+        self._texts.append(data)
+        self._text_size += len(data)
+        if self._in_title:
+            self._title.append(data)
+
+        if self._track:
+            self._string.append(data)
+            self._string_size += len(data)
+            if self._string_size >= self.chunk_chars:
+                self._end_string()
+
+        if self._text_size >= self.chunk_chars:
+            self._flush_text()
+
+    def handle_comment(self, data: str) -> None:
+        self._end_string()
+
+    def handle_decl(self, decl: str) -> None:
+        self._end_string()
+
+    def handle_pi(self, data: str) -> None:
+        self._end_string()
+
+    def unknown_decl(self, data: str) -> None:
+        self._end_string()
+
+    def _end_string(self) -> None:
+        """Collect the current string into the main content and the text of the open elements."""
+        if not self._string:
+            return
+        text = "".join(self._string)
+        self._string = []
+        self._string_size = 0
+        if self.main_content is not None:
+            self.main_content.add_text(text)
+        text = text.strip()
+        if text and self.context_chars is not None:
+            for element in self._open:
+                element.add_text(text)
+            if self._pending:
+                self._emit_link_contexts()
+
+
+def extract_stream(pieces: Iterable[str], page_url: str, site_url: str, context_chars: Optional[int] = None,
+                   max_text_chars: Optional[int] = None, main_content: bool = False) -> Dict[str, Any]:
+    """
+    Extract the data of a page from its decoded pieces with HTMLStreamExtractor.
+
+    Only the page text and main content are cut off, after max_text_chars;
+    links and images are collected from the whole page.
+
+    Args:
+        pieces: Decoded pieces of the document, as they arrive
+        page_url: URL the page was fetched from, to resolve relative links
+        site_url: URL prefix of the website; links outside it are dropped
+        context_chars: Characters of text kept around each link, or None to skip
+            link contexts
+        max_text_chars: Most characters of page text kept (default:
+            config.STREAM_MAX_TEXT_CHARS)
+        main_content: Whether to also extract the main content
+
+    Returns:
+        Dict[str, Any]: Page data as from HTMLExtractor.extract, plus
+            - text_truncated: Whether page text was dropped after max_text_chars
+            - buffer_truncated: Whether the rest of the page was dropped after an
+              unfinished token outgrew the tokenizer's buffer
+    """
+    max_text_chars = max_text_chars or config.STREAM_MAX_TEXT_CHARS
+    extractor = HTMLStreamExtractor(page_url, site_url, context_chars, main_content=main_content,
+                                    max_main_chars=max_text_chars)
+    texts: List[str] = []
+    text_size = 0
+    text_truncated = False
+    links: List[str] = []
+    link_contexts: Optional[List[Dict[str, str]]] = [] if context_chars is not None else None
+    images: List[Dict[str, str]] = []
+
+    def _collect(events: List[Tuple[str, Any]]) -> None:
+        nonlocal text_size, text_truncated
+        for kind, value in events:
+            if kind == "text":
+                if text_size < max_text_chars:
+                    texts.append(value[:max_text_chars - text_size])
+                    text_size += len(value) + 1
+                text_truncated = text_truncated or text_size > max_text_chars
+            elif kind == "link":
+                links.append(value)
+            elif kind == "link_context":
+                link_contexts.append(value)
+            elif kind == "image":
+                images.append(value)
+
+    for piece in pieces:
+        _collect(extractor.push(piece))
+    _collect(extractor.finish())
+
+    return {
+        "text": "\n".join(texts),
+        "main_text": extractor.main_content.get_text() if extractor.main_content is not None else None,
+        "links": links,
+        "link_contexts": link_contexts,
+        "images": images,
+        "metadata": extractor.metadata,
+        "canonical_url": extractor.canonical_url,
+        "text_truncated": text_truncated,
+        "buffer_truncated": extractor.truncated
+    }
@@ -0,0 +1,279 @@
+"""
+Main-content (boilerplate removal) extraction for text sent to NLP.
+
+The document is cut into text blocks at block-level elements, and each block
+is classified as main content or boilerplate from its text density, its link
+density and those of its neighbours, following boilerpipe's density rules
+(Kohlschütter et al., "Boilerplate Detection using Shallow Text Features",
+2010). Regions that readability-style hints mark as navigation, sidebars,
+footers, banners and the like are boilerplate whatever their text.
+
+The classifier is fed start tags, end tags and strings in document order, so
+it runs inside the single extraction pass of both the tree-walking backends
+and the streaming tokenizer, and only ever holds three blocks at a time.
+"""
+import re
+from typing import Any, Callable, List, Optional, Set
+
+import src.utils.config as config
+
+# Elements that start and end a text block
+BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "body", "button", "caption", "center", "dd", "details", "dialog",
+    "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5",
+    "h6", "head", "header", "hr", "html", "li", "main", "menu", "nav", "ol", "option", "p", "pre",
+    "section", "select", "summary", "table", "tbody", "td", "tfoot", "th", "thead", "title", "tr", "ul"
+))
+
+# Elements whose text is never main content
+UNLIKELY_TAGS = frozenset(("head", "nav", "aside", "footer", "menu", "dialog", "select", "button"))
+
+# ARIA roles of regions that are never main content
+UNLIKELY_ROLES = frozenset(("menu", "menubar", "complementary", "navigation", "alert", "alertdialog",
+                            "dialog", "banner", "contentinfo", "search"))
+
+# class/id hints of boilerplate regions, unless they also hint at content (from readability)
+UNLIKELY_PATTERN = re.compile(
+    r"-ad-|ai2html|banner|breadcrumb|combx|comment|community|consent|cookie|cover-wrap|disqus|extra|"
+    r"footer|gdpr|header|legends|menu|newsletter|related|remark|replies|rss|share|shoutbox|sidebar|"
+    r"skyscraper|social|sponsor|subscribe|supplemental|ad-break|agegate|pagination|pager|popup|promo",
+    re.IGNORECASE
+)
+CONTENT_PATTERN = re.compile(r"article|body|column|content|main|shadow", re.IGNORECASE)
+
+# Line width used to measure text density (words per wrapped line)
+WRAP_WIDTH = 80
+
+# Separators between the parts of a document title ("Headline | Site")
+_TITLE_SEPARATORS = re.compile(r"\s+[|\-–—:·»]\s+")
+
+
+class _TextBlock:
+    """Text between two block-level element boundaries."""
+
+    __slots__ = ("texts", "chars", "words", "link_words", "unlikely", "text_density", "link_density")
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.chars = 0
+        self.words = 0
+        self.link_words = 0
+        self.unlikely = False
+        self.text_density = 0.0
+        self.link_density = 0.0
+
+    def close(self) -> None:
+        """Compute the block's densities once its text is complete."""
+        if self.words:
+            self.link_density = self.link_words / self.words
+            self.text_density = _get_text_density(" ".join(self.texts).split())
+
+    def get_text(self) -> str:
+        """Get the block's text, one phrase per line (see html_extractor.clean_text)."""
+        lines = (line.strip() for line in "".join(self.texts).splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        return "\n".join(chunk for chunk in chunks if chunk)
+
+
+# Neighbour of the first and last blocks
+_EMPTY_BLOCK = _TextBlock()
+
+
+def _get_text_density(words: List[str]) -> float:
+    """
+    Get the words per line of text wrapped at WRAP_WIDTH characters.
+
+    As in boilerpipe, the last line does not count unless it is the only one.
+
+    Args:
+        words: Words of the text
+
+    Returns:
+        float: Text density
+    """
+    lines = 1
+    width = 0
+    last_line_words = 0
+    for word in words:
+        if width and width + 1 + len(word) > WRAP_WIDTH:
+            lines += 1
+            width = 0
+            last_line_words = 0
+        width += len(word) + (1 if width else 0)
+        last_line_words += 1
+    if lines == 1:
+        return float(len(words))
+    return (len(words) - last_line_words) / (lines - 1)
+
+
+def _is_content(prev: _TextBlock, curr: _TextBlock, next_: _TextBlock) -> bool:
+    """Classify a block with boilerpipe's DensityRulesClassifier."""
+    if curr.link_density > 0.333333:
+        return False
+    if prev.link_density <= 0.555556:
+        if curr.text_density <= 9:
+            if next_.text_density <= 10:
+                return prev.text_density > 4
+            return True
+        return next_.text_density != 0
+    return next_.text_density > 11
+
+
+class MainContentExtractor:
+    """
+    Keeps the text blocks of a document that look like its main content.
+
+    Feed it start_element, end_element and add_text in document order (every
+    started element must end, inner elements first), then call finish() and
+    get_text().
+    """
+
+    def __init__(self, min_words: Optional[int] = None, max_chars: Optional[int] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            min_words: Fewest words of main content for the page to count as having any
+                (default: config.MAIN_CONTENT_MIN_WORDS)
+            max_chars: Most characters of main content kept (default: no limit)
+        """
+        self.min_words = config.MAIN_CONTENT_MIN_WORDS if min_words is None else min_words
+        self.max_chars = max_chars
+        self.content: List[str] = []
+        self.content_chars = 0
+        self.content_words = 0
+        self._depth = 0
+        # Depth of the element that opened the current boilerplate region, and
+        # the number of open links
+        self._unlikely_depth: Optional[int] = None
+        self._links = 0
+        self._in_title = False
+        self._title_parts: List[str] = []
+        self._title: Optional[Set[str]] = None
+        self._block = _TextBlock()
+        # Last two complete blocks, waiting for their next neighbour
+        self._prev = _EMPTY_BLOCK
+        self._curr: Optional[_TextBlock] = None
+
+    def start_element(self, name: str, node: Any, get_attr: Callable[[Any, str], Optional[str]]) -> None:
+        """
+        Handle the start of an element.
+
+        Args:
+            name: Tag name
+            node: The element, passed to get_attr
+            get_attr: Function getting an attribute of the element (None if it is missing)
+        """
+        self._depth += 1
+        if name in BLOCK_TAGS:
+            self._end_block()
+            if self._unlikely_depth is None and self._is_unlikely(name, node, get_attr):
+                self._unlikely_depth = self._depth
+            self._block.unlikely = self._unlikely_depth is not None
+        elif name == "a":
+            self._links += 1
+        if name == "title" and self._title is None:
+            self._in_title = True
+
+    def end_element(self, name: str) -> None:
+        """
+        Handle the end of an element.
+
+        Args:
+            name: Tag name
+        """
+        if name in BLOCK_TAGS:
+            self._end_block()
+            if self._unlikely_depth == self._depth:
+                self._unlikely_depth = None
+            self._block.unlikely = self._unlikely_depth is not None
+        elif name == "a":
+            self._links = max(self._links - 1, 0)
+        if name == "title" and self._in_title:
+            self._in_title = False
+            title = " ".join("".join(self._title_parts).split())
+            self._title = {title.lower()} | {part.lower() for part in _TITLE_SEPARATORS.split(title)}
+        self._depth -= 1
+
+    def add_text(self, text: str) -> None:
+        """
+        Handle a string of visible text.
+
+        Args:
+            text: Text of the string
+        """
+        if self._in_title:
+            self._title_parts.append(text)
+        words = len(text.split())
+        if not words:
+            # Whitespace still separates the words around it
+            if self._block.texts:
+                self._block.texts.append(" ")
+            return
+        block = self._block
+        block.words += words
+        if self._links:
+            block.link_words += words
+        if self.max_chars is None or block.chars < self.max_chars:
+            block.texts.append(text)
+            block.chars += len(text)
+
+    def finish(self) -> None:
+        """Classify the last blocks once the whole document has been fed."""
+        self._end_block()
+        if self._curr is not None:
+            self._classify(_EMPTY_BLOCK)
+            self._curr = None
+
+    def get_text(self) -> Optional[str]:
+        """
+        Get the main content found.
+
+        Returns:
+            Optional[str]: Main content, one phrase per line, or None if it has fewer
+                than min_words words (pages such as listings and home pages)
+        """
+        if self.content_words < self.min_words:
+            return None
+        return "\n".join(self.content)
+
+    def _is_unlikely(self, name: str, node: Any, get_attr: Callable[[Any, str], Optional[str]]) -> bool:
+        """Check whether a block-level element opens a boilerplate region."""
+        if name in UNLIKELY_TAGS:
+            return True
+        if (get_attr(node, "role") or "").lower() in UNLIKELY_ROLES:
+            return True
+        hints = f"{get_attr(node, 'class') or ''} {get_attr(node, 'id') or ''}"
+        return bool(UNLIKELY_PATTERN.search(hints)) and not CONTENT_PATTERN.search(hints)
+
+    def _end_block(self) -> None:
+        """Close the current block and classify the one before it."""
+        block = self._block
+        if not block.words:
+            block.texts = []
+            block.chars = 0
+            return
+        block.close()
+        if self._curr is not None:
+            self._classify(block)
+        self._curr = block
+        self._block = _TextBlock()
+
+    def _classify(self, next_: _TextBlock) -> None:
+        """Classify the waiting block now that its next neighbour is known."""
+        curr = self._curr
+        text = curr.get_text()
+        if not curr.unlikely and (_is_content(self._prev, curr, next_) or self._is_title(text)):
+            if self.max_chars is None or self.content_chars < self.max_chars:
+                if self.max_chars is not None:
+                    text = text[:self.max_chars - self.content_chars]
+                self.content.append(text)
+                self.content_chars += len(text) + 1
+            self.content_words += curr.words
+        self._prev = curr
+        # Only the densities of the previous block are needed
+        curr.texts = []
+
+    def _is_title(self, text: str) -> bool:
+        """Check whether a block repeats the document title (the headline), which is main content."""
+        return self._title is not None and " ".join(text.split()).lower() in self._title
@@ -0,0 +1,308 @@
+"""
+Staged producer/consumer pipeline connected by bounded queues.
+
+Items flow from a source through a chain of stages to the caller, which is
+the last stage (the sink). Every stage has its own worker threads and reads
+from a bounded queue, and a worker blocks while the queue of the stage after
+it is full. A slow stage therefore stalls the stages before it instead of
+letting items pile up in memory (backpressure), and the time each stage
+spends working, blocked on the next stage and waiting for items shows which
+stage is the bottleneck.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import src.utils.config as config
+
+# Seconds between checks for an aborted pipeline while blocked on a queue
+_POLL_SECONDS = 0.1
+
+# Marks the end of the items, once per worker of the stage receiving it
+_DONE = object()
+
+
+class _Stage:
+    """One stage of a pipeline: its input queue, workers and counters."""
+
+    def __init__(self, name: str, workers: int, queue_size: Optional[int],
+                 handler: Optional[Callable[[Any], Optional[Any]]] = None):
+        self.name = name
+        self.workers = workers
+        self.handler = handler
+        # The source stage has no input queue
+        self.queue: Optional["queue.Queue[Any]"] = queue.Queue(queue_size) if queue_size else None
+        self.lock = threading.Lock()
+        self.finished = 0
+        self.items = 0
+        self.dropped = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+
+    def record(self, busy: float = 0.0, blocked: float = 0.0, items: int = 0, dropped: int = 0) -> None:
+        """Add to the stage's counters; safe to call from its workers."""
+        with self.lock:
+            self.busy += busy
+            self.blocked += blocked
+            self.items += items
+            self.dropped += dropped
+
+    def record_depth(self) -> None:
+        """Sample the depth of the input queue after an item was added to it."""
+        depth = self.queue.qsize()
+        with self.lock:
+            self.depth_samples += 1
+            self.depth_total += depth
+            self.max_depth = max(self.max_depth, depth)
+
+    def get_stats(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Get the stage's counters.
+
+        Args:
+            elapsed: Seconds the pipeline has been running
+
+        Returns:
+            Dict[str, Any]: Workers, items handled and dropped, utilisation (share of
+                worker time spent working), blocked share (waiting on the next stage)
+                and input queue depth
+        """
+        capacity = self.workers * elapsed
+        with self.lock:
+            stats = {
+                "workers": self.workers,
+                "items": self.items,
+                "dropped": self.dropped,
+                "busy_seconds": round(self.busy, 3),
+                "utilisation": round(self.busy / capacity, 3) if capacity else 0.0,
+                "blocked": round(self.blocked / capacity, 3) if capacity else 0.0
+            }
+            if self.queue is not None:
+                stats["queue"] = {
+                    "size": self.queue.maxsize,
+                    "depth": self.queue.qsize(),
+                    "max_depth": self.max_depth,
+                    "mean_depth": round(self.depth_total / self.depth_samples, 2) if self.depth_samples else 0.0
+                }
+        return stats
+
+
+class Pipeline:
+    """
+    Chain of stages, each with its own worker threads, between bounded queues.
+
+    Add the stages with add_stage, then iterate over run(source): the source is
+    consumed on its own thread, every stage's handler on its workers, and the
+    caller receives the last stage's outputs. Items leave a stage with several
+    workers in the order they finish.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            queue_size: Maximum items waiting in front of each stage
+                (default: config.PIPELINE_QUEUE_SIZE)
+        """
+        self.queue_size = max(1, queue_size or config.PIPELINE_QUEUE_SIZE)
+        self._stages: List[_Stage] = []
+        # Stages of the current or last run, from the source to the sink
+        self._running: List[_Stage] = []
+        self._threads: List[threading.Thread] = []
+        self._aborted = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._started: Optional[float] = None
+        self._stopped: Optional[float] = None
+
+    def add_stage(self, name: str, handler: Callable[[Any], Optional[Any]], workers: int = 1) -> None:
+        """
+        Add a stage after the ones already added.
+
+        Args:
+            name: Stage name used in the stats
+            handler: Function turning an item into the next stage's item, or None to drop it;
+                called from the stage's workers at once
+            workers: Number of worker threads
+        """
+        self._stages.append(_Stage(name, max(1, workers), self.queue_size, handler))
+
+    def run(self, source: Iterable[Any], source_name: str = "source", sink_name: str = "sink",
+            stop_source: Optional[Callable[[], None]] = None) -> Iterator[Any]:
+        """
+        Run the pipeline and yield the outputs of its last stage.
+
+        The time the caller spends between outputs counts as the sink's work, so
+        the caller should do its per-item work inside the loop. If a stage
+        fails, the pipeline stops and its exception is raised here.
+
+        Args:
+            source: Items fed to the first stage, iterated on a thread of its own
+            source_name: Name of the source stage in the stats
+            sink_name: Name of the caller's stage in the stats
+            stop_source: Function making the source stop early, called if the pipeline
+                stops before the source is exhausted (optional)
+
+        Yields:
+            Any: Outputs of the last stage
+        """
+        source_stage = _Stage(source_name, 1, None)
+        sink = _Stage(sink_name, 1, self.queue_size)
+        stages = self._running = [source_stage] + self._stages + [sink]
+        self._aborted.clear()
+        self._error = None
+        self._started = time.monotonic()
+        self._stopped = None
+
+        self._threads = [threading.Thread(target=self._run_source, args=(source, source_stage, stages[1]),
+                                          name=f"pipeline-{source_name}", daemon=True)]
+        for stage, next_stage in zip(stages[1:-1], stages[2:]):
+            for index in range(stage.workers):
+                self._threads.append(threading.Thread(target=self._run_worker, args=(stage, next_stage),
+                                                      name=f"pipeline-{stage.name}-{index}", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(sink)
+                if item is _DONE:
+                    break
+                sink.record(items=1)
+                handed_over = time.monotonic()
+                yield item
+                sink.record(busy=time.monotonic() - handed_over)
+            if self._error is not None:
+                raise self._error
+        finally:
+            self._aborted.set()
+            if stop_source is not None:
+                stop_source()
+            for thread in self._threads:
+                thread.join()
+            self._stopped = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the counters of every stage of the current or last run.
+
+        Returns:
+            Dict[str, Any]: Elapsed seconds, each stage's stats (see _Stage.get_stats)
+                and the name of the bottleneck stage, the busiest one after the source
+                (whose busy time includes any wait for its next item)
+        """
+        if self._started is None:
+            return {"elapsed_seconds": 0.0, "stages": {}, "bottleneck": None}
+        elapsed = (self._stopped or time.monotonic()) - self._started
+        stats = {stage.name: stage.get_stats(elapsed) for stage in self._running}
+        consumers = [stage.name for stage in self._running[1:]]
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": stats,
+            "bottleneck": max(consumers, key=lambda name: stats[name]["utilisation"]) if consumers else None
+        }
+
+    def get_queue_depths(self) -> Dict[str, int]:
+        """
+        Get the number of items waiting in front of each stage.
+
+        Returns:
+            Dict[str, int]: Current input queue depth of each stage
+        """
+        return {stage.name: stage.queue.qsize() for stage in self._running if stage.queue is not None}
+
+    def _fail(self, error: BaseException) -> None:
+        """Stop the pipeline after a stage raised an exception."""
+        if self._error is None:
+            self._error = error
+        self._aborted.set()
+
+    def _put(self, stage: _Stage, item: Any) -> bool:
+        """
+        Add an item to a stage's queue, waiting while it is full.
+
+        Returns:
+            bool: False if the pipeline was aborted first
+        """
+        while not self._aborted.is_set():
+            try:
+                stage.queue.put(item, timeout=_POLL_SECONDS)
+            except queue.Full:
+                continue
+            if item is not _DONE:
+                stage.record_depth()
+            return True
+        return False
+
+    def _get(self, stage: _Stage) -> Any:
+        """Take the next item from a stage's queue, or _DONE if the pipeline was aborted."""
+        while not self._aborted.is_set():
+            try:
+                return stage.queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _finish(self, next_stage: _Stage) -> None:
+        """Tell every worker of the next stage that no more items are coming."""
+        for _ in range(next_stage.workers):
+            if not self._put(next_stage, _DONE):
+                return
+
+    def _run_source(self, source: Iterable[Any], stage: _Stage, next_stage: _Stage) -> None:
+        """Feed the source's items to the first stage."""
+        iterator = iter(source)
+        try:
+            while True:
+                start = time.monotonic()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                fetched = time.monotonic()
+                stage.record(busy=fetched - start, items=1)
+                if not self._put(next_stage, item):
+                    return
+                stage.record(blocked=time.monotonic() - fetched)
+            self._finish(next_stage)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except BaseException as e:
+                    self._fail(e)
+
+    def _run_worker(self, stage: _Stage, next_stage: _Stage) -> None:
+        """Pass a stage's items through its handler to the next stage."""
+        try:
+            while True:
+                item = self._get(stage)
+                if item is _DONE:
+                    break
+                start = time.monotonic()
+                output = stage.handler(item)
+                handled = time.monotonic()
+                if output is None:
+                    stage.record(busy=handled - start, items=1, dropped=1)
+                    continue
+                stage.record(busy=handled - start, items=1)
+                if not self._put(next_stage, output):
+                    return
+                stage.record(blocked=time.monotonic() - handled)
+            if self._aborted.is_set():
+                return
+            # The last worker of the stage to finish passes the end on
+            with stage.lock:
+                stage.finished += 1
+                last = stage.finished == stage.workers
+            if last:
+                self._finish(next_stage)
+        except BaseException as e:
+            self._fail(e)
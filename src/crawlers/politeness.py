@@ -0,0 +1,177 @@
+"""
+Per-host politeness scheduling with token buckets.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional
+
+import src.utils.config as config
+from src.utils.url_utils import get_host
+
+
+class TokenBucket:
+    """Token bucket that hands out request slots at a steady rate with bursts."""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens the bucket can hold
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Take one token, borrowing against future refills if the bucket is empty.
+
+        Returns:
+            float: Seconds the caller must wait before using the token
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class PolitenessScheduler:
+    """Space out requests per host so that one slow host never blocks the others."""
+
+    def __init__(self, default_rate: Optional[float] = None, default_burst: Optional[int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            default_rate: Requests per second for hosts without their own settings
+                (default: 1 / config.REQUEST_DELAY)
+            default_burst: Burst size for hosts without their own settings
+                (default: config.REQUEST_BURST)
+        """
+        self.default_rate = default_rate or (1.0 / config.REQUEST_DELAY if config.REQUEST_DELAY else float("inf"))
+        self.default_burst = default_burst or config.REQUEST_BURST
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """
+        Set the request rate and burst size for a host.
+
+        Args:
+            host: Host key (see get_host)
+            rate: Requests per second (default: scheduler default)
+            burst: Burst size (default: scheduler default)
+        """
+        with self._lock:
+            is_new = host not in self._buckets
+            bucket = self._get_bucket(host)
+            bucket.rate = rate or self.default_rate
+            bucket.burst = max(1, burst or self.default_burst)
+            bucket.tokens = bucket.burst if is_new else min(bucket.tokens, bucket.burst)
+
+    def limit_rate(self, host: str, max_rate: float) -> None:
+        """
+        Lower the request rate for a host if it is currently above max_rate.
+
+        Args:
+            host: Host key (see get_host)
+            max_rate: Highest allowed requests per second
+        """
+        with self._lock:
+            bucket = self._get_bucket(host)
+            if max_rate < bucket.rate:
+                bucket.rate = max_rate
+                bucket.burst = 1
+                bucket.tokens = min(bucket.tokens, 1)
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+        """Get the bucket for a host, creating it with the defaults. Caller holds the lock."""
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.default_rate, self.default_burst)
+        return self._buckets[host]
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve the next request slot for the host of a URL.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        host = get_host(url)
+        with self._lock:
+            delay = self._get_bucket(host).reserve()
+            stats = self._stats.setdefault(host, {"requests": 0, "total_wait": 0.0, "max_wait": 0.0})
+            stats["requests"] += 1
+            stats["total_wait"] += delay
+            stats["max_wait"] = max(stats["max_wait"], delay)
+        return delay
+
+    def wait(self, url: str) -> float:
+        """
+        Block the calling thread until a request slot for the URL's host is available.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            float: Seconds waited
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url: str) -> float:
+        """
+        Wait without blocking the event loop until a request slot is available.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            float: Seconds waited
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def get_stats(self, hosts: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-host wait statistics.
+
+        Args:
+            hosts: Hosts to report (default: all hosts seen)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Requests, total/avg/max wait in seconds and the
+                configured rate for each host
+        """
+        with self._lock:
+            selected = list(hosts) if hosts is not None else list(self._stats)
+            report = {}
+            for host in selected:
+                stats = self._stats.get(host)
+                if not stats:
+                    continue
+                report[host] = {
+                    "requests": stats["requests"],
+                    "total_wait": round(stats["total_wait"], 3),
+                    "avg_wait": round(stats["total_wait"] / stats["requests"], 3),
+                    "max_wait": round(stats["max_wait"], 3),
+                    "rate": self._buckets[host].rate,
+                    "burst": self._buckets[host].burst
+                }
+            return report
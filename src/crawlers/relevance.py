@@ -0,0 +1,156 @@
+"""
+Relevance scoring for focused crawling.
+
+A focused crawl spends its page budget on the pages most likely to be about
+a topic, given as a list of keywords (config.NEWS_KEYWORDS by default). Each
+outgoing link is scored before it is fetched from its anchor text, the text
+around it, the words of its URL and the keywords of the page linking to it,
+and the frontier crawls the highest scoring links first.
+"""
+import re
+import urllib.parse
+from typing import Any, Dict, List, Optional
+
+import src.utils.config as config
+
+
+def _compile_keyword(keyword: str) -> "re.Pattern":
+    """
+    Compile a keyword into a pattern matching it as whole words.
+
+    Words may be separated by any non-alphanumeric characters, so "supply
+    chain" also matches "supply-chain" and "supply_chain" in URLs, and each
+    word may take a plural "s".
+
+    Args:
+        keyword: Keyword or phrase
+
+    Returns:
+        re.Pattern: Case-insensitive pattern
+    """
+    words = re.findall(r"[a-z0-9]+", keyword.lower())
+    body = r"[\W_]+".join(f"{re.escape(word)}(?:e?s)?" for word in words)
+    return re.compile(rf"(?<![a-z0-9]){body}(?![a-z0-9])", re.IGNORECASE)
+
+
+class RelevanceScorer:
+    """Scores pages and links by how many of the topic keywords they mention."""
+
+    def __init__(self, keywords: Optional[List[str]] = None, weights: Optional[Dict[str, float]] = None):
+        """
+        Initialize the scorer.
+
+        Args:
+            keywords: Topic keywords (default: config.NEWS_KEYWORDS)
+            weights: Overrides of config.FOCUSED_CRAWL_WEIGHTS, the weight of each
+                signal in a link's score
+                - anchor: Anchor text of the link
+                - context: Text around the link
+                - url: Words of the link's URL
+                - parent: Keywords of the page linking to it
+        """
+        self.keywords = list(keywords or config.NEWS_KEYWORDS)
+        self._patterns = [_compile_keyword(keyword) for keyword in self.keywords]
+        weights = {**config.FOCUSED_CRAWL_WEIGHTS, **(weights or {})}
+        total = sum(weights.values()) or 1.0
+        self.weights = {signal: weight / total for signal, weight in weights.items()}
+        self.pages = 0
+        self.relevant_pages = 0
+        self._total_relevance = 0.0
+
+    def _count_matches(self, text: str) -> int:
+        """Count the distinct keywords a text mentions."""
+        return sum(1 for pattern in self._patterns if pattern.search(text))
+
+    @staticmethod
+    def _saturate(matches: int) -> float:
+        """Map a number of matched keywords to a score in [0, 1); each match halves the gap to 1."""
+        return 1.0 - 0.5 ** matches
+
+    def score_text(self, text: str) -> float:
+        """
+        Score a text by the distinct topic keywords it mentions.
+
+        Args:
+            text: Text to score
+
+        Returns:
+            float: Score between 0 (no keyword) and 1
+        """
+        return self._saturate(self._count_matches(text)) if text else 0.0
+
+    def score_keywords(self, keywords: List[str]) -> float:
+        """
+        Score a page by its extracted keywords (see TextProcessor.extract_keywords).
+
+        Args:
+            keywords: Keywords of the page
+
+        Returns:
+            float: Score between 0 (no topic keyword) and 1
+        """
+        return self._saturate(sum(
+            1 for pattern in self._patterns if any(pattern.search(keyword) for keyword in keywords)
+        ))
+
+    def score_url(self, url: str) -> float:
+        """
+        Score a URL by the words of its path and query.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            float: Score between 0 (no keyword) and 1
+        """
+        parts = urllib.parse.urlsplit(url)
+        return self.score_text(urllib.parse.unquote_plus(f"{parts.path} {parts.query}"))
+
+    def score_link(self, url: str, anchor: str = "", context: str = "", parent: float = 0.0) -> float:
+        """
+        Score a link before it is fetched.
+
+        Args:
+            url: Absolute URL of the link
+            anchor: Anchor text of the link
+            context: Text around the link
+            parent: Score of the page linking to it (see score_keywords)
+
+        Returns:
+            float: Weighted score between 0 and 1, used as the link's frontier priority
+        """
+        return (self.weights.get("anchor", 0.0) * self.score_text(anchor)
+                + self.weights.get("context", 0.0) * self.score_text(context)
+                + self.weights.get("url", 0.0) * self.score_url(url)
+                + self.weights.get("parent", 0.0) * parent)
+
+    def record_page(self, text: str) -> float:
+        """
+        Score a crawled page for the crawl statistics.
+
+        Args:
+            text: Page text
+
+        Returns:
+            float: Score of the page text
+        """
+        score = self.score_text(text)
+        self.pages += 1
+        self.relevant_pages += score > 0
+        self._total_relevance += score
+        return score
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the crawled pages.
+
+        Returns:
+            Dict[str, Any]: Topic keywords, pages scored, pages mentioning a keyword and
+                their mean score
+        """
+        return {
+            "keywords": self.keywords,
+            "pages": self.pages,
+            "relevant_pages": self.relevant_pages,
+            "mean_relevance": round(self._total_relevance / self.pages, 4) if self.pages else 0.0
+        }
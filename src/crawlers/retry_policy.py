@@ -0,0 +1,400 @@
+"""
+Retry policy with jittered exponential backoff and per-host circuit breakers.
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+
+import src.utils.config as config
+from src.utils.url_utils import get_host
+
+# Status codes worth retrying: the server is overloaded, rate limiting or
+# temporarily broken
+RETRYABLE_STATUS_CODES = frozenset([408, 425, 429, 500, 502, 503, 504])
+
+# Request errors caused by the request itself rather than the server
+PERMANENT_REQUEST_ERRORS = (
+    requests.exceptions.InvalidURL,
+    requests.exceptions.InvalidSchema,
+    requests.exceptions.MissingSchema,
+    requests.exceptions.InvalidHeader,
+    requests.exceptions.TooManyRedirects,
+)
+
+
+class HTTPStatusError(Exception):
+    """Raised when a page is answered with an error status code."""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        """
+        Initialize the error.
+
+        Args:
+            status_code: HTTP status code
+            retry_after: Seconds the server asked us to wait (optional)
+        """
+        super().__init__(f"HTTP Error: {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Optional[float]: Seconds to wait or None if missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryPolicy:
+    """Decide whether and when a failed fetch attempt is retried."""
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Attempts per URL including the first (default: config.MAX_RETRIES)
+            base_delay: Backoff before the first retry in seconds (default: config.RETRY_BACKOFF_BASE)
+            max_delay: Upper bound for any single wait (default: config.RETRY_BACKOFF_MAX)
+        """
+        self.max_attempts = max(1, max_attempts or config.MAX_RETRIES)
+        self.base_delay = base_delay if base_delay is not None else config.RETRY_BACKOFF_BASE
+        self.max_delay = max_delay if max_delay is not None else config.RETRY_BACKOFF_MAX
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Check whether an attempt that failed with this error is worth retrying.
+
+        Timeouts, connection errors and retryable status codes are retried;
+        other 4xx responses and malformed requests are not.
+
+        Args:
+            error: Error raised by the attempt
+
+        Returns:
+            bool: True if the attempt should be retried
+        """
+        if isinstance(error, HTTPStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        return not isinstance(error, PERMANENT_REQUEST_ERRORS)
+
+    def is_host_failure(self, error: Exception) -> bool:
+        """
+        Check whether an error says something about the health of the host.
+
+        A 404 means the host is answering fine, so only errors that would be
+        retried count towards the circuit breaker.
+
+        Args:
+            error: Error raised by the attempt
+
+        Returns:
+            bool: True if the error should count against the host
+        """
+        return self.is_retryable(error)
+
+    def is_host_response(self, error: Exception) -> bool:
+        """
+        Check whether an error shows that the host answered the request.
+
+        Permanent error statuses such as 404 and redirect loops still prove the
+        host is reachable, so they count as a success for the circuit breaker.
+
+        Args:
+            error: Error raised by the attempt
+
+        Returns:
+            bool: True if the host answered and the error does not count against it
+        """
+        if self.is_host_failure(error):
+            return False
+        return isinstance(error, (HTTPStatusError, requests.exceptions.TooManyRedirects))
+
+    def get_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Get the wait before the next attempt.
+
+        Uses full-jitter exponential backoff; a Retry-After sent by the server
+        is honoured as a lower bound.
+
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            error: Error raised by the attempt (optional)
+
+        Returns:
+            float: Seconds to wait
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.max_delay)
+
+
+# Seconds between checks while another request probes a half-open circuit
+PROBE_POLL_SECONDS = 0.5
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker that pauses hosts after repeated failures.
+
+    A circuit opens after failure_threshold consecutive failures. Once its
+    cooldown has passed it is half-open: a single probe request is let through,
+    and its success closes the circuit while its failure opens it again for
+    twice as long. Failures of requests sent before the circuit opened are
+    ignored, so requests that were in flight when it opened cannot trip it again.
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = None, cooldown: Optional[float] = None,
+                 max_cooldown: Optional[float] = None, max_trips: Optional[int] = None,
+                 probe_timeout: Optional[float] = None):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+                (default: config.CIRCUIT_BREAKER_THRESHOLD)
+            cooldown: Seconds the circuit stays open after the first trip; doubled on
+                each further trip (default: config.CIRCUIT_BREAKER_COOLDOWN)
+            max_cooldown: Upper bound for the cooldown (default: config.CIRCUIT_BREAKER_MAX_COOLDOWN)
+            max_trips: Consecutive trips after which the host is given up for the
+                rest of the process (default: config.CIRCUIT_BREAKER_MAX_TRIPS)
+            probe_timeout: Seconds after which a probe that has not reported back is
+                abandoned and another one let through (default: config.CIRCUIT_BREAKER_PROBE_TIMEOUT)
+        """
+        self.failure_threshold = failure_threshold or config.CIRCUIT_BREAKER_THRESHOLD
+        self.cooldown = cooldown if cooldown is not None else config.CIRCUIT_BREAKER_COOLDOWN
+        self.max_cooldown = max_cooldown if max_cooldown is not None else config.CIRCUIT_BREAKER_MAX_COOLDOWN
+        self.max_trips = max_trips or config.CIRCUIT_BREAKER_MAX_TRIPS
+        self.probe_timeout = probe_timeout if probe_timeout is not None else config.CIRCUIT_BREAKER_PROBE_TIMEOUT
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _get_state(self, host: str) -> Dict[str, Any]:
+        """Get the state of a host. Caller holds the lock."""
+        if host not in self._hosts:
+            self._hosts[host] = {
+                "failures": 0,
+                "open_until": 0.0,
+                # When the circuit last opened, and when the current probe was sent
+                "opened_at": float("-inf"),
+                "probe_started": None,
+                "consecutive_trips": 0,
+                "trips": 0,
+                "rejections": 0
+            }
+        return self._hosts[host]
+
+    def _is_given_up(self, state: Dict[str, Any]) -> bool:
+        """Check whether a host has tripped too often in a row. Caller holds the lock."""
+        return state["consecutive_trips"] >= self.max_trips
+
+    def _get_status(self, state: Dict[str, Any], now: float) -> str:
+        """
+        Get the circuit status of a host. Caller holds the lock.
+
+        Returns:
+            str: "closed", "open", "half_open" (waiting for or running a probe) or "given_up"
+        """
+        if self._is_given_up(state):
+            return "given_up"
+        if now < state["open_until"]:
+            return "open"
+        return "half_open" if state["consecutive_trips"] else "closed"
+
+    def _is_probing(self, state: Dict[str, Any], now: float) -> bool:
+        """Check whether a probe of a half-open circuit is in flight. Caller holds the lock."""
+        started = state["probe_started"]
+        return started is not None and now - started < self.probe_timeout
+
+    def allow_request(self, url: str) -> bool:
+        """
+        Check whether a request to the URL's host may be sent.
+
+        A half-open circuit lets exactly one request through as its probe and
+        holds back the others until the probe reports back.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            bool: False while the circuit for the host is open or another request is probing it
+        """
+        with self._lock:
+            state = self._get_state(get_host(url))
+            now = time.monotonic()
+            status = self._get_status(state, now)
+            if status in ("open", "given_up"):
+                state["rejections"] += 1
+                return False
+            if status == "half_open":
+                if self._is_probing(state, now):
+                    return False
+                state["probe_started"] = now
+            return True
+
+    def is_probing(self, url: str) -> bool:
+        """
+        Check whether a probe of the URL's host is in flight.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            bool: True while the circuit is half-open and another request is its probe
+        """
+        with self._lock:
+            state = self._get_state(get_host(url))
+            now = time.monotonic()
+            return self._get_status(state, now) == "half_open" and self._is_probing(state, now)
+
+    def get_pause(self, url: str) -> float:
+        """
+        Get how long requests to the URL's host are paused.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            float: Seconds until the circuit lets a probe through, or until it is worth
+                checking again while another request is probing (0 if closed or given up)
+        """
+        with self._lock:
+            state = self._get_state(get_host(url))
+            now = time.monotonic()
+            status = self._get_status(state, now)
+            if status == "open":
+                return state["open_until"] - now
+            if status == "half_open" and self._is_probing(state, now):
+                return PROBE_POLL_SECONDS
+            return 0.0
+
+    async def wait_async(self, url: str) -> None:
+        """
+        Wait without blocking the event loop while the URL's host is paused.
+
+        Args:
+            url: URL about to be requested
+        """
+        pause = self.get_pause(url)
+        while pause > 0:
+            await asyncio.sleep(pause)
+            pause = self.get_pause(url)
+
+    def record_success(self, url: str) -> None:
+        """
+        Record a successful request, closing the circuit.
+
+        Args:
+            url: URL that was fetched
+        """
+        with self._lock:
+            state = self._get_state(get_host(url))
+            state["failures"] = 0
+            state["consecutive_trips"] = 0
+            state["probe_started"] = None
+
+    def release_probe(self, url: str, started: float) -> None:
+        """
+        Let another request probe the host if this request was its probe.
+
+        Called once a request is done, whatever its outcome, so a probe that
+        reported neither success nor failure (a malformed request or an
+        interrupted attempt) does not hold the host until the probe timeout.
+
+        Args:
+            url: URL that was requested
+            started: time.monotonic() when the request was allowed
+        """
+        with self._lock:
+            state = self._get_state(get_host(url))
+            # Only the probe is let through once it has started, so any request
+            # allowed since then is the probe
+            if state["probe_started"] is not None and started >= state["probe_started"]:
+                state["probe_started"] = None
+
+    def record_failure(self, url: str, started: Optional[float] = None) -> bool:
+        """
+        Record a failed request and open the circuit if the host keeps failing.
+
+        While the circuit is open or half-open, only the failure of its probe
+        counts, and it opens the circuit again.
+
+        Args:
+            url: URL that failed
+            started: time.monotonic() when the request was allowed (default: now)
+
+        Returns:
+            bool: True if this failure tripped the breaker
+        """
+        with self._lock:
+            state = self._get_state(get_host(url))
+            now = time.monotonic()
+            if started is None:
+                started = now
+            # Sent before the circuit opened: already accounted for by the trip
+            if started < state["opened_at"]:
+                return False
+
+            if state["consecutive_trips"]:
+                probe_started = state["probe_started"]
+                if probe_started is None or started < probe_started:
+                    return False
+            else:
+                state["failures"] += 1
+                if state["failures"] < self.failure_threshold:
+                    return False
+
+            cooldown = min(self.max_cooldown, self.cooldown * (2 ** state["consecutive_trips"]))
+            state["open_until"] = now + cooldown
+            state["opened_at"] = now
+            state["probe_started"] = None
+            state["consecutive_trips"] += 1
+            state["trips"] += 1
+            state["failures"] = 0
+            return True
+
+    def get_stats(self, hosts: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-host breaker statistics.
+
+        Args:
+            hosts: Hosts to report (default: all hosts seen)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Trips, rejected requests and current state per host
+        """
+        with self._lock:
+            selected = list(hosts) if hosts is not None else list(self._hosts)
+            report = {}
+            for host in selected:
+                state = self._hosts.get(host)
+                if state is None:
+                    continue
+                report[host] = {
+                    "trips": state["trips"],
+                    "rejections": state["rejections"],
+                    "state": self._get_status(state, time.monotonic())
+                }
+            return report
@@ -0,0 +1,234 @@
+"""
+Adaptive revisit scheduling from the observed change history of pages.
+
+Each check of a page records whether its content hash changed since the
+previous check. Pages are modelled as changing at a constant (Poisson) rate,
+estimated from the number of checks, the number of detected changes and the
+time they span, so that a run only re-fetches the pages most likely to have
+changed.
+"""
+import heapq
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import src.utils.config as config
+
+
+def estimate_change_rate(checks: int, changes: int, observed_seconds: float,
+                         default_interval: Optional[float] = None,
+                         max_interval: Optional[float] = None) -> float:
+    """
+    Estimate how often a page changes.
+
+    Uses the estimator of Cho and Garcia-Molina for pages checked at
+    intervals, which corrects for several changes between two checks being
+    seen as one: rate = -ln((n - X + 0.5) / (n + 0.5)) / (T / n).
+
+    Args:
+        checks: Number of revisits n (checks after the first)
+        changes: Number of revisits X that found changed content
+        observed_seconds: Total time T between the first and the last check
+        default_interval: Expected seconds between changes of a page without
+            history (default: config.REVISIT_DEFAULT_INTERVAL)
+        max_interval: Longest expected time between changes, so pages never
+            seen changing are still revisited (default: config.REVISIT_MAX_INTERVAL)
+
+    Returns:
+        float: Estimated changes per second
+    """
+    default_interval = default_interval or config.REVISIT_DEFAULT_INTERVAL
+    max_interval = max_interval or config.REVISIT_MAX_INTERVAL
+    if checks <= 0 or observed_seconds <= 0:
+        return 1.0 / default_interval
+    rate = -math.log((checks - changes + 0.5) / (checks + 0.5)) / (observed_seconds / checks)
+    return max(rate, 1.0 / max_interval)
+
+
+def change_probability(rate: float, elapsed_seconds: float) -> float:
+    """
+    Get the probability that a page changed since it was last checked.
+
+    Args:
+        rate: Estimated changes per second
+        elapsed_seconds: Time since the last check
+
+    Returns:
+        float: Probability of at least one change
+    """
+    return 1.0 - math.exp(-rate * max(0.0, elapsed_seconds))
+
+
+class RevisitIndex:
+    """SQLite-backed change history of pages keyed by URL hash."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: SQLite database file (default: config.REVISIT_INDEX_PATH)
+        """
+        self.path = path or config.REVISIT_INDEX_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # Only counters are kept per URL, not the list of past checks
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS revisits (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT,
+                checks INTEGER NOT NULL DEFAULT 0,
+                changes INTEGER NOT NULL DEFAULT 0,
+                observed_seconds REAL NOT NULL DEFAULT 0,
+                last_checked REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def get(self, url_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the change history of a URL.
+
+        Args:
+            url_hash: Hash of the URL (see BaseCrawler._get_url_hash)
+
+        Returns:
+            Optional[Dict[str, Any]]: History with its estimated change rate, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, content_hash, checks, changes, observed_seconds, last_checked "
+                "FROM revisits WHERE url_hash = ?",
+                (url_hash,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {
+            "url": row[0],
+            "content_hash": row[1],
+            "checks": row[2],
+            "changes": row[3],
+            "observed_seconds": row[4],
+            "last_checked": row[5],
+            "change_rate": estimate_change_rate(row[2], row[3], row[4])
+        }
+
+    def record(self, url_hash: str, url: str, content_hash: Optional[str],
+               checked_at: Optional[float] = None) -> bool:
+        """
+        Record a check of a page.
+
+        Args:
+            url_hash: Hash of the URL
+            url: The URL
+            content_hash: Hash of the page's text content (None if the server
+                reported the page as not modified)
+            checked_at: Time of the check (default: now)
+
+        Returns:
+            bool: True if the content changed since the previous check
+        """
+        checked_at = checked_at if checked_at is not None else time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, last_checked FROM revisits WHERE url_hash = ?",
+                (url_hash,)
+            ).fetchone()
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO revisits (url_hash, url, content_hash, last_checked) VALUES (?, ?, ?, ?)",
+                    (url_hash, url, content_hash, checked_at)
+                )
+                self._conn.commit()
+                return False
+
+            previous_hash, last_checked = row
+            changed = content_hash is not None and content_hash != previous_hash
+            self._conn.execute(
+                "UPDATE revisits SET content_hash = COALESCE(?, content_hash), checks = checks + 1, "
+                "changes = changes + ?, observed_seconds = observed_seconds + ?, last_checked = ? "
+                "WHERE url_hash = ?",
+                (content_hash, int(changed), max(0.0, checked_at - last_checked), checked_at, url_hash)
+            )
+            self._conn.commit()
+        return changed
+
+    def select_due(self, prefix: str, budget: int, min_probability: Optional[float] = None,
+                   now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Pick the pages to re-fetch in this run.
+
+        Pages are ranked by the probability that they changed since their
+        last check; at most budget pages at or above min_probability are due.
+
+        Args:
+            prefix: Only URLs starting with this prefix are considered
+            budget: Maximum number of pages due
+            min_probability: Lowest change probability worth a fetch
+                (default: config.REVISIT_MIN_CHANGE_PROBABILITY)
+            now: Current time (default: now)
+
+        Returns:
+            List[Tuple[str, float]]: URLs and change probabilities, most likely changed first
+        """
+        if min_probability is None:
+            min_probability = config.REVISIT_MIN_CHANGE_PROBABILITY
+        now = now if now is not None else time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, checks, changes, observed_seconds, last_checked "
+                "FROM revisits WHERE substr(url, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchall()
+
+        candidates = (
+            (change_probability(estimate_change_rate(checks, changes, observed), now - last_checked), url)
+            for url, checks, changes, observed, last_checked in rows
+        )
+        due = heapq.nlargest(budget, (c for c in candidates if c[0] >= min_probability))
+        return [(url, probability) for probability, url in due]
+
+    def __contains__(self, url_hash: str) -> bool:
+        """Check whether a URL has a change history."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM revisits WHERE url_hash = ?", (url_hash,)).fetchone()
+        return row is not None
+
+    def get_stats(self, prefix: str) -> Dict[str, Any]:
+        """
+        Get index statistics for a website.
+
+        Args:
+            prefix: Only URLs starting with this prefix are counted
+
+        Returns:
+            Dict[str, Any]: Tracked URLs, checks, detected changes and index file size
+        """
+        with self._lock:
+            tracked, checks, changes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(checks), 0), COALESCE(SUM(changes), 0) "
+                "FROM revisits WHERE substr(url, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchone()
+        return {
+            "tracked_urls": tracked,
+            "checks": checks,
+            "changes": changes,
+            "index_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,304 @@
+"""
+robots.txt parsing and a shared per-host cache of compiled rules.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import src.utils.config as config
+from src.utils.url_utils import get_host
+
+# Fetch function used by the cache: takes the robots.txt URL and returns
+# (status_code, body), or None if the host could not be reached
+RobotsFetcher = Callable[[str], Optional[Tuple[int, str]]]
+
+
+class RobotsRules:
+    """Compiled allow/disallow rules of the robots.txt group that applies to the crawler."""
+
+    def __init__(self, rules: Optional[List[Tuple[str, bool]]] = None, crawl_delay: Optional[float] = None,
+                 sitemaps: Optional[List[str]] = None, disallow_all: bool = False):
+        """
+        Compile the rules.
+
+        Args:
+            rules: List of (path pattern, allowed) pairs
+            crawl_delay: Crawl-delay in seconds (optional)
+            sitemaps: Sitemap URLs listed in the file
+            disallow_all: Whether every path is disallowed (e.g. robots.txt unreachable)
+        """
+        self.rules = rules or []
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        self.disallow_all = disallow_all
+
+        # Longest pattern wins; on equal length Allow wins over Disallow
+        ordered = sorted(self.rules, key=lambda rule: (-len(rule[0]), not rule[1]))
+        self._matchers: List[Tuple[Callable[[str], Any], bool]] = [
+            (self._compile(pattern), allowed) for pattern, allowed in ordered
+        ]
+
+    @staticmethod
+    def _compile(pattern: str) -> Callable[[str], Any]:
+        """
+        Compile a path pattern into a match function.
+
+        Plain prefixes use str.startswith; patterns with '*' or a trailing '$'
+        are turned into a regular expression.
+
+        Args:
+            pattern: robots.txt path pattern
+
+        Returns:
+            Callable[[str], Any]: Function returning a truthy value if the path matches
+        """
+        if "*" not in pattern and not pattern.endswith("$"):
+            return lambda path: path.startswith(pattern)
+
+        anchored = pattern.endswith("$")
+        if anchored:
+            pattern = pattern[:-1]
+        regex = ".*".join(re.escape(part) for part in pattern.split("*"))
+        return re.compile(regex + ("$" if anchored else "")).match
+
+    def is_allowed(self, url: str) -> bool:
+        """
+        Check whether a URL may be crawled.
+
+        Args:
+            url: Absolute URL to check
+
+        Returns:
+            bool: True if allowed, False otherwise
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if path == "/robots.txt":
+            return True
+        if self.disallow_all:
+            return False
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        for matches, allowed in self._matchers:
+            if matches(path):
+                return allowed
+        return True
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str = "*") -> "RobotsRules":
+        """
+        Parse robots.txt content for a user agent.
+
+        The group whose user-agent token is contained in the crawler's user agent
+        is used; the '*' group is the fallback.
+
+        Args:
+            text: robots.txt content
+            user_agent: Crawler user agent token
+
+        Returns:
+            RobotsRules: Compiled rules
+        """
+        agent = user_agent.lower()
+        groups: Dict[str, Dict[str, Any]] = {}
+        current_agents: List[str] = []
+        in_rules = False
+        sitemaps = []
+
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            key, value = line.split(":", 1)
+            key = key.strip().lower()
+            value = value.strip()
+
+            if key == "user-agent":
+                # A user-agent line after rules starts a new group
+                if in_rules:
+                    current_agents = []
+                    in_rules = False
+                token = value.lower()
+                current_agents.append(token)
+                groups.setdefault(token, {"rules": [], "crawl_delay": None})
+            elif key in ("allow", "disallow"):
+                in_rules = True
+                if not value:
+                    continue
+                for token in current_agents:
+                    groups[token]["rules"].append((value, key == "allow"))
+            elif key == "crawl-delay":
+                in_rules = True
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for token in current_agents:
+                    groups[token]["crawl_delay"] = delay
+            elif key == "sitemap":
+                sitemaps.append(value)
+
+        matching = [token for token in groups if token != "*" and token in agent]
+        if matching:
+            group = groups[max(matching, key=len)]
+        else:
+            group = groups.get("*", {"rules": [], "crawl_delay": None})
+
+        return cls(group["rules"], group["crawl_delay"], sitemaps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the rules for the disk cache."""
+        return {
+            "rules": self.rules,
+            "crawl_delay": self.crawl_delay,
+            "sitemaps": self.sitemaps,
+            "disallow_all": self.disallow_all
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RobotsRules":
+        """Restore rules serialized with to_dict."""
+        return cls(
+            [(pattern, allowed) for pattern, allowed in data.get("rules", [])],
+            data.get("crawl_delay"),
+            data.get("sitemaps", []),
+            data.get("disallow_all", False)
+        )
+
+
+class RobotsCache:
+    """
+    In-memory and on-disk cache of compiled robots.txt rules keyed by host.
+
+    The rules depend on the user agent they were compiled for, so the on-disk
+    cache of one user agent is never used for another.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None,
+                 user_agent: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the on-disk cache (default: config.ROBOTS_CACHE_DIR)
+            ttl: Seconds a fetched robots.txt stays valid (default: config.ROBOTS_CACHE_TTL)
+            user_agent: User agent token to match groups against (default: config.ROBOTS_USER_AGENT)
+        """
+        self.cache_dir = cache_dir or config.ROBOTS_CACHE_DIR
+        self.ttl = ttl if ttl is not None else config.ROBOTS_CACHE_TTL
+        self.user_agent = user_agent or config.ROBOTS_USER_AGENT
+        self._entries: Dict[str, Tuple[float, RobotsRules]] = {}
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+
+    def _get_host_lock(self, host: str) -> threading.Lock:
+        """Get the lock that serializes fetching robots.txt for a host."""
+        with self._lock:
+            if host not in self._host_locks:
+                self._host_locks[host] = threading.Lock()
+            return self._host_locks[host]
+
+    def _get_cache_path(self, host: str) -> str:
+        """Get the on-disk cache file for a host and the cache's user agent."""
+        safe_host = re.sub(r"[^a-z0-9.-]", "_", host)
+        agent_hash = hashlib.sha1(self.user_agent.lower().encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{safe_host}-{agent_hash}.json")
+
+    def _load_from_disk(self, host: str) -> Optional[Tuple[float, RobotsRules]]:
+        """Load unexpired rules for a host from disk."""
+        path = self._get_cache_path(host)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() >= data.get("expires_at", 0):
+            return None
+        return data["expires_at"], RobotsRules.from_dict(data["rules"])
+
+    def _save_to_disk(self, host: str, expires_at: float, rules: RobotsRules) -> None:
+        """Write rules for a host to disk atomically."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._get_cache_path(host)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"expires_at": expires_at, "rules": rules.to_dict()}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to cache robots.txt for {host}: {str(e)}")
+
+    def _download(self, url: str, fetch: RobotsFetcher) -> Tuple[float, RobotsRules]:
+        """
+        Download and compile robots.txt for the host of a URL.
+
+        2xx responses are parsed, other 4xx responses mean no restrictions, and
+        server errors or unreachable hosts disallow everything until a shorter
+        retry TTL expires.
+
+        Args:
+            url: Any URL on the host
+            fetch: Function used to download robots.txt
+
+        Returns:
+            Tuple[float, RobotsRules]: Expiry timestamp and compiled rules
+        """
+        parts = urllib.parse.urlsplit(url)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        result = fetch(robots_url)
+
+        if result is not None and 200 <= result[0] < 300:
+            return time.time() + self.ttl, RobotsRules.parse(result[1], self.user_agent)
+        if result is not None and 400 <= result[0] < 500:
+            return time.time() + self.ttl, RobotsRules()
+        return time.time() + config.ROBOTS_ERROR_TTL, RobotsRules(disallow_all=True)
+
+    def get_rules(self, url: str, fetch: RobotsFetcher) -> RobotsRules:
+        """
+        Get the compiled rules for the host of a URL, downloading them at most once per TTL.
+
+        Args:
+            url: Any URL on the host
+            fetch: Function used to download robots.txt on a cache miss
+
+        Returns:
+            RobotsRules: Compiled rules
+        """
+        host = get_host(url)
+        entry = self._entries.get(host)
+        if entry and time.time() < entry[0]:
+            return entry[1]
+
+        with self._get_host_lock(host):
+            # Another thread may have filled the entry while we waited
+            entry = self._entries.get(host)
+            if entry and time.time() < entry[0]:
+                return entry[1]
+
+            entry = self._load_from_disk(host)
+            if entry is None:
+                entry = self._download(url, fetch)
+                self._save_to_disk(host, *entry)
+
+            self._entries[host] = entry
+            return entry[1]
+
+    def is_allowed(self, url: str, fetch: RobotsFetcher) -> bool:
+        """
+        Check whether a URL may be crawled.
+
+        Args:
+            url: URL to check
+            fetch: Function used to download robots.txt on a cache miss
+
+        Returns:
+            bool: True if allowed, False otherwise
+        """
+        return self.get_rules(url, fetch).is_allowed(url)
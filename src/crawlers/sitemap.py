@@ -0,0 +1,265 @@
+"""
+Streaming sitemap reader used to seed the crawl frontier.
+
+Sitemaps (plain, gzipped, or sitemap indexes pointing at more sitemaps) are
+parsed incrementally, so memory use does not grow with the number of entries.
+"""
+import gzip
+import heapq
+import io
+import itertools
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import src.utils.config as config
+
+# Paths tried when robots.txt lists no sitemap
+SITEMAP_PATHS = ("/sitemap.xml", "/sitemap_index.xml")
+
+# Fetch function used by the reader: takes a sitemap URL and returns its body
+# as an iterable of byte chunks, or None if it could not be fetched
+SitemapFetcher = Callable[[str], Optional[Iterable[bytes]]]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a sitemap <lastmod> value (W3C datetime).
+
+    Args:
+        value: Date such as "2024", "2024-05", "2024-05-01" or "2024-05-01T10:00:00Z"
+
+    Returns:
+        Optional[float]: POSIX timestamp, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if len(value) == 4:
+        value += "-01-01"
+    elif len(value) == 7:
+        value += "-01"
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class _ChunkStream(io.RawIOBase):
+    """Readable file object over an iterable of byte chunks, stopping after a byte limit."""
+
+    def __init__(self, chunks: Iterable[bytes], max_bytes: Optional[int] = None):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks: Body as byte chunks
+            max_bytes: Maximum bytes read before the stream ends (optional)
+        """
+        self._chunks = iter(chunks)
+        self._pending = b""
+        self._remaining = max_bytes
+
+    def readable(self) -> bool:
+        """Tell io that the stream can be read."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Read the next bytes into a buffer, taking more chunks as needed.
+
+        Args:
+            buffer: Writable buffer filled from the start
+
+        Returns:
+            int: Number of bytes read, 0 at the end of the chunks or the byte limit
+        """
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b""
+                return 0
+        size = min(len(buffer), len(self._pending))
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+            self._remaining -= size
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def open_sitemap(chunks: Iterable[bytes], max_bytes: Optional[int] = None) -> BinaryIO:
+    """
+    Open a sitemap body for streaming, decompressing it if it is gzipped.
+
+    Args:
+        chunks: Body as byte chunks
+        max_bytes: Maximum (decompressed) bytes read (default: config.SITEMAP_MAX_BYTES)
+
+    Returns:
+        BinaryIO: Readable stream of the sitemap document
+    """
+    max_bytes = max_bytes or config.SITEMAP_MAX_BYTES
+    stream = io.BufferedReader(_ChunkStream(chunks, max_bytes))
+    # .xml.gz files are usually served without Content-Encoding, so check the magic bytes
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        stream = io.BufferedReader(_ChunkStream(_iter_chunks(gzip.GzipFile(fileobj=stream)), max_bytes))
+    return stream
+
+
+def _iter_chunks(fileobj: BinaryIO, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Read a file object in chunks."""
+    return iter(lambda: fileobj.read(chunk_size), b"")
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_sitemap(stream: BinaryIO) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Parse a sitemap or sitemap index incrementally.
+
+    Text sitemaps (one URL per line) are accepted as well.
+
+    Args:
+        stream: Sitemap document (see open_sitemap)
+
+    Yields:
+        Tuple[str, str, Optional[str]]: Entry kind ("url" or "sitemap"), location and raw lastmod
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the XML is malformed or truncated
+    """
+    head = stream.peek(64)[:64].lstrip(b"\xef\xbb\xbf \t\r\n")
+    if head and not head.startswith(b"<"):
+        for line in io.TextIOWrapper(stream, encoding="utf-8", errors="replace"):
+            line = line.strip()
+            if line.startswith(("http://", "https://")):
+                yield "url", line, None
+        return
+
+    root = None
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end":
+            continue
+        kind = _local_name(elem.tag)
+        if kind in ("url", "sitemap"):
+            loc = lastmod = None
+            for child in elem:
+                name = _local_name(child.tag)
+                if name == "loc":
+                    loc = (child.text or "").strip()
+                elif name == "lastmod":
+                    lastmod = child.text
+            if loc:
+                yield kind, loc, lastmod
+            # Drop parsed entries so memory stays flat
+            root.clear()
+
+
+class SitemapReader:
+    """
+    Follows sitemap indexes breadth-first and yields the page entries of every sitemap.
+
+    The sitemaps listed in an index are read most recently modified first, so
+    when the scan budget runs out the entries left unread are the oldest ones.
+    """
+
+    def __init__(self, fetch: SitemapFetcher, max_sitemaps: Optional[int] = None,
+                 max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            fetch: Function returning a sitemap body as byte chunks
+            max_sitemaps: Maximum sitemap files fetched (default: config.SITEMAP_MAX_SITEMAPS)
+            max_bytes: Maximum bytes read per sitemap (default: config.SITEMAP_MAX_BYTES)
+            max_entries: Maximum page entries read over all sitemaps (default: config.SITEMAP_MAX_ENTRIES)
+        """
+        self.fetch = fetch
+        self.max_sitemaps = max_sitemaps or config.SITEMAP_MAX_SITEMAPS
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries or config.SITEMAP_MAX_ENTRIES
+        self.stats = {"sitemaps": 0, "failed": 0, "urls": 0}
+
+    def read(self, sitemap_urls: Iterable[str]) -> Iterator[Tuple[str, Optional[float]]]:
+        """
+        Read sitemaps and the sitemaps listed in sitemap indexes.
+
+        Args:
+            sitemap_urls: Sitemaps to start from
+
+        Yields:
+            Tuple[str, Optional[float]]: Page URL and its lastmod timestamp
+        """
+        queue = deque(sitemap_urls)
+        seen = set(queue)
+        while queue and self.stats["sitemaps"] < self.max_sitemaps and self.stats["urls"] < self.max_entries:
+            sitemap_url = queue.popleft()
+            chunks = self.fetch(sitemap_url)
+            if chunks is None:
+                self.stats["failed"] += 1
+                continue
+            self.stats["sitemaps"] += 1
+
+            children = []
+            try:
+                for kind, loc, lastmod in iter_sitemap(open_sitemap(chunks, self.max_bytes)):
+                    if kind == "sitemap":
+                        if loc not in seen:
+                            seen.add(loc)
+                            children.append((loc, parse_lastmod(lastmod)))
+                    else:
+                        self.stats["urls"] += 1
+                        yield loc, parse_lastmod(lastmod)
+                        if self.stats["urls"] >= self.max_entries:
+                            break
+            except (ET.ParseError, OSError, EOFError):
+                # Entries before the error were used; the rest of the file is skipped
+                self.stats["failed"] += 1
+            finally:
+                close = getattr(chunks, "close", None)
+                if close:
+                    close()
+            queue.extend(loc for loc, _ in select_recent(children, len(children)))
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get reader statistics.
+
+        Returns:
+            Dict[str, int]: Sitemaps read, sitemaps that failed and page entries found
+        """
+        return dict(self.stats)
+
+
+def select_recent(entries: Iterable[Tuple[str, Optional[float]]], limit: int) -> List[Tuple[str, Optional[float]]]:
+    """
+    Keep the most recently modified entries without holding all of them in memory.
+
+    Entries without lastmod rank last; ties keep their sitemap order.
+
+    Args:
+        entries: Page URLs and lastmod timestamps
+        limit: Maximum entries kept
+
+    Returns:
+        List[Tuple[str, Optional[float]]]: Entries, most recently modified first
+    """
+    counter = itertools.count()
+    ranked = heapq.nlargest(
+        limit,
+        ((lastmod if lastmod is not None else float("-inf"), -next(counter), url, lastmod)
+         for url, lastmod in entries)
+    )
+    return [(url, lastmod) for _, _, url, lastmod in ranked]
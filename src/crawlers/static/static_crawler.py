@@ -1,13 +1,29 @@
-from typing import Dict, Any, List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Iterator, Set, Tuple
+import asyncio
 import re
+import threading
 import urllib.parse
-import gc
 import json
+import os
+import requests
 from datetime import datetime
 
+import src.utils.config as config
 from src.crawlers.base_crawler import BaseCrawler
+from src.crawlers.checkpoint import CheckpointStore, PageSpool, dump_url_set, load_url_set
+from src.crawlers.fetch_engine import iterate_async
+from src.crawlers.disk_frontier import DiskFrontier, DiskURLSet
+from src.crawlers.frontier import Frontier
+from src.crawlers.html_extractor import HTMLExtractor
+from src.crawlers.pipeline import Pipeline
+from src.crawlers.relevance import RelevanceScorer
+from src.crawlers.sitemap import SITEMAP_PATHS, SitemapReader, select_recent
+from src.crawlers.trap_detector import TrapDetector
+from src.crawlers.url_set import VISITED_SET_MODES, BloomURLSet, get_url_set_stats
+from src.crawlers.url_templates import URLTemplates
 from src.utils.text_processor import TextProcessor
+from src.utils.url_utils import URLCanonicalizer
+from src.storage.local_storage import LocalStorage
 from src.storage.s3_storage import S3Storage
 from src.utils.logger import CrawlerLogger
 
@@ -15,26 +31,122 @@ from src.utils.logger import CrawlerLogger
 class StaticCrawler(BaseCrawler):
     """Crawler for static websites that don't require JavaScript rendering."""
     
-    def __init__(self, website_config: Dict[str, Any]):
+    def __init__(self, website_config: Dict[str, Any], storage: Optional[Any] = None):
         """
         Initialize static crawler with website configuration.
         
         Args:
             website_config: Dictionary containing website configuration
+            storage: Sink of the crawl's results, with the methods of S3Storage
+                (default: created by _create_storage when the crawl starts)
         """
         super().__init__(website_config)
-        self.visited_urls = set()
+        self.storage = storage
+        self.skipped_urls = set()
         self.page_limit = website_config.get("page_limit", 100)
+        # A focused crawl orders its frontier by the relevance of each link
+        self.focused = website_config.get("focused", config.FOCUSED_CRAWL)
+        self.relevance_scorer = RelevanceScorer(website_config.get("focus_keywords")) if self.focused else None
+        self.focused_context_chars = website_config.get("focused_context_chars", config.FOCUSED_CRAWL_CONTEXT_CHARS)
+        self.html_extractor = HTMLExtractor(website_config.get("parser", config.HTML_PARSER))
+        # Only the main content of pages, without boilerplate, goes to NLP
+        self.main_content = website_config.get("main_content", config.MAIN_CONTENT_EXTRACTION)
+        # Oversized pages are extracted while they download (see BaseCrawler._stream_page)
+        self.stream_threshold = website_config.get("stream_threshold", config.STREAM_THRESHOLD_BYTES)
+        self.link_context_chars = self.focused_context_chars if self.focused else None
+        self.frontier_strategy = website_config.get(
+            "frontier", "priority" if self.focused else config.FRONTIER_STRATEGY
+        )
+        self.frontier_backend = website_config.get("frontier_backend", config.FRONTIER_BACKEND)
+        if self.frontier_backend not in ("memory", "disk"):
+            raise ValueError(f"Unknown frontier backend: {self.frontier_backend}")
+        self.visited_set = website_config.get("visited_set", config.VISITED_SET)
+        if self.visited_set not in VISITED_SET_MODES:
+            raise ValueError(f"Unknown visited set: {self.visited_set}")
+        self.visited_false_positive_rate = website_config.get(
+            "visited_false_positive_rate", config.VISITED_SET_FALSE_POSITIVE_RATE
+        )
+        self.resume = config.RESUME
+        self.checkpoint_interval = website_config.get("checkpoint_interval", config.CHECKPOINT_INTERVAL)
+        # A resumed disk-backed crawl reopens the visited set of its checkpoint
+        self.visited_urls = self._create_visited_set(reset=not self.resume)
+        self.frontier = None
+        # URLs taken from the frontier whose results have not been handled yet
+        self._pending_urls = set()
+        self.canonicalizer = URLCanonicalizer(website_config.get("canonicalization"))
+        # Raw links that canonicalization rewrote, and canonical URLs so far
+        # only reached through a rewrite; together they count duplicates exactly
+        self._rewritten_urls = set()
+        self._canonical_via_rewrite = set()
+        self.trap_detector = TrapDetector(website_config.get("trap_detection"))
+        self.url_templates = URLTemplates(
+            website_config.get("url_templates"), website_config.get("url_template_default"), self.page_limit
+        )
+        self.use_sitemaps = website_config.get("sitemaps", config.USE_SITEMAPS)
+        self.sitemap_stats = None
+        self.revisit_budget = website_config.get("revisit_budget", config.REVISIT_BUDGET) or self.page_limit
         self.text_processor = TextProcessor()
+        # Fetch, parse, NLP and upload run as pipeline stages on their own
+        # threads; the crawl state they share is only touched under the lock
+        self.parse_workers = website_config.get("parse_workers", config.PIPELINE_PARSE_WORKERS)
+        self.nlp_workers = website_config.get("nlp_workers", config.PIPELINE_NLP_WORKERS)
+        self.pipeline_queue_size = website_config.get("pipeline_queue_size", config.PIPELINE_QUEUE_SIZE)
+        self.pipeline: Optional[Pipeline] = None
+        self._state_lock = threading.RLock()
+        # Event loop and event of the running fetch loop, woken when a URL is released
+        self._fetch_wakeup: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+        self._fetch_stopped = False
         self.logger = CrawlerLogger(f"static_crawler_{self.name}")
         self.metrics = {
             "start_time": datetime.now().isoformat(),
             "end_time": None,
             "total_pages": 0,
             "successful_crawls": 0,
-            "failed_crawls": 0
+            "failed_crawls": 0,
+            "failed_attempts": 0,
+            "breaker_trips": 0,
+            "unchanged_pages": 0,
+            "skipped_urls": 0,
+            "truncated_pages": 0,
+            "streamed_pages": 0,
+            "main_content_pages": 0,
+            "text_chars": 0,
+            "nlp_chars": 0,
+            "duplicates_prevented": 0,
+            "trap_pruned_urls": 0,
+            "sitemap_seeds": 0,
+            "revisits_deferred": 0,
+            "wire_bytes": 0,
+            "decoded_bytes": 0
         }
     
+    def extract_all(self, html: str, base_url: str, link_contexts: bool = False) -> Dict[str, Any]:
+        """
+        Extract text, links, images, metadata and the declared canonical URL in one pass.
+        
+        Args:
+            html: HTML content
+            base_url: Base URL to resolve relative links
+            link_contexts: Whether to also extract the text around each link
+            
+        Returns:
+            Dict[str, Any]: Extracted data (see HTMLExtractor.extract)
+        """
+        @self.logger.log_operation("extract_all")
+        def _extract_all():
+            self.logger.debug(f"Extracting page data from {base_url}")
+            extracted = self.html_extractor.extract(
+                html, base_url, self.base_url, self.focused_context_chars if link_contexts else None,
+                self.main_content
+            )
+            self.logger.debug(
+                f"Found {len(extracted['links'])} links, {len(extracted['images'])} images "
+                f"and {len(extracted['text'])} characters of text"
+            )
+            return extracted
+        
+        return _extract_all()
+    
     def extract_links(self, html: str, base_url: str) -> List[str]:
         """
         Extract links from HTML content.
@@ -46,30 +158,21 @@ class StaticCrawler(BaseCrawler):
         Returns:
             List[str]: List of extracted links
         """
-        @self.logger.log_operation("extract_links")
-        def _extract_links():
-            self.logger.debug(f"Extracting links from {base_url}")
-            links = []
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
-                # Skip empty links, anchors, and javascript links
-                if not href or href.startswith('#') or href.startswith('javascript:'):
-                    continue
-                
-                # Resolve relative URLs
-                absolute_url = urllib.parse.urljoin(base_url, href)
-                
-                # Filter out external links
-                if absolute_url.startswith(self.base_url):
-                    links.append(absolute_url)
-            
-            self.logger.debug(f"Found {len(links)} links")
-            return links
+        return self.extract_all(html, base_url)["links"]
+    
+    def extract_link_contexts(self, html: str, base_url: str) -> List[Dict[str, str]]:
+        """
+        Extract links from HTML content with the text they appear in.
         
-        return _extract_links()
+        Args:
+            html: HTML content
+            base_url: Base URL to resolve relative links
+            
+        Returns:
+            List[Dict[str, str]]: List of link data (URL, anchor text and the text of
+                the paragraph, list item or heading around the link)
+        """
+        return self.extract_all(html, base_url, link_contexts=True)["link_contexts"]
     
     def extract_images(self, html: str, base_url: str) -> List[Dict[str, str]]:
         """
@@ -82,28 +185,7 @@ class StaticCrawler(BaseCrawler):
         Returns:
             List[Dict[str, str]]: List of image data (URL and alt text)
         """
-        @self.logger.log_operation("extract_images")
-        def _extract_images():
-            self.logger.debug(f"Extracting images from {base_url}")
-            images = []
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            for img in soup.find_all('img', src=True):
-                src = img['src']
-                alt = img.get('alt', '')
-                
-                # Resolve relative URLs
-                absolute_url = urllib.parse.urljoin(base_url, src)
-                
-                images.append({
-                    "url": absolute_url,
-                    "alt_text": alt
-                })
-            
-            self.logger.debug(f"Found {len(images)} images")
-            return images
-        
-        return _extract_images()
+        return self.extract_all(html, base_url)["images"]
     
     def extract_text(self, html: str) -> str:
         """
@@ -115,31 +197,7 @@ class StaticCrawler(BaseCrawler):
         Returns:
             str: Cleaned text content
         """
-        @self.logger.log_operation("extract_text")
-        def _extract_text():
-            self.logger.debug("Extracting text from HTML")
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.extract()
-            
-            # Get text
-            text = soup.get_text()
-            
-            # Break into lines and remove leading and trailing space on each
-            lines = (line.strip() for line in text.splitlines())
-            
-            # Break multi-headlines into a line each
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            
-            # Remove blank lines
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            self.logger.debug(f"Extracted {len(text)} characters of text")
-            return text
-        
-        return _extract_text()
+        return self.extract_all(html, self.base_url)["text"]
     
     def extract_metadata(self, html: str) -> Dict[str, str]:
         """
@@ -151,39 +209,16 @@ class StaticCrawler(BaseCrawler):
         Returns:
             Dict[str, str]: Dictionary of metadata
         """
-        @self.logger.log_operation("extract_metadata")
-        def _extract_metadata():
-            self.logger.debug("Extracting metadata from HTML")
-            soup = BeautifulSoup(html, 'html.parser')
-            metadata = {}
-            
-            # Extract title
-            title_tag = soup.find('title')
-            if title_tag:
-                metadata['title'] = title_tag.string
-            
-            # Extract meta tags
-            for meta in soup.find_all('meta'):
-                name = meta.get('name')
-                property_name = meta.get('property')
-                content = meta.get('content')
-                
-                if name and content:
-                    metadata[name] = content
-                elif property_name and content:
-                    metadata[property_name] = content
-            
-            self.logger.debug(f"Extracted {len(metadata)} metadata items")
-            return metadata
-        
-        return _extract_metadata()
+        return self.extract_all(html, self.base_url)["metadata"]
     
-    def parse(self, html: str) -> Dict[str, Any]:
+    def parse(self, html: str, extracted: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Parse HTML content and extract data.
         
         Args:
             html: HTML content
+            extracted: Data already extracted from the page with extract_all (default:
+                extract it here, resolving links against the website URL)
             
         Returns:
             Dict[str, Any]: Parsed data
@@ -192,12 +227,22 @@ class StaticCrawler(BaseCrawler):
         def _parse():
             self.logger.debug("Parsing HTML content")
             # Extract basic data
-            text = self.extract_text(html)
-            images = self.extract_images(html, self.base_url)
-            metadata = self.extract_metadata(html)
+            page = extracted if extracted is not None else self.extract_all(html, self.base_url)
+            text = page["text"]
+            images = page["images"]
+            metadata = page["metadata"]
+            
+            # NLP and deduplication only see the main content, unless too little
+            # of the page looks like main content (listings, home pages)
+            nlp_text = text
+            if page["main_text"] is not None:
+                nlp_text = page["main_text"]
+                self._record_metric("main_content_pages")
+            self._record_metric("text_chars", len(text))
+            self._record_metric("nlp_chars", len(nlp_text))
             
             # Process text with NER, keywords, and deduplication
-            processed_text = self.text_processor.process_text(text)
+            processed_text = self.text_processor.process_text(nlp_text)
             
             # If text is a duplicate, return None
             if processed_text is None:
@@ -217,6 +262,646 @@ class StaticCrawler(BaseCrawler):
         
         return _parse()
     
+    async def _crawl_pages_async(self, frontier: Frontier, checkpoint: Optional[Callable[[], None]] = None
+                                 ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Fetch pages from the crawl frontier concurrently and yield them as they complete.
+        
+        Up to the fetch engine's concurrency cap of requests are kept in flight.
+        Every URL taken from the frontier stays pending until _release_url is
+        called for it, possibly from another thread after pushing the page's
+        links to the frontier, and the crawl ends once no URL is pending.
+        
+        Args:
+            frontier: Frontier of URLs to crawl
+            checkpoint: Function saving a checkpoint, called every checkpoint_interval URLs
+                once every pending URL has been released (optional)
+            
+        Yields:
+            Tuple[str, Optional[Dict[str, Any]]]: URL and its fetch result (None if the fetch failed)
+        """
+        in_flight: Dict[asyncio.Future, str] = {}
+        # A focused crawl only takes a URL from the frontier once the pages
+        # before it have added their links, so it always fetches the best ones
+        max_pending = self.fetch_engine.max_concurrency if self.focused else None
+        wakeup = asyncio.Event()
+        self._fetch_wakeup = (asyncio.get_running_loop(), wakeup)
+        waiter: Optional[asyncio.Future] = None
+        since_checkpoint = 0
+        
+        try:
+            while not self._fetch_stopped:
+                wakeup.clear()
+                checkpoint_due = checkpoint is not None and since_checkpoint >= self.checkpoint_interval
+                with self._state_lock:
+                    # New URLs wait until the pages already taken are handled, so
+                    # the state saved is consistent
+                    if checkpoint_due and not self._pending_urls:
+                        checkpoint()
+                        since_checkpoint = 0
+                        checkpoint_due = False
+                    
+                    # Top up the in-flight window without overshooting the page limit
+                    while (not checkpoint_due and frontier and len(in_flight) < self.fetch_engine.max_concurrency
+                           and (max_pending is None or len(self._pending_urls) < max_pending)
+                           and len(self.visited_urls) + len(self._pending_urls) < self.page_limit):
+                        url = frontier.pop()
+                        
+                        # Already crawled under a page's declared canonical URL
+                        if url in self.visited_urls:
+                            self.metrics["duplicates_prevented"] += 1
+                            continue
+                        
+                        # Its URL space may have turned out to be a trap since it was queued
+                        reason = self.trap_detector.check_queued(url)
+                        if reason:
+                            self._prune_url(url, reason)
+                            continue
+                        
+                        self._pending_urls.add(url)
+                        since_checkpoint += 1
+                        self.logger.info(f"Crawling {url}")
+                        in_flight[asyncio.ensure_future(self.fetch_page_async(url, conditional=True))] = url
+                    
+                    # Pages still in later stages may add links to the frontier
+                    if not in_flight and not self._pending_urls:
+                        break
+                
+                if waiter is None or waiter.done():
+                    waiter = asyncio.ensure_future(wakeup.wait())
+                done, _ = await asyncio.wait([*in_flight, waiter], return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is not waiter:
+                        yield in_flight.pop(task), task.result()
+        finally:
+            self._fetch_wakeup = None
+            tasks = [*in_flight, waiter] if waiter is not None else list(in_flight)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self.fetch_engine.close()
+    
+    def _release_url(self, url: str) -> None:
+        """
+        Mark a URL taken from the frontier as fully handled; safe to call from any thread.
+        
+        Args:
+            url: URL yielded by _crawl_pages_async
+        """
+        with self._state_lock:
+            self._pending_urls.discard(url)
+        self._wake_fetch_loop()
+    
+    def _stop_fetching(self) -> None:
+        """Make the fetch loop finish without taking more URLs; safe to call from any thread."""
+        self._fetch_stopped = True
+        self._wake_fetch_loop()
+    
+    def _wake_fetch_loop(self) -> None:
+        """Let the fetch loop take new URLs from the frontier or finish."""
+        wakeup = self._fetch_wakeup
+        if wakeup is not None:
+            loop, event = wakeup
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The fetch loop has already finished
+                pass
+    
+    def extract_canonical_url(self, html: str, url: str) -> str:
+        """
+        Get the canonical URL a page declares with <link rel="canonical">.
+        
+        Args:
+            html: HTML content
+            url: URL the page was fetched from
+            
+        Returns:
+            str: Declared canonical URL, or the page URL if there is none, it points
+                off-site or rel=canonical is not honored
+        """
+        if not self.canonicalizer.rules["honor_rel_canonical"]:
+            return url
+        return self._resolve_canonical_url(self.extract_all(html, url)["canonical_url"], url)
+    
+    def _resolve_canonical_url(self, canonical_url: Optional[str], url: str) -> str:
+        """
+        Get the URL a page is recorded under from the canonical URL it declares.
+        
+        Args:
+            canonical_url: Absolute canonical URL declared by the page, or None
+            url: URL the page was fetched from
+            
+        Returns:
+            str: Declared canonical URL, or the page URL if there is none, it points
+                off-site or rel=canonical is not honored
+        """
+        if canonical_url is None or not self.canonicalizer.rules["honor_rel_canonical"]:
+            return url
+        canonical_url = self.canonicalizer.canonicalize(canonical_url)
+        return canonical_url if canonical_url.startswith(self.base_url) else url
+    
+    def _canonicalize_link(self, link: str, frontier: Frontier) -> str:
+        """
+        Get the canonical form of a discovered link and count the fetches it saves.
+        
+        Every distinct raw link beyond the first for a canonical URL would have
+        been fetched again without canonicalization.
+        
+        Args:
+            link: Absolute link as found in a page
+            frontier: Frontier of URLs to crawl
+            
+        Returns:
+            str: Canonical link
+        """
+        canonical = self.canonicalizer.canonicalize(link)
+        if canonical != link:
+            if link in self._rewritten_urls:
+                return canonical
+            self._rewritten_urls.add(link)
+            if canonical in frontier or canonical in self.visited_urls or canonical in self.skipped_urls:
+                self.metrics["duplicates_prevented"] += 1
+            else:
+                self._canonical_via_rewrite.add(canonical)
+        elif canonical in self._canonical_via_rewrite:
+            # The canonical URL itself shows up after one of its variants
+            self._canonical_via_rewrite.discard(canonical)
+            self.metrics["duplicates_prevented"] += 1
+        return canonical
+    
+    def _get_allowed_links(self, links: List[str]) -> Set[str]:
+        """
+        Get the canonical links that may be followed according to robots.txt.
+        
+        Safe to call from any thread without the state lock; a host seen for
+        the first time has its robots.txt downloaded here.
+        
+        Args:
+            links: Absolute links as found in a page
+            
+        Returns:
+            Set[str]: Canonical links that are allowed (in replay mode, also recorded)
+        """
+        checked = set()
+        allowed = set()
+        for link in links:
+            link = self.canonicalizer.canonicalize(link)
+            if link in checked or not self.is_fetchable_url(link):
+                continue
+            checked.add(link)
+            # A replay only follows links that were recorded, so it visits the
+            # same pages as the recorded crawl
+            if self.fetch_mode == "replay" and link not in self._get_warc_archive():
+                continue
+            if self._respect_robots_txt(link):
+                allowed.add(link)
+        return allowed
+    
+    def _enqueue_links(self, links: List[str], frontier: Frontier,
+                       priorities: Optional[Dict[str, float]] = None) -> None:
+        """
+        Add newly discovered links to the crawl frontier in canonical form.
+        
+        robots.txt is checked before the state lock is taken, so callers must
+        not hold _state_lock: a robots.txt download would stall every worker.
+        
+        Args:
+            links: Links to add
+            frontier: Frontier of URLs to crawl
+            priorities: Frontier priority of each link (default: 0)
+        """
+        allowed = self._get_allowed_links(links)
+        with self._state_lock:
+            for link in links:
+                priority = priorities.get(link, 0.0) if priorities else 0.0
+                link = self._canonicalize_link(link, frontier)
+                if link in frontier or link in self.visited_urls or link in self.skipped_urls:
+                    continue
+                
+                # Obvious non-HTML resources are skipped before any request
+                if not self.is_fetchable_url(link):
+                    self._skip_url(link, "non-HTML extension")
+                    continue
+                
+                # URLs disallowed by robots.txt (or never recorded, in a replay)
+                # never enter the frontier
+                if link not in allowed:
+                    continue
+                
+                # Neither do URLs that lead into crawler traps
+                reason = self.trap_detector.check(link)
+                if reason:
+                    self._prune_url(link, reason)
+                    continue
+                
+                # Each URL template only gets its budget of the crawl
+                reason = self.url_templates.admit(link)
+                if reason:
+                    self._skip_url(link, reason)
+                    continue
+                
+                frontier.push(link, priority)
+    
+    def _score_links(self, link_contexts: List[Dict[str, str]], keywords: List[str]) -> Dict[str, float]:
+        """
+        Score the links of a page for a focused crawl.
+        
+        Args:
+            link_contexts: Links with their anchor text and context (see extract_link_contexts)
+            keywords: Keywords of the page
+            
+        Returns:
+            Dict[str, float]: Best score of each link
+        """
+        parent = self.relevance_scorer.score_keywords(keywords)
+        scores = {}
+        for link in link_contexts:
+            score = self.relevance_scorer.score_link(link["url"], link["anchor"], link["context"], parent)
+            scores[link["url"]] = max(score, scores.get(link["url"], 0.0))
+        return scores
+    
+    def _prune_url(self, url: str, reason: str) -> None:
+        """
+        Record a URL pruned as part of a crawler trap.
+        
+        Args:
+            url: Pruned URL
+            reason: Trap signal that pruned it
+        """
+        self.metrics["trap_pruned_urls"] += 1
+        self.logger.info(f"Pruned {url}: {reason}")
+        self._skip_url(url, reason)
+    
+    def _record_trap_page(self, url: str, text: Optional[str]) -> None:
+        """
+        Compare a fetched page with its sibling URLs for the trap detector.
+        
+        Args:
+            url: Fetched URL
+            text: Page text (None if the page repeated earlier content exactly)
+        """
+        space = self.trap_detector.record_page(url, text)
+        if space:
+            self.logger.warning(f"Pruning URL space {space}: its pages are near-identical")
+    
+    def _push_seeds(self, urls: List[str], frontier: Frontier) -> int:
+        """
+        Queue seed URLs ahead of discovered links, first URL first.
+        
+        Args:
+            urls: URLs to crawl
+            frontier: Frontier of URLs to crawl
+            
+        Returns:
+            int: Number of URLs added
+        """
+        # A depth-first frontier pops the last URL pushed first
+        if self.frontier_strategy == "dfs":
+            urls = urls[::-1]
+        return sum(1 for url in urls if url not in self.visited_urls and frontier.push(url, priority=1.0))
+    
+    def _fetch_sitemap(self, sitemap_url: str) -> Optional[Iterator[bytes]]:
+        """
+        Download a sitemap as a stream of body chunks.
+        
+        Args:
+            sitemap_url: URL of the sitemap
+            
+        Returns:
+            Optional[Iterator[bytes]]: Body chunks, or None if the sitemap could not be fetched
+        """
+        try:
+            if self.fetch_mode != "replay":
+                self.scheduler.wait(sitemap_url)
+            response = self._send_request(sitemap_url, page=False)
+        except requests.RequestException as e:
+            self.logger.warning(f"Failed to fetch sitemap {sitemap_url}: {str(e)}")
+            return None
+        if response.status_code >= 400:
+            response.close()
+            return None
+        
+        def _iter_body():
+            decoded_bytes = 0
+            try:
+                for chunk in response.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE):
+                    decoded_bytes += len(chunk)
+                    yield chunk
+            except requests.RequestException as e:
+                # The parser sees a truncated document and keeps the entries read so far
+                self.logger.warning(f"Failed to read sitemap {sitemap_url}: {str(e)}")
+            finally:
+                self._account_transfer(sitemap_url, response, decoded_bytes)
+                response.close()
+        
+        return _iter_body()
+    
+    def _iter_sitemap_seeds(self, reader: SitemapReader, sitemap_urls: List[str]) -> Iterator[Tuple[str, Optional[float]]]:
+        """
+        Read the sitemap entries that may be crawled, in canonical form.
+        
+        Args:
+            reader: Sitemap reader
+            sitemap_urls: Sitemaps to start from
+            
+        Yields:
+            Tuple[str, Optional[float]]: Page URL and its lastmod timestamp
+        """
+        for url, lastmod in reader.read(sitemap_urls):
+            url = self.canonicalizer.canonicalize(url)
+            if not url.startswith(self.base_url) or not self.is_fetchable_url(url):
+                continue
+            if self.fetch_mode == "replay" and url not in self._get_warc_archive():
+                continue
+            if self._respect_robots_txt(url):
+                yield url, lastmod
+    
+    def _seed_from_sitemaps(self, frontier: Frontier) -> None:
+        """
+        Add the pages listed in the site's sitemaps to the frontier.
+        
+        Sitemaps come from robots.txt, or from the usual paths if it lists
+        none. The most recently modified new pages (enough to fill the page
+        limit) are kept in a bounded heap over every entry scanned, and they
+        are queued newest first, ahead of discovered links. Reading stops at
+        the scan budget (config.SITEMAP_MAX_ENTRIES), so a small crawl does
+        not wait for huge sitemaps.
+        
+        Args:
+            frontier: Frontier of URLs to crawl
+        """
+        limit = min(config.SITEMAP_MAX_URLS, self.page_limit) - len(frontier)
+        if limit <= 0:
+            return
+        sitemap_urls = self._get_robots_rules(self.base_url).sitemaps or [
+            urllib.parse.urljoin(self.base_url, path) for path in SITEMAP_PATHS
+        ]
+        reader = SitemapReader(self._fetch_sitemap)
+        seen = set()
+        
+        def _new_seeds():
+            for url, lastmod in self._iter_sitemap_seeds(reader, sitemap_urls):
+                if url not in seen and url not in frontier and url not in self.visited_urls:
+                    seen.add(url)
+                    yield url, lastmod
+        
+        urls = []
+        for url, _ in select_recent(_new_seeds(), limit):
+            reason = self.url_templates.admit(url)
+            if reason:
+                self._skip_url(url, reason)
+            else:
+                urls.append(url)
+        seeded = self._push_seeds(urls, frontier)
+        self.metrics["sitemap_seeds"] += seeded
+        self.sitemap_stats = reader.get_stats()
+        self.logger.info(f"Seeded {seeded} URLs from {self.sitemap_stats['sitemaps']} sitemaps")
+    
+    def _create_bloom_set(self) -> BloomURLSet:
+        """
+        Create a compact URL set with the configured false positive rate.
+        
+        Returns:
+            BloomURLSet: Empty Bloom filter set
+        """
+        return BloomURLSet(config.VISITED_SET_CAPACITY, self.visited_false_positive_rate)
+    
+    def _create_visited_set(self, reset: bool = True) -> Any:
+        """
+        Create the set of visited URLs for the configured mode and backend.
+        
+        Args:
+            reset: Whether a disk-backed set starts empty
+            
+        Returns:
+            Any: Python set, BloomURLSet or DiskURLSet
+        """
+        if self.visited_set == "bloom":
+            return self._create_bloom_set()
+        if self.frontier_backend == "disk":
+            return DiskURLSet(os.path.join(config.FRONTIER_DIR, f"{self.name}.visited.db"), reset=reset)
+        return set()
+    
+    def _replace_visited_set(self, visited_urls: Any) -> None:
+        """
+        Replace the set of visited URLs, closing a disk-backed one.
+        
+        Args:
+            visited_urls: New set of visited URLs
+        """
+        if isinstance(self.visited_urls, DiskURLSet):
+            self.visited_urls.close(flush=False)
+        self.visited_urls = visited_urls
+    
+    def _create_frontier(self) -> Frontier:
+        """
+        Create the crawl frontier for the configured strategy and backend.
+        
+        Returns:
+            Frontier: In-memory frontier, or a DiskFrontier with the same interface
+        """
+        if self.frontier_backend == "disk":
+            return DiskFrontier(
+                os.path.join(config.FRONTIER_DIR, f"{self.name}.frontier.db"), self.frontier_strategy
+            )
+        if self.visited_set == "bloom":
+            return Frontier(self.frontier_strategy, seen=self._create_bloom_set())
+        return Frontier(self.frontier_strategy)
+    
+    def _get_checkpoint_state(self, frontier: Frontier, pages_processed: int, spool: PageSpool,
+                              upload_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Collect the crawl state between two pages.
+        
+        Args:
+            frontier: Frontier of URLs to crawl
+            pages_processed: Pages processed and uploaded so far
+            spool: Spool of crawled pages
+            upload_state: State of the text data upload
+            
+        Returns:
+            Dict[str, Any]: JSON-serializable crawl state
+        """
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "saved_at": datetime.now().isoformat(),
+            "frontier": frontier.get_state(),
+            "pending_urls": list(self._pending_urls),
+            "visited": dump_url_set(self.visited_urls),
+            "skipped_urls": list(self.skipped_urls),
+            "rewritten_urls": list(self._rewritten_urls),
+            "canonical_via_rewrite": list(self._canonical_via_rewrite),
+            "content_hashes": list(self.text_processor.content_hashes),
+            "url_templates": self.url_templates.get_state(),
+            "metrics": dict(self.metrics),
+            "pages_processed": pages_processed,
+            "spool_offset": spool.offset(),
+            "upload": {
+                **upload_state,
+                "buffer": [chunk.decode('utf-8') for chunk in upload_state.get("buffer", [])]
+            }
+        }
+    
+    def _restore_checkpoint(self, checkpoint: Dict[str, Any]) -> Frontier:
+        """
+        Restore the crawl state saved in a checkpoint.
+        
+        Args:
+            checkpoint: Saved crawl state
+            
+        Returns:
+            Frontier: Restored frontier, with the URLs that were in flight queued again
+        """
+        self._replace_visited_set(load_url_set(checkpoint["visited"]))
+        self.skipped_urls = set(checkpoint["skipped_urls"])
+        self._rewritten_urls = set(checkpoint["rewritten_urls"])
+        self._canonical_via_rewrite = set(checkpoint["canonical_via_rewrite"])
+        self.text_processor.content_hashes = set(checkpoint["content_hashes"])
+        self.url_templates.load_state(checkpoint["url_templates"])
+        self.metrics.update(checkpoint["metrics"])
+        
+        state = checkpoint["frontier"]
+        if state["backend"] == "disk":
+            frontier = DiskFrontier(state["path"], state["strategy"], reset=False)
+        else:
+            frontier = Frontier.from_state(state, seen=load_url_set(state["seen"]))
+        for url in checkpoint["pending_urls"]:
+            frontier.requeue(url)
+        return frontier
+    
+    def _skip_url(self, url: str, reason: str) -> None:
+        """
+        Record a URL that will not be downloaded.
+        
+        Args:
+            url: Skipped URL
+            reason: Why it was skipped
+        """
+        if url not in self.skipped_urls:
+            self.skipped_urls.add(url)
+            self.metrics["skipped_urls"] += 1
+            self.logger.debug(f"Skipping {url}: {reason}")
+    
+    def _parse_stage(self, fetched: Tuple[str, Optional[Dict[str, Any]]]
+                     ) -> Optional[Tuple[str, Dict[str, Any], Dict[str, Any], str]]:
+        """
+        Extract a fetched page and record it as visited (the crawl pipeline's parse stage).
+        
+        Args:
+            fetched: URL and its fetch result, as yielded by _crawl_pages_async
+            
+        Returns:
+            Optional[Tuple[str, Dict[str, Any], Dict[str, Any], str]]: URL, fetch result,
+                extracted data and canonical URL of a page for NLP, or None if the page
+                needs nothing more
+        """
+        url, result = fetched
+        if not result:
+            self.logger.warning(f"Failed to fetch {url}")
+            self._release_url(url)
+            return None
+        
+        if result["skipped"]:
+            with self._state_lock:
+                self._skip_url(url, result["skipped"])
+            self._release_url(url)
+            return None
+        
+        if result["truncated"]:
+            self._record_metric("truncated_pages")
+            self.logger.warning(f"Truncated {url} at {self._get_page_byte_limit()} bytes")
+        
+        # Everything the crawl needs from a page is extracted in one pass, while
+        # it downloads for oversized pages
+        extracted = result["extracted"]
+        if extracted is not None:
+            self.logger.info(f"Streamed {url}")
+            if extracted["text_truncated"]:
+                self.logger.warning(f"Kept the first {config.STREAM_MAX_TEXT_CHARS} characters of text from {url}")
+        elif not result["not_modified"]:
+            extracted = self.extract_all(result["html"], url, link_contexts=self.focused)
+        
+        with self._state_lock:
+            # Pages are recorded under the canonical URL they declare, so the
+            # canonical URL itself is not fetched again later
+            page_url = url if extracted is None else self._resolve_canonical_url(extracted["canonical_url"], url)
+            if page_url in self.visited_urls:
+                self.logger.info(f"Already crawled as {page_url}: {url}")
+                self._release_url(url)
+                return None
+            
+            # Mark URL as visited
+            self.visited_urls.add(page_url)
+            
+            # Unchanged since the last crawl: skip parsing and NLP but keep
+            # following the links recorded last time
+            if result["not_modified"]:
+                self.metrics["unchanged_pages"] += 1
+                self.logger.info(f"Unchanged since last crawl: {url}")
+                self.record_revisit(result, None)
+                # Only the URLs of the stored links are left to score
+                priorities = None
+                if self.focused:
+                    priorities = {link: self.relevance_scorer.score_link(link) for link in result["links"]}
+        
+        if result["not_modified"]:
+            self._enqueue_links(result["links"], self.frontier, priorities)
+            self._release_url(url)
+            return None
+        
+        return url, result, extracted, page_url
+    
+    def _nlp_stage(self, page: Tuple[str, Dict[str, Any], Dict[str, Any], str]
+                   ) -> Optional[Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+        """
+        Run NLP and deduplication on an extracted page (the crawl pipeline's NLP stage).
+        
+        Args:
+            page: URL, fetch result, extracted data and canonical URL from _parse_stage
+            
+        Returns:
+            Optional[Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+                URL, fetch result, extracted data, page data and the text data to upload,
+                or None if the page is a duplicate
+        """
+        url, result, extracted, page_url = page
+        
+        # Parse HTML
+        page_data = self.parse(result["html"], extracted)
+        
+        # Skip if page is a duplicate, but keep its links with its validators so a
+        # later 304 or deferred revisit still follows them
+        if page_data is None:
+            with self._state_lock:
+                self.store_validators(result, None, extracted["links"])
+                self._record_trap_page(url, None)
+            self._release_url(url)
+            return None
+        
+        # Near-identical sibling pages reveal crawler traps
+        with self._state_lock:
+            self._record_trap_page(url, page_data["text"])
+        
+        # Add URL and hash
+        page_data["url"] = page_url
+        page_data["hash"] = self._get_url_hash(page_url)
+        
+        # Add metadata
+        page_data = self.get_metadata(page_data)
+        
+        # Extract text processing data
+        text_data = {
+            "url": page_url,
+            "entities": page_data["entities"],
+            "keywords": page_data["keywords"],
+            "content_hash": page_data["content_hash"],
+            "timestamp": page_data["timestamp"]
+        }
+        return url, result, extracted, page_data, text_data
+    
     def crawl(self) -> Dict[str, Any]:
         """
         Crawl the website and yield pages as they are crawled.
@@ -227,103 +912,148 @@ class StaticCrawler(BaseCrawler):
         @self.logger.log_operation("crawl")
         def _crawl():
             self.logger.info(f"Starting crawl of {self.base_url}")
-            to_visit = [self.base_url]
-            s3_storage = S3Storage()
-            pages_processed = 0
+            storage = self.storage or self._create_storage()
+            checkpoint_store = CheckpointStore(os.path.join(config.CHECKPOINT_DIR, self.name))
+            checkpoint = checkpoint_store.load() if self.resume else None
+            
+            # The uploaded text data must match the restored state, so a crawl
+            # whose upload cannot be continued starts over
+            upload = checkpoint["upload"] if checkpoint else {}
+            if upload.get("key") and not storage.check_multipart_upload(upload):
+                self.logger.warning(f"Cannot continue the upload of the last checkpoint; restarting {self.name}")
+                storage.abort_multipart_upload(upload)
+                checkpoint = None
+            
+            # Known pages are only re-fetched when they are likely to have changed
+            revisits = self.select_revisits(self.revisit_budget)
+            
+            if checkpoint:
+                self.logger.info(f"Resuming from checkpoint of {checkpoint['saved_at']}")
+                frontier = self.frontier = self._restore_checkpoint(checkpoint)
+                pages_processed = checkpoint["pages_processed"]
+                upload_state = checkpoint["upload"]
+            else:
+                # A stale checkpoint must not outlive the crawl that replaces it
+                checkpoint_store.clear()
+                if self.resume:
+                    self._replace_visited_set(self._create_visited_set())
+                frontier = self.frontier = self._create_frontier()
+                seed_url = self.canonicalizer.canonicalize(self.base_url)
+                # URLs disallowed by robots.txt never enter the frontier
+                if self._respect_robots_txt(seed_url):
+                    frontier.push(seed_url)
+                self._push_seeds([url for url in revisits if self._respect_robots_txt(url)], frontier)
+                if self.use_sitemaps:
+                    self._seed_from_sitemaps(frontier)
+                pages_processed = 0
+                upload_state = {}
+            
+            # Crawled pages are spooled to disk so a resumed crawl returns them all
+            spool = None
             crawled_data = []
+            if self.checkpoint_interval:
+                spool = PageSpool(checkpoint_store.spool_path, checkpoint["spool_offset"] if checkpoint else None)
+                crawled_data = spool.load()
+            succeeded = False
+            
+            # Checkpoints are saved by the fetch loop once the pages taken
+            # from the frontier have all been uploaded
+            def save_checkpoint():
+                checkpoint_store.save(self._get_checkpoint_state(frontier, pages_processed, spool, upload_state))
+            
+            # Fetched pages flow through the parse and NLP stages to the upload
+            # below, each stage blocking the one before it while it falls behind
+            self._fetch_stopped = False
+            self.pipeline = Pipeline(self.pipeline_queue_size)
+            self.pipeline.add_stage("parse", self._parse_stage, self.parse_workers)
+            self.pipeline.add_stage("nlp", self._nlp_stage, self.nlp_workers)
             
             # Create a generator for text processing data
             def text_data_generator():
                 nonlocal pages_processed
-                while to_visit and len(self.visited_urls) < self.page_limit:
-                    url = to_visit.pop(0)
-                    
-                    if url in self.visited_urls:
-                        continue
-                    
-                    self.logger.info(f"Crawling {url}")
-                    
-                    html = self.get_page(url)
-                    if not html:
-                        self.logger.warning(f"Failed to fetch {url}")
-                        continue
-                    
-                    # Mark URL as visited
-                    self.visited_urls.add(url)
-                    
-                    # Parse HTML
-                    page_data = self.parse(html)
-                    
-                    # Skip if page is a duplicate
-                    if page_data is None:
-                        continue
-                    
-                    # Add URL and hash
-                    page_data["url"] = url
-                    page_data["hash"] = self._get_url_hash(url)
-                    
-                    # Add metadata
-                    page_data = self.get_metadata(page_data)
-                    
-                    # Extract text processing data
-                    text_data = {
-                        "url": url,
-                        "entities": page_data["entities"],
-                        "keywords": page_data["keywords"],
-                        "content_hash": page_data["content_hash"],
-                        "timestamp": page_data["timestamp"]
-                    }
-                    
-                    # Log upload start
-                    self.logger.info(f"Starting upload for {url}")
-                    
-                    # Yield text data for streaming
-                    yield text_data
-                    
-                    # Log upload completion
-                    self.logger.info(f"Completed upload for {url}")
-                    
-                    # Remove text processing data from main page data
-                    del page_data["entities"]
-                    del page_data["keywords"]
-                    del page_data["content_hash"]
-                    
-                    # Add to crawled data
-                    crawled_data.append(page_data)
-                    
-                    # Update progress
-                    pages_processed += 1
-                    self.logger.info(f"Progress: {pages_processed} pages processed and uploaded")
-                    
-                    # Extract links for further crawling
-                    links = self.extract_links(html, url)
-                    for link in links:
-                        if link not in self.visited_urls and link not in to_visit:
-                            to_visit.append(link)
-                    
-                    # Force garbage collection
-                    gc.collect()
+                pages = self.pipeline.run(
+                    iterate_async(self._crawl_pages_async(frontier, save_checkpoint if spool else None)),
+                    source_name="fetch", sink_name="upload", stop_source=self._stop_fetching
+                )
+                try:
+                    for url, result, extracted, page_data, text_data in pages:
+                        # Log upload start
+                        self.logger.info(f"Starting upload for {url}")
+                        
+                        # Yield text data for streaming
+                        yield text_data
+                        
+                        # Log upload completion
+                        self.logger.info(f"Completed upload for {url}")
+                        
+                        # Remove text processing data from main page data
+                        del page_data["entities"]
+                        del page_data["keywords"]
+                        del page_data["content_hash"]
+                        
+                        with self._state_lock:
+                            # Add to crawled data
+                            crawled_data.append(page_data)
+                            if spool:
+                                spool.append(page_data)
+                            
+                            # Update progress
+                            pages_processed += 1
+                            
+                            # A focused crawl scores the page's links by their relevance
+                            # to the topic
+                            links = extracted["links"]
+                            priorities = None
+                            if self.focused:
+                                self.relevance_scorer.record_page(page_data["text"])
+                                priorities = self._score_links(extracted["link_contexts"], text_data["keywords"])
+                            
+                            # Remember validators for the next conditional crawl
+                            self.store_validators(result, text_data["content_hash"], links)
+                            self.record_revisit(result, text_data["content_hash"])
+                        
+                        # Follow the page's links
+                        self._enqueue_links(links, frontier, priorities)
+                        
+                        self.logger.info(f"Progress: {pages_processed} pages processed and uploaded "
+                                         f"(queued: {self.pipeline.get_queue_depths()})")
+                        self._release_url(url)
+                finally:
+                    pages.close()
             
+            text_data = text_data_generator()
             try:
                 # Log upload start
-                self.logger.info("Starting S3 upload process")
+                self.logger.info("Starting upload process")
                 
-                # Stream text processing data to S3
-                s3_storage.stream_processed_text_data(self.name, text_data_generator())
+                # Stream text processing data to the storage
+                storage.stream_processed_text_data(self.name, text_data, upload_state=upload_state)
                 
                 # Log upload completion
-                self.logger.info("Completed S3 upload process")
+                self.logger.info("Completed upload process")
                 self.logger.info(f"Crawl completed successfully. Total pages processed: {pages_processed}")
                 
                 # Post-crawling processing
-                self._post_crawl_processing(s3_storage)
+                self._post_crawl_processing(storage)
                 
+                succeeded = True
                 return crawled_data
                 
             except Exception as e:
                 self.logger.error("Crawl failed", e)
                 raise
             finally:
+                # The pipeline's threads must be stopped before the stores close
+                text_data.close()
+                # After a failure the disk-backed stores keep the state of the
+                # last checkpoint
+                frontier.close(flush=succeeded)
+                if succeeded and isinstance(self.visited_urls, DiskURLSet):
+                    self.visited_urls.flush()
+                if spool:
+                    spool.close()
+                if succeeded:
+                    checkpoint_store.clear()
                 # Save metrics
                 self.logger.save_metrics()
                 summary = self.logger.get_summary()
@@ -331,12 +1061,26 @@ class StaticCrawler(BaseCrawler):
         
         return _crawl()
     
-    def _post_crawl_processing(self, s3_storage: S3Storage):
+    def _create_storage(self) -> Any:
+        """
+        Create the sink of the crawl's results.
+        
+        A replay runs offline, so its results go to local files
+        (config.REPLAY_OUTPUT_DIR) instead of S3.
+        
+        Returns:
+            Any: LocalStorage in replay mode, otherwise S3Storage
+        """
+        if self.fetch_mode == "replay":
+            return LocalStorage()
+        return S3Storage()
+    
+    def _post_crawl_processing(self, s3_storage: Any):
         """
         Perform post-crawling processing.
         
         Args:
-            s3_storage: S3Storage instance
+            s3_storage: S3Storage or LocalStorage instance
         """
         self.logger.info("Starting post-crawl processing")
         
@@ -352,12 +1096,42 @@ class StaticCrawler(BaseCrawler):
                 "total_pages": self.metrics["total_pages"],
                 "successful_crawls": self.metrics["successful_crawls"],
                 "failed_crawls": self.metrics["failed_crawls"],
+                "failed_attempts": self.metrics["failed_attempts"],
+                "breaker_trips": self.metrics["breaker_trips"],
+                "unchanged_pages": self.metrics["unchanged_pages"],
+                "skipped_urls": self.metrics["skipped_urls"],
+                "truncated_pages": self.metrics["truncated_pages"],
+                "streamed_pages": self.metrics["streamed_pages"],
+                "main_content": {
+                    "pages": self.metrics["main_content_pages"],
+                    "text_chars": self.metrics["text_chars"],
+                    "nlp_chars": self.metrics["nlp_chars"]
+                } if self.main_content else None,
+                "duplicates_prevented": self.metrics["duplicates_prevented"],
+                "trap_pruned_urls": self.metrics["trap_pruned_urls"],
+                "wire_bytes": self.metrics["wire_bytes"],
+                "decoded_bytes": self.metrics["decoded_bytes"],
                 "start_time": self.metrics["start_time"],
-                "end_time": self.metrics["end_time"]
+                "end_time": self.metrics["end_time"],
+                "politeness": self.scheduler.get_stats([self.host]),
+                "circuit_breaker": self.circuit_breaker.get_stats([self.host]),
+                "frontier_strategy": self.frontier_strategy,
+                "frontier": self.frontier.get_stats() if self.frontier else None,
+                "visited_set": get_url_set_stats(self.visited_urls),
+                "traps": self.trap_detector.get_stats(),
+                "url_templates": self.url_templates.get_stats(),
+                "html_parser": self.html_extractor.get_stats(),
+                "focused": self.relevance_scorer.get_stats() if self.focused else None,
+                "sitemaps": self.sitemap_stats,
+                "revisits": self.get_revisit_stats(),
+                "connections": self.transport.get_stats([self.host]),
+                "accept_encoding": self.transport.accept_encoding,
+                "bandwidth": self.bandwidth.get_stats(),
+                "pipeline": self.pipeline.get_stats() if self.pipeline else None
             }
             
-            # 2. Store summary in S3
-            self.logger.info("Uploading summary to S3")
+            # 2. Store summary
+            self.logger.info("Uploading summary")
             s3_storage.store_processed_data(
                 self.name,
                 summary,
@@ -368,11 +1142,12 @@ class StaticCrawler(BaseCrawler):
             # 3. Generate and store sitemap
             self.logger.info("Generating sitemap")
             sitemap = {
-                "urls": list(self.visited_urls),
+                # A Bloom filter cannot list its URLs
+                "urls": [] if self.visited_set == "bloom" else list(self.visited_urls),
                 "last_updated": datetime.now().isoformat()
             }
             
-            self.logger.info("Uploading sitemap to S3")
+            self.logger.info("Uploading sitemap")
             s3_storage.store_processed_data(
                 self.name,
                 sitemap,
@@ -0,0 +1,426 @@
+"""
+HTTP transports shared by all crawlers in a process.
+
+A transport owns the keep-alive connection pools. Sharing one transport lets
+every crawler reuse warm connections instead of paying a TCP+TLS handshake
+per request. With httpx and h2 installed, HTTP/2 is negotiated where the
+server offers it, so concurrent requests to one host share one connection.
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import src.utils.config as config
+from src.utils.url_utils import get_host
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (needed by httpx for HTTP/2)
+    HTTP2_AVAILABLE = httpx is not None
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+TRANSPORTS = ("auto", "requests", "http2")
+
+
+def _connection_stats(requests_sent: int, new_connections: int, **fields: Any) -> Dict[str, Any]:
+    """
+    Build the connection statistics of one host.
+
+    Args:
+        requests_sent: Requests sent to the host
+        new_connections: Connections opened to the host
+        **fields: Extra fields to report
+
+    Returns:
+        Dict[str, Any]: Statistics including the share of requests on reused connections
+    """
+    reused = max(0, requests_sent - new_connections)
+    return {
+        "requests": requests_sent,
+        "new_connections": new_connections,
+        "reused_connections": reused,
+        "reuse_rate": reused / requests_sent if requests_sent else 0.0,
+        **fields
+    }
+
+
+def get_wire_bytes(response: requests.Response) -> Optional[int]:
+    """
+    Get how many body bytes of a response were received from the network so far.
+
+    This is the size before Content-Encoding is decoded.
+
+    Args:
+        response: Response returned by a transport
+
+    Returns:
+        Optional[int]: Bytes read from the connection, or None if the body did
+            not come from the network
+    """
+    tell = getattr(response.raw, "tell", None)
+    if tell is None:
+        return None
+    try:
+        return int(tell())
+    except (TypeError, ValueError, OSError):
+        return None
+
+
+class Transport(ABC):
+    """Sends GET requests over pooled connections and reports connection reuse."""
+
+    name = ""
+    # Content codings advertised in Accept-Encoding; br and zstd are included
+    # when their decoders are installed
+    accept_encoding = ""
+
+    @abstractmethod
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+            stream: bool = False) -> requests.Response:
+        """
+        Send a GET request.
+
+        Args:
+            url: URL to fetch
+            headers: Request headers (optional)
+            timeout: Timeout in seconds
+            stream: Whether to defer reading the body
+
+        Returns:
+            requests.Response: The response
+
+        Raises:
+            requests.RequestException: If the request failed
+        """
+        pass
+
+    @abstractmethod
+    def ensure_pool_size(self, pool_size: int) -> None:
+        """
+        Make sure at least pool_size connections per host can be kept alive.
+
+        Args:
+            pool_size: Required keep-alive connections per host
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self, hosts: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-host connection reuse statistics.
+
+        Args:
+            hosts: Hosts to report (default: all hosts seen)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Requests, new and reused connections per host
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Close all pooled connections."""
+        pass
+
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 transport on a requests session with per-host keep-alive pools."""
+
+    name = "requests"
+
+    def __init__(self, pool_size: int):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Keep-alive connections per host
+        """
+        self.pool_size = 0
+        self.session = requests.Session()
+        self.accept_encoding = self.session.headers.get("Accept-Encoding", "")
+        self._adapters = []
+        self._lock = threading.Lock()
+        self.ensure_pool_size(pool_size)
+
+    def ensure_pool_size(self, pool_size: int) -> None:
+        """Grow the per-host pools; existing pools keep serving in-flight requests."""
+        with self._lock:
+            if pool_size <= self.pool_size:
+                return
+            self.pool_size = pool_size
+            adapter = HTTPAdapter(
+                pool_connections=config.TRANSPORT_MAX_HOSTS,
+                pool_maxsize=pool_size
+            )
+            self._adapters.append(adapter)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+            stream: bool = False) -> requests.Response:
+        """Send a GET request through the shared session."""
+        return self.session.get(url, headers=headers, timeout=timeout, stream=stream)
+
+    def get_stats(self, hosts: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get connection reuse statistics from the urllib3 pool counters."""
+        totals: Dict[str, list] = {}
+        with self._lock:
+            adapters = list(self._adapters)
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+                counts = totals.setdefault(host.lower(), [0, 0])
+                counts[0] += pool.num_requests
+                counts[1] += pool.num_connections
+
+        selected = list(hosts) if hosts is not None else list(totals)
+        return {
+            host: _connection_stats(totals[host][0], totals[host][1], http_version="HTTP/1.1")
+            for host in selected if host in totals
+        }
+
+    def close(self) -> None:
+        """Close the session and its pools."""
+        self.session.close()
+        for adapter in self._adapters:
+            adapter.close()
+
+
+class _HttpxBody:
+    """File-like view of a streamed httpx response body, as expected in requests.Response.raw."""
+
+    def __init__(self, response: "httpx.Response"):
+        """
+        Initialize the body.
+
+        Args:
+            response: Streamed httpx response
+        """
+        self._response = response
+        self._chunks = None
+        self._buffer = bytearray()
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """
+        Read up to amt decoded bytes (all remaining bytes if amt is None).
+
+        Args:
+            amt: Maximum bytes to return
+
+        Returns:
+            bytes: Body bytes (empty at the end of the body)
+        """
+        if self._chunks is None:
+            self._chunks = self._response.iter_bytes()
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if amt is None:
+            amt = len(self._buffer)
+        data = bytes(self._buffer[:amt])
+        del self._buffer[:amt]
+        return data
+
+    def tell(self) -> int:
+        """Get the body bytes received from the network, before content decoding."""
+        return self._response.num_bytes_downloaded
+
+    def close(self) -> None:
+        """Close the response, returning its connection to the pool."""
+        self._response.close()
+
+
+class HttpxTransport(Transport):
+    """httpx-based transport that negotiates HTTP/2 where the server offers it."""
+
+    name = "http2"
+
+    def __init__(self, pool_size: int, http2: bool = True):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Keep-alive connections per host
+            http2: Whether to offer HTTP/2 (requires the h2 package)
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for the HTTP/2 transport")
+        self.http2 = http2
+        self.pool_size = 0
+        self._client = None
+        self._clients = []
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.ensure_pool_size(pool_size)
+
+    def ensure_pool_size(self, pool_size: int) -> None:
+        """Replace the client with a larger one; the old client keeps serving in-flight requests."""
+        with self._lock:
+            if pool_size <= self.pool_size:
+                return
+            self.pool_size = pool_size
+            max_connections = max(pool_size, config.MAX_CONCURRENT_REQUESTS)
+            self._client = httpx.Client(
+                http2=self.http2,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                )
+            )
+            self._clients.append(self._client)
+            self.accept_encoding = self._client.headers.get("Accept-Encoding", "")
+
+    def _record(self, host: str, new_connection: bool, http_version: Optional[str] = None) -> None:
+        """Count a request to a host."""
+        with self._lock:
+            stats = self._stats.setdefault(host, {"requests": 0, "new_connections": 0, "http_versions": {}})
+            stats["requests"] += 1
+            stats["new_connections"] += int(new_connection)
+            if http_version:
+                stats["http_versions"][http_version] = stats["http_versions"].get(http_version, 0) + 1
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+            stream: bool = False) -> requests.Response:
+        """Send a GET request and adapt the httpx response to requests.Response."""
+        opened = []
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                opened.append(True)
+
+        request = self._client.build_request("GET", url, headers=headers, timeout=timeout,
+                                             extensions={"trace": trace})
+        try:
+            response = self._client.send(request, stream=True)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.TooManyRedirects as e:
+            raise requests.exceptions.TooManyRedirects(str(e))
+        except (httpx.InvalidURL, httpx.UnsupportedProtocol) as e:
+            raise requests.exceptions.InvalidURL(str(e))
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e))
+
+        self._record(get_host(url), bool(opened), response.http_version)
+        result = self._to_requests_response(response)
+        if not stream:
+            result.content  # Read the body now, as requests does
+        return result
+
+    def _to_requests_response(self, response: "httpx.Response") -> requests.Response:
+        """
+        Wrap a streamed httpx response in a requests.Response.
+
+        Args:
+            response: Streamed httpx response
+
+        Returns:
+            requests.Response: Response reading its body from the httpx stream
+        """
+        result = requests.Response()
+        result.url = str(response.url)
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict(response.headers.multi_items())
+        result.raw = _HttpxBody(response)
+        result.request = requests.Request("GET", str(response.request.url),
+                                          headers=dict(response.request.headers)).prepare()
+        return result
+
+    def get_stats(self, hosts: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get connection reuse statistics counted from httpx connection events."""
+        with self._lock:
+            selected = list(hosts) if hosts is not None else list(self._stats)
+            return {
+                host: _connection_stats(
+                    self._stats[host]["requests"],
+                    self._stats[host]["new_connections"],
+                    http_versions=dict(self._stats[host]["http_versions"])
+                )
+                for host in selected if host in self._stats
+            }
+
+    def close(self) -> None:
+        """Close every client created by the transport."""
+        for client in self._clients:
+            client.close()
+
+
+_shared_transport: Optional[Transport] = None
+_shared_lock = threading.Lock()
+
+
+def create_transport(kind: Optional[str] = None, pool_size: Optional[int] = None) -> Transport:
+    """
+    Create a transport.
+
+    Args:
+        kind: "requests", "http2" or "auto" (default: config.HTTP_TRANSPORT).
+            "auto" uses HTTP/2 when httpx and h2 are installed.
+        pool_size: Keep-alive connections per host (default: config.MAX_REQUESTS_PER_HOST)
+
+    Returns:
+        Transport: New transport
+
+    Raises:
+        ValueError: If the transport kind is unknown
+        ImportError: If "http2" is requested without httpx and h2 installed
+    """
+    kind = kind or config.HTTP_TRANSPORT
+    pool_size = pool_size or config.MAX_REQUESTS_PER_HOST
+    if kind not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {kind}")
+
+    if kind == "http2" and not HTTP2_AVAILABLE:
+        raise ImportError("The HTTP/2 transport requires httpx[http2] (pip install 'httpx[http2]')")
+    if kind == "http2" or (kind == "auto" and HTTP2_AVAILABLE):
+        return HttpxTransport(pool_size)
+    return RequestsTransport(pool_size)
+
+
+def get_transport(pool_size: Optional[int] = None) -> Transport:
+    """
+    Get the transport shared by all crawlers in the process, creating it on first use.
+
+    Args:
+        pool_size: Keep-alive connections per host the caller needs; the shared
+            pools grow to the largest size requested
+
+    Returns:
+        Transport: Shared transport
+    """
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = create_transport(pool_size=pool_size)
+        elif pool_size:
+            _shared_transport.ensure_pool_size(pool_size)
+        return _shared_transport
+
+
+def close_transport() -> None:
+    """Close the shared transport; the next get_transport call creates a new one."""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is not None:
+            _shared_transport.close()
+            _shared_transport = None
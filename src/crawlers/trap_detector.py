@@ -0,0 +1,210 @@
+"""
+Detection of crawler traps and infinite URL spaces.
+
+Calendars, faceted search and session-like query strings can produce an
+unbounded number of URLs that all lead to (nearly) the same content. The
+detector prunes such URLs using signals from the URL itself (path depth,
+repeated path segments, query variants of one path) and from fetched pages
+(near-identical content across sibling URLs).
+"""
+import hashlib
+import re
+import urllib.parse
+from collections import Counter, defaultdict, deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+import src.utils.config as config
+
+_WORD_RE = re.compile(r"\w+")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash of a text's words.
+
+    Texts that differ in a few words get fingerprints that differ in a few
+    bits. Numbers are generalized, so pages that differ only in dates or
+    page numbers get the same fingerprint.
+
+    Args:
+        text: Page text
+
+    Returns:
+        int: Fingerprint
+    """
+    words = set(_WORD_RE.findall(_DIGITS_RE.sub("0", text.lower())))
+    if not words:
+        return 0
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little") for word in words),
+        dtype=np.uint64, count=len(words)
+    )
+    bits = np.unpackbits(hashes.view(np.uint8), bitorder="little").reshape(-1, 64)
+    majority = bits.sum(axis=0) * 2 > len(words)
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+
+def get_url_space(url: str) -> str:
+    """
+    Get the URL space a URL belongs to, shared by its sibling URLs.
+
+    Siblings have the same parent path once numbers are generalized (so
+    /calendar/2024/05 and /calendar/2025/01 are siblings) and, for URLs with
+    a query, the same path and query parameter names.
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        str: URL space key
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = _DIGITS_RE.sub("0", parts.path or "/")
+    if parts.query:
+        names = sorted({name for name, _ in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)})
+        return f"{parts.netloc}{path}?{'&'.join(names)}"
+    return f"{parts.netloc}{path.rsplit('/', 1)[0]}/"
+
+
+class TrapDetector:
+    """Flags URLs that lead into crawler traps so they can be pruned."""
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the detector.
+
+        Args:
+            rules: Overrides of config.TRAP_DETECTION_RULES
+                - enabled: Whether URLs are checked at all
+                - max_path_depth: Most path segments a URL may have
+                - max_segment_repeats: Most times one path segment may occur in a URL
+                - max_query_variants: Most distinct query strings crawled per path
+                - min_siblings: Most recent pages of a URL space its content is judged by
+                - duplicate_ratio: Share of those pages that must be near-identical to an
+                  earlier sibling to mark the URL space as a trap
+                - simhash_distance: Most differing fingerprint bits between near-identical pages
+        """
+        self.rules = {**config.TRAP_DETECTION_RULES, **(rules or {})}
+        self.enabled = self.rules["enabled"]
+        # Distinct query strings per path, kept only up to the limit
+        self._query_variants: Dict[str, set] = defaultdict(set)
+        # Fingerprints of recent pages per URL space, and whether each of the
+        # last min_siblings pages matched an earlier one
+        self._fingerprints: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.rules["min_siblings"] * 4))
+        self._duplicates: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.rules["min_siblings"]))
+        self.trapped_spaces = set()
+        self.pruned: Counter = Counter()
+
+    def check(self, url: str) -> Optional[str]:
+        """
+        Check a newly discovered URL.
+
+        A URL that passes counts towards the query variants of its path.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            Optional[str]: Why the URL should be pruned, or None to crawl it
+        """
+        if not self.enabled:
+            return None
+        reason = self._get_prune_reason(url)
+        if reason:
+            self.pruned[reason.split(":", 1)[0]] += 1
+        return reason
+
+    def _get_prune_reason(self, url: str) -> Optional[str]:
+        """Apply the URL signals and the trapped URL spaces to a URL."""
+        parts = urllib.parse.urlsplit(url)
+        segments = [segment for segment in parts.path.split("/") if segment]
+
+        if len(segments) > self.rules["max_path_depth"]:
+            return f"path depth: {len(segments)} segments"
+
+        if segments:
+            segment, count = Counter(segments).most_common(1)[0]
+            if count > self.rules["max_segment_repeats"]:
+                return f"repeated segments: '{segment}' occurs {count} times"
+            # A block of segments repeated back to back, as in /a/b/a/b
+            for size in range(2, len(segments) // 2 + 1):
+                if segments[-size:] == segments[-2 * size:-size]:
+                    return f"repeated segments: '{'/'.join(segments[-size:])}' repeats"
+
+        space = get_url_space(url)
+        if space in self.trapped_spaces:
+            return f"near-duplicate siblings: {space}"
+
+        if parts.query:
+            path = f"{parts.netloc}{parts.path}"
+            variants = self._query_variants[path]
+            if parts.query not in variants:
+                if len(variants) >= self.rules["max_query_variants"]:
+                    return f"query variants: more than {self.rules['max_query_variants']} for {path}"
+                variants.add(parts.query)
+        return None
+
+    def check_queued(self, url: str) -> Optional[str]:
+        """
+        Check a queued URL against the URL spaces found to be traps since it was queued.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            Optional[str]: Why the URL should be pruned, or None to crawl it
+        """
+        space = get_url_space(url)
+        if not self.enabled or space not in self.trapped_spaces:
+            return None
+        self.pruned["near-duplicate siblings"] += 1
+        return f"near-duplicate siblings: {space}"
+
+    def record_page(self, url: str, text: Optional[str]) -> Optional[str]:
+        """
+        Compare a fetched page with its siblings.
+
+        Args:
+            url: URL of the page
+            text: Page text (None if the page repeated earlier content exactly)
+
+        Returns:
+            Optional[str]: The page's URL space if this page marked it as a trap
+        """
+        space = get_url_space(url)
+        if not self.enabled or space in self.trapped_spaces:
+            return None
+
+        fingerprints = self._fingerprints[space]
+        if text is None:
+            duplicate = True
+        else:
+            fingerprint = simhash(text)
+            duplicate = any(bin(fingerprint ^ other).count("1") <= self.rules["simhash_distance"]
+                            for other in fingerprints)
+            fingerprints.append(fingerprint)
+        duplicates = self._duplicates[space]
+        duplicates.append(duplicate)
+
+        if len(duplicates) == duplicates.maxlen and sum(duplicates) / len(duplicates) >= self.rules["duplicate_ratio"]:
+            self.trapped_spaces.add(space)
+            del self._fingerprints[space]
+            del self._duplicates[space]
+            return space
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get detector statistics.
+
+        Returns:
+            Dict[str, Any]: Pruned URLs per signal and the URL spaces found to be traps
+        """
+        return {
+            "enabled": self.enabled,
+            "pruned": dict(self.pruned),
+            "trapped_spaces": sorted(self.trapped_spaces)
+        }
@@ -0,0 +1,255 @@
+"""
+Compact probabilistic URL set for very large crawls.
+
+A Bloom filter answers "have we seen this URL?" in a few bits per URL instead
+of the 100-200 bytes a Python string in a set costs. The price is a small,
+configurable rate of false positives: a URL that was never added may be
+reported as present (and would then not be crawled). URLs cannot be listed.
+"""
+import base64
+import hashlib
+import math
+import random
+import sys
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+import src.utils.config as config
+
+VISITED_SET_MODES = ("exact", "bloom")
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one 128-bit digest."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        """
+        Size the filter.
+
+        Args:
+            capacity: Number of URLs the filter is sized for
+            false_positive_rate: False positive rate at capacity
+        """
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, url: str) -> List[int]:
+        """Get the bit positions of a URL."""
+        digest = hashlib.blake2b(url.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL may have been added."""
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url))
+
+    def add(self, url: str) -> None:
+        """Set the bits of a URL."""
+        for pos in self._positions(url):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def fill_ratio(self) -> float:
+        """Get the fraction of bits set."""
+        return bin(int.from_bytes(self.bits, "little")).count("1") / self.num_bits
+
+
+class BloomURLSet:
+    """
+    Scalable Bloom filter with a set-like interface (add, in, len).
+
+    When the current filter reaches its capacity a new one with twice the
+    capacity and half the false positive rate is added, so the overall rate
+    stays below the configured one however many URLs are added.
+    """
+
+    mode = "bloom"
+
+    def __init__(self, capacity: Optional[int] = None, false_positive_rate: Optional[float] = None):
+        """
+        Initialize the set.
+
+        Args:
+            capacity: URLs the first filter is sized for (default: config.VISITED_SET_CAPACITY)
+            false_positive_rate: Target false positive rate (default: config.VISITED_SET_FALSE_POSITIVE_RATE)
+
+        Raises:
+            ValueError: If the false positive rate is not between 0 and 1
+        """
+        self.capacity = max(1, capacity or config.VISITED_SET_CAPACITY)
+        self.false_positive_rate = false_positive_rate or config.VISITED_SET_FALSE_POSITIVE_RATE
+        if not 0 < self.false_positive_rate < 1:
+            raise ValueError(f"False positive rate must be between 0 and 1: {self.false_positive_rate}")
+        # Rates of successive filters halve, so their sum stays below the target
+        self._filters = [_BloomFilter(self.capacity, self.false_positive_rate / 2)]
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Get the number of URLs added."""
+        return self._size
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL may have been added."""
+        return any(url in bloom for bloom in self._filters)
+
+    def add(self, url: str) -> None:
+        """
+        Add a URL.
+
+        Args:
+            url: URL to add
+        """
+        if url in self:
+            return
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            current = _BloomFilter(current.capacity * 2, self.false_positive_rate / 2 ** (len(self._filters) + 1))
+            self._filters.append(current)
+        current.add(url)
+        self._size += 1
+
+    def update(self, urls: Iterable[str]) -> None:
+        """
+        Add several URLs.
+
+        Args:
+            urls: URLs to add
+        """
+        for url in urls:
+            self.add(url)
+
+    def memory_bytes(self) -> int:
+        """Get the memory used by the filters' bit arrays."""
+        return sum(sys.getsizeof(bloom.bits) for bloom in self._filters)
+
+    def estimated_false_positive_rate(self) -> float:
+        """
+        Estimate the current false positive rate from how full the filters are.
+
+        Returns:
+            float: Probability that a URL never added is reported as present
+        """
+        miss = 1.0
+        for bloom in self._filters:
+            miss *= 1 - bloom.fill_ratio() ** bloom.num_hashes
+        return 1 - miss
+
+    def measure_false_positive_rate(self, samples: int = 10000, seed: int = 0) -> float:
+        """
+        Measure the false positive rate by probing URLs that were never added.
+
+        Args:
+            samples: Number of probe URLs
+            seed: Seed for the probe URLs
+
+        Returns:
+            float: Fraction of probes reported as present
+        """
+        rng = random.Random(seed)
+        hits = sum(f"https://fp-probe.invalid/{rng.getrandbits(64):016x}" in self for _ in range(samples))
+        return hits / samples
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the filters in JSON-serializable form.
+
+        Returns:
+            Dict[str, Any]: Mode, settings, size and compressed bit arrays
+        """
+        return {
+            "mode": self.mode,
+            "capacity": self.capacity,
+            "false_positive_rate": self.false_positive_rate,
+            "size": self._size,
+            "filters": [
+                {
+                    "capacity": bloom.capacity,
+                    "num_bits": bloom.num_bits,
+                    "num_hashes": bloom.num_hashes,
+                    "count": bloom.count,
+                    "bits": base64.b64encode(zlib.compress(bytes(bloom.bits))).decode("ascii")
+                }
+                for bloom in self._filters
+            ]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "BloomURLSet":
+        """
+        Rebuild a set saved with get_state.
+
+        Args:
+            state: Saved set state
+
+        Returns:
+            BloomURLSet: Set with the saved filters
+        """
+        urls = cls(state["capacity"], state["false_positive_rate"])
+        urls._filters = []
+        for saved in state["filters"]:
+            bloom = _BloomFilter.__new__(_BloomFilter)
+            bloom.capacity = saved["capacity"]
+            bloom.num_bits = saved["num_bits"]
+            bloom.num_hashes = saved["num_hashes"]
+            bloom.count = saved["count"]
+            bloom.bits = bytearray(zlib.decompress(base64.b64decode(saved["bits"])))
+            urls._filters.append(bloom)
+        urls._size = state["size"]
+        return urls
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get set statistics.
+
+        Returns:
+            Dict[str, Any]: Mode, URLs, memory use and target, estimated and measured false positive rates
+        """
+        stats = _memory_stats(self)
+        capacity = sum(bloom.capacity for bloom in self._filters)
+        stats.update({
+            # Filters are allocated up front, so quote the cost at capacity
+            "bytes_per_million_urls": round(self.memory_bytes() * 1_000_000 / capacity),
+            "filters": len(self._filters),
+            "capacity": capacity,
+            "target_false_positive_rate": self.false_positive_rate,
+            "estimated_false_positive_rate": self.estimated_false_positive_rate(),
+            "measured_false_positive_rate": self.measure_false_positive_rate()
+        })
+        return stats
+
+
+def _memory_stats(urls: Any) -> Dict[str, Any]:
+    """Report the mode, size and memory use of a URL set."""
+    if isinstance(urls, (set, frozenset)):
+        mode = "exact"
+        memory = sys.getsizeof(urls) + sum(sys.getsizeof(url) for url in urls)
+    else:
+        mode = urls.mode
+        memory = urls.memory_bytes()
+    return {
+        "mode": mode,
+        "urls": len(urls),
+        "memory_bytes": memory,
+        "bytes_per_million_urls": round(memory * 1_000_000 / len(urls)) if len(urls) else None
+    }
+
+
+def get_url_set_stats(urls: Any) -> Dict[str, Any]:
+    """
+    Report the size and memory use of a visited-URL set.
+
+    Args:
+        urls: Python set, BloomURLSet, or a set-like object with a mode attribute and memory_bytes()
+
+    Returns:
+        Dict[str, Any]: Mode, URLs, memory bytes and memory bytes per million URLs, plus
+            false positive rates for Bloom filters
+    """
+    if isinstance(urls, BloomURLSet):
+        return urls.get_stats()
+    return _memory_stats(urls)
@@ -0,0 +1,268 @@
+"""
+URL template clustering with per-template crawl budgets.
+
+Most sites build their URLs from a few templates such as /news/<slug> or
+/wiki/<slug>. Templates are learned from the discovered URLs with a prefix
+tree of path segments: once a path position has more than a few distinct
+leaf values, they are merged into one variable. Templates can also be
+configured explicitly, each with a page budget and a sampling rate.
+"""
+import hashlib
+import re
+import urllib.parse
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import src.utils.config as config
+
+
+class _TemplateNode:
+    """Node of the template tree; its path from the root is a URL template."""
+
+    __slots__ = ("children", "wildcard", "numeric", "count")
+
+    def __init__(self):
+        self.children: Dict[str, "_TemplateNode"] = {}
+        # Node shared by the values merged into a variable, and whether they were all numbers
+        self.wildcard: Optional["_TemplateNode"] = None
+        self.numeric = True
+        # URLs of this template admitted to the crawl
+        self.count = 0
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get the subtree in JSON-serializable form."""
+        return {
+            "children": {segment: child.get_state() for segment, child in self.children.items()},
+            "wildcard": self.wildcard.get_state() if self.wildcard else None,
+            "numeric": self.numeric,
+            "count": self.count
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "_TemplateNode":
+        """Rebuild a subtree saved with get_state."""
+        node = cls()
+        node.children = {segment: cls.from_state(child) for segment, child in state["children"].items()}
+        node.wildcard = cls.from_state(state["wildcard"]) if state["wildcard"] else None
+        node.numeric = state["numeric"]
+        node.count = state["count"]
+        return node
+
+
+def _format_template(segments: List[str]) -> str:
+    """Join template segments into a path, with the query parameter names last."""
+    return ("/" + "/".join(segments)).replace("/?", "?")
+
+
+def compile_template(pattern: str) -> "re.Pattern":
+    """
+    Compile a configured URL template.
+
+    "<name>" matches one path segment and "*" matches anything.
+
+    Args:
+        pattern: Template such as "/news/<slug>" or "/wiki/*"
+
+    Returns:
+        re.Pattern: Regular expression matching URL paths of the template
+    """
+    parts = re.split(r"(<[^>]*>|\*)", pattern)
+    regex = "".join(
+        "[^/]+" if part.startswith("<") else ".*" if part == "*" else re.escape(part)
+        for part in parts
+    )
+    return re.compile(f"{regex}$")
+
+
+class URLTemplates:
+    """Groups URLs into templates and enforces per-template budgets and sampling rates."""
+
+    def __init__(self, templates: Optional[Dict[str, Dict[str, Any]]] = None,
+                 default: Optional[Dict[str, Any]] = None, page_limit: Optional[int] = None,
+                 min_variants: Optional[int] = None):
+        """
+        Initialize the templates.
+
+        Args:
+            templates: Configured templates (see compile_template), tried in order, with settings
+                - budget: Most URLs of the template admitted (None: no limit)
+                - share: Most URLs admitted as a fraction of page_limit (None: no limit)
+                - sample_rate: Fraction of the template's URLs crawled at all
+            default: Settings of learned templates (default: config.URL_TEMPLATE_DEFAULT)
+            page_limit: Page limit of the crawl, for shares
+            min_variants: Distinct values a path position takes before they become a
+                variable (default: config.URL_TEMPLATE_MIN_VARIANTS)
+        """
+        self.templates = [(pattern, compile_template(pattern), {**config.URL_TEMPLATE_DEFAULT, **settings})
+                          for pattern, settings in (templates or {}).items()]
+        self.default = {**config.URL_TEMPLATE_DEFAULT, **(default or {})}
+        self.page_limit = page_limit
+        self.min_variants = min_variants or config.URL_TEMPLATE_MIN_VARIANTS
+        self._root = _TemplateNode()
+        self._configured_counts: Counter = Counter()
+        self.skipped: Counter = Counter()
+
+    def _get_child(self, node: _TemplateNode, segment: str) -> _TemplateNode:
+        """Follow (or add) the edge of a path segment, merging leaf values into a variable."""
+        child = node.children.get(segment)
+        if child is not None:
+            return child
+        if node.wildcard is not None and segment:
+            node.numeric = node.numeric and segment.isdigit()
+            return node.wildcard
+
+        # Values with their own subtrees (site sections) and index pages
+        # (the empty segment after a trailing slash) stay literal
+        leaves = [value for value, other in node.children.items()
+                  if value and not other.children and other.wildcard is None]
+        if segment and node.wildcard is None and len(leaves) >= self.min_variants:
+            node.wildcard = _TemplateNode()
+            node.numeric = segment.isdigit() and all(value.isdigit() for value in leaves)
+            for value in leaves:
+                self._merge(node.wildcard, node.children.pop(value))
+            return node.wildcard
+
+        child = node.children[segment] = _TemplateNode()
+        return child
+
+    def _merge(self, into: _TemplateNode, node: _TemplateNode) -> None:
+        """Merge a subtree into another."""
+        into.count += node.count
+        for segment, child in node.children.items():
+            self._merge(self._get_child(into, segment), child)
+        if node.wildcard is not None:
+            if into.wildcard is None:
+                into.wildcard = _TemplateNode()
+                into.numeric = node.numeric
+            else:
+                into.numeric = into.numeric and node.numeric
+            self._merge(into.wildcard, node.wildcard)
+
+    @staticmethod
+    def _get_segments(url: str) -> Tuple[str, List[str]]:
+        """Split a URL into its path and the segments used for learning templates."""
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        segments = path.split("/")[1:]
+        if parts.query:
+            names = sorted({name for name, _ in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)})
+            segments.append("?" + "&".join(names))
+        return path, segments
+
+    def _learn(self, segments: List[str]) -> Tuple[str, _TemplateNode]:
+        """Add a URL's segments to the tree and get its learned template."""
+        node = self._root
+        template = []
+        for segment in segments:
+            parent = node
+            node = self._get_child(parent, segment)
+            if node is parent.wildcard:
+                template.append("<id>" if parent.numeric else "<slug>")
+            else:
+                template.append(segment)
+        return _format_template(template), node
+
+    def _lookup(self, url: str) -> Tuple[str, Dict[str, Any], Optional[_TemplateNode]]:
+        """Get a URL's template, its settings and its tree node (None for configured templates)."""
+        path, segments = self._get_segments(url)
+        template, node = self._learn(segments)
+        for pattern, regex, settings in self.templates:
+            if regex.match(path):
+                return pattern, settings, None
+        return template, self.default, node
+
+    def _get_budget(self, settings: Dict[str, Any]) -> Optional[int]:
+        """Get the page budget of a template's settings."""
+        budgets = []
+        if settings.get("budget") is not None:
+            budgets.append(settings["budget"])
+        if settings.get("share") is not None and self.page_limit:
+            budgets.append(int(settings["share"] * self.page_limit))
+        return min(budgets) if budgets else None
+
+    def admit(self, url: str) -> Optional[str]:
+        """
+        Decide whether a newly discovered URL may be crawled, counting it if so.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            Optional[str]: Why the URL should not be crawled, or None to crawl it
+        """
+        template, settings, node = self._lookup(url)
+        sample_rate = settings.get("sample_rate", 1.0)
+        if sample_rate < 1.0:
+            # A hash of the URL keeps the sample the same across runs
+            digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+            if int.from_bytes(digest, "little") / 2 ** 64 >= sample_rate:
+                self.skipped[template] += 1
+                return f"template {template}: not sampled"
+
+        count = node.count if node is not None else self._configured_counts[template]
+        budget = self._get_budget(settings)
+        if budget is not None and count >= budget:
+            self.skipped[template] += 1
+            return f"template {template}: budget of {budget} pages used"
+
+        if node is not None:
+            node.count += 1
+        else:
+            self._configured_counts[template] += 1
+        return None
+
+    def _iter_learned(self, node: _TemplateNode, template: List[str]):
+        """Yield the learned templates below a node with their admitted counts."""
+        if node.count:
+            yield _format_template(template), node.count
+        for segment, child in node.children.items():
+            yield from self._iter_learned(child, template + [segment])
+        if node.wildcard is not None:
+            yield from self._iter_learned(node.wildcard, template + ["<id>" if node.numeric else "<slug>"])
+
+    def get_stats(self, limit: int = 50) -> Dict[str, Any]:
+        """
+        Get template statistics.
+
+        Args:
+            limit: Most templates listed
+
+        Returns:
+            Dict[str, Any]: Number of templates and the largest ones with their admitted
+                and skipped URLs
+        """
+        admitted = Counter(self._configured_counts)
+        for template, count in self._iter_learned(self._root, []):
+            admitted[template] += count
+        return {
+            "templates": len(admitted),
+            "largest": [
+                {"template": template, "admitted": count, "skipped": self.skipped.get(template, 0)}
+                for template, count in admitted.most_common(limit)
+            ],
+            "skipped": sum(self.skipped.values())
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the learned templates and counts in JSON-serializable form.
+
+        Returns:
+            Dict[str, Any]: Template tree, configured template counts and skipped URLs
+        """
+        return {
+            "tree": self._root.get_state(),
+            "configured_counts": dict(self._configured_counts),
+            "skipped": dict(self.skipped)
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore templates and counts saved with get_state.
+
+        Args:
+            state: Saved template state
+        """
+        self._root = _TemplateNode.from_state(state["tree"])
+        self._configured_counts = Counter(state["configured_counts"])
+        self.skipped = Counter(state["skipped"])
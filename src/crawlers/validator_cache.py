@@ -0,0 +1,210 @@
+"""
+Persistent store of HTTP response validators for conditional re-crawls.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+import src.utils.config as config
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an HTTP date header into a timestamp.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Optional[float]: Unix timestamp or None if missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def get_freshness_lifetime(headers: Mapping[str, str]) -> float:
+    """
+    Work out how long a response may be reused without revalidation.
+
+    Cache-Control max-age wins over Expires. Without either, a heuristic of
+    10% of the time since Last-Modified is used, capped at
+    config.VALIDATOR_MAX_HEURISTIC_LIFETIME.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        float: Freshness lifetime in seconds (0 if the response must be revalidated)
+    """
+    cache_control = (headers.get("Cache-Control") or "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    if max_age:
+        return float(max_age.group(1))
+
+    date = _parse_http_date(headers.get("Date")) or time.time()
+    expires = _parse_http_date(headers.get("Expires"))
+    if expires is not None:
+        return max(0.0, expires - date)
+
+    last_modified = _parse_http_date(headers.get("Last-Modified"))
+    if last_modified is not None:
+        return min(max(0.0, (date - last_modified) * 0.1), config.VALIDATOR_MAX_HEURISTIC_LIFETIME)
+
+    return 0.0
+
+
+class ValidatorStore:
+    """SQLite-backed store of ETag/Last-Modified validators keyed by URL hash."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file (default: config.VALIDATOR_CACHE_PATH)
+        """
+        self.path = path or config.VALIDATOR_CACHE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS validators (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                fresh_until REAL NOT NULL DEFAULT 0,
+                links TEXT NOT NULL DEFAULT '[]',
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, url_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored validators for a URL.
+
+        Args:
+            url_hash: Hash of the URL (see BaseCrawler._get_url_hash)
+
+        Returns:
+            Optional[Dict[str, Any]]: Stored entry or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, content_hash, fresh_until, links "
+                "FROM validators WHERE url_hash = ?",
+                (url_hash,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {
+            "url": row[0],
+            "etag": row[1],
+            "last_modified": row[2],
+            "content_hash": row[3],
+            "fresh_until": row[4],
+            "links": json.loads(row[5])
+        }
+
+    def is_fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check whether a stored entry can be reused without contacting the server.
+
+        Args:
+            entry: Entry returned by get
+
+        Returns:
+            bool: True if the entry is still fresh
+        """
+        return bool(entry) and entry["fresh_until"] > time.time()
+
+    def get_conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Build the conditional request headers for a stored entry.
+
+        Args:
+            entry: Entry returned by get
+
+        Returns:
+            Dict[str, str]: If-None-Match/If-Modified-Since headers (empty if no validators)
+        """
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url_hash: str, url: str, headers: Mapping[str, str],
+               content_hash: Optional[str] = None, links: Optional[List[str]] = None) -> None:
+        """
+        Store the validators of a full (200) response.
+
+        Args:
+            url_hash: Hash of the URL
+            url: The URL
+            headers: Response headers
+            content_hash: Hash of the page's text content (optional)
+            links: Links extracted from the page, replayed when it is unchanged
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO validators "
+                "(url_hash, url, etag, last_modified, content_hash, fresh_until, links, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url_hash,
+                    url,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    content_hash,
+                    now + get_freshness_lifetime(headers),
+                    json.dumps(links or []),
+                    now
+                )
+            )
+            self._conn.commit()
+
+    def refresh(self, url_hash: str, headers: Mapping[str, str]) -> None:
+        """
+        Extend the lifetime of an entry after a 304 Not Modified response.
+
+        Args:
+            url_hash: Hash of the URL
+            headers: Headers of the 304 response
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE validators SET fresh_until = ?, updated_at = ?, "
+                "etag = COALESCE(?, etag) WHERE url_hash = ?",
+                (now + get_freshness_lifetime(headers), now, headers.get("ETag"), url_hash)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
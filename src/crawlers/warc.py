@@ -0,0 +1,411 @@
+"""
+Minimal WARC writer and reader for recording crawls and replaying them offline.
+
+Each record is stored as its own gzip member, as in standard .warc.gz files,
+so an archive can be appended to safely and single records can be read back
+by seeking to their offset.
+"""
+import glob
+import io
+import itertools
+import os
+import tempfile
+import threading
+import urllib.parse
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+WARC_VERSION = "WARC/1.1"
+READ_CHUNK_SIZE = 64 * 1024
+# Bodies copied by a TeeStream move from memory to a temporary file beyond this size
+SPOOL_SIZE = 1024 * 1024
+
+# (status code, reason, headers, body) of an archived response
+ArchivedResponse = Tuple[int, str, List[Tuple[str, str]], bytes]
+
+
+def _format_record_head(warc_type: str, url: str, content_type: str, length: int,
+                        extra_headers: Optional[Dict[str, str]] = None) -> Tuple[str, bytes]:
+    """
+    Serialize the WARC headers of a record.
+
+    Args:
+        warc_type: WARC-Type of the record
+        url: Target URI (empty for records without one)
+        content_type: Content-Type of the record block
+        length: Length of the record block
+        extra_headers: Additional WARC headers (optional)
+
+    Returns:
+        Tuple[str, bytes]: Record ID and headers including the blank line
+    """
+    record_id = f"<urn:uuid:{uuid.uuid4()}>"
+    headers = {
+        "WARC-Type": warc_type,
+        "WARC-Record-ID": record_id,
+        "WARC-Date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    }
+    if url:
+        headers["WARC-Target-URI"] = url
+    headers.update(extra_headers or {})
+    headers["Content-Type"] = content_type
+    headers["Content-Length"] = str(length)
+    head = WARC_VERSION + "\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    return record_id, head.encode("utf-8")
+
+
+def _compress(parts: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress data into a single gzip member piece by piece.
+
+    Args:
+        parts: Data to compress
+
+    Yields:
+        bytes: Compressed data
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for part in parts:
+        data = compressor.compress(part)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _format_record(warc_type: str, url: str, content_type: str, block: bytes,
+                   extra_headers: Optional[Dict[str, str]] = None) -> Tuple[str, bytes]:
+    """
+    Serialize a single gzip-compressed WARC record.
+
+    Args:
+        warc_type: WARC-Type of the record
+        url: Target URI (empty for records without one)
+        content_type: Content-Type of the record block
+        block: Record block
+        extra_headers: Additional WARC headers (optional)
+
+    Returns:
+        Tuple[str, bytes]: Record ID and compressed record
+    """
+    record_id, head = _format_record_head(warc_type, url, content_type, len(block), extra_headers)
+    return record_id, b"".join(_compress([head, block, b"\r\n\r\n"]))
+
+
+def _format_http_head(start_line: str, headers: List[Tuple[str, str]]) -> bytes:
+    """
+    Serialize an HTTP start line and headers.
+
+    Args:
+        start_line: Request or status line
+        headers: Header name/value pairs
+
+    Returns:
+        bytes: HTTP head including the blank line
+    """
+    lines = [start_line] + [f"{name}: {value}" for name, value in headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", errors="replace")
+
+
+def _iter_members(fileobj, offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """
+    Iterate over the decompressed gzip members of a .warc.gz file.
+
+    Args:
+        fileobj: File opened in binary mode
+        offset: Offset of the first member to read
+
+    Yields:
+        Tuple[int, bytes]: Offset of the member and its decompressed data
+    """
+    fileobj.seek(offset)
+    buffer = b""
+    while True:
+        if not buffer:
+            buffer = fileobj.read(READ_CHUNK_SIZE)
+            if not buffer:
+                return
+
+        member_offset = offset
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        parts = []
+        while not decompressor.eof:
+            if not buffer:
+                buffer = fileobj.read(READ_CHUNK_SIZE)
+                if not buffer:
+                    raise ValueError(f"Truncated WARC record at offset {member_offset}")
+            parts.append(decompressor.decompress(buffer))
+            offset += len(buffer) - len(decompressor.unused_data)
+            buffer = decompressor.unused_data
+        yield member_offset, b"".join(parts)
+
+
+def _parse_record(data: bytes) -> Tuple[Dict[str, str], bytes]:
+    """
+    Split a decompressed WARC record into its headers and block.
+
+    Args:
+        data: Decompressed record
+
+    Returns:
+        Tuple[Dict[str, str], bytes]: WARC headers and record block
+    """
+    head, _, rest = data.partition(b"\r\n\r\n")
+    headers = {}
+    for line in head.decode("utf-8", errors="replace").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+    length = int(headers.get("Content-Length", len(rest)))
+    return headers, rest[:length]
+
+
+def _parse_http_response(block: bytes) -> ArchivedResponse:
+    """
+    Parse the HTTP response stored in a response record block.
+
+    Args:
+        block: Record block
+
+    Returns:
+        ArchivedResponse: Status code, reason, headers and body
+    """
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    status_code = int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ""
+
+    headers = []
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers.append((name.strip(), value.strip()))
+    return status_code, reason, headers, body
+
+
+def build_response(url: str, status_code: int, reason: str, headers: List[Tuple[str, str]],
+                   body: Union[bytes, BinaryIO]) -> requests.Response:
+    """
+    Build a requests.Response whose body is already in memory or read from a stream.
+
+    Args:
+        url: Response URL
+        status_code: HTTP status code
+        reason: Reason phrase
+        headers: Header name/value pairs
+        body: Response body, or a binary stream it is read from (already
+            decoded from any Content-Encoding)
+
+    Returns:
+        requests.Response: Response that reads its body from memory or the stream
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    if isinstance(body, bytes):
+        response._content = body
+        response._content_consumed = True
+    else:
+        response.raw = body
+    return response
+
+
+class WarcWriter:
+    """Append request/response pairs to a .warc.gz file."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the writer; the file is created on the first write.
+
+        Args:
+            path: Path of the .warc.gz file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._started = False
+
+    def _append(self, records: Iterable[bytes]) -> None:
+        """Append compressed records, possibly in pieces, to the file. Caller holds the lock."""
+        if not self._started:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._started = True
+            if not os.path.exists(self.path):
+                _, info = _format_record(
+                    "warcinfo", "", "application/warc-fields",
+                    b"software: Web-Crawling-Pipeline\r\nformat: WARC File Format 1.1\r\n"
+                )
+                records = itertools.chain([info], records)
+
+        with open(self.path, "ab") as f:
+            for data in records:
+                f.write(data)
+
+    def write_exchange(self, url: str, request_headers: List[Tuple[str, str]], status_code: int,
+                       reason: str, response_headers: List[Tuple[str, str]], body: Union[bytes, BinaryIO],
+                       truncated: bool = False) -> None:
+        """
+        Record a request and the response it received.
+
+        Args:
+            url: Requested URL
+            request_headers: Request header name/value pairs
+            status_code: HTTP status code
+            reason: Reason phrase
+            response_headers: Response header name/value pairs
+            body: Response body, or a seekable binary file holding it, which
+                is copied to the archive in chunks
+            truncated: Whether the body was cut off before the end
+        """
+        parts = urllib.parse.urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        if isinstance(body, bytes):
+            body = io.BytesIO(body)
+        length = body.seek(0, io.SEEK_END)
+        body.seek(0)
+
+        http_head = _format_http_head(f"HTTP/1.1 {status_code} {reason}", response_headers)
+        response_id, response_head = _format_record_head(
+            "response", url, "application/http; msgtype=response", len(http_head) + length,
+            {"WARC-Truncated": "length"} if truncated else None
+        )
+        response_record = _compress(itertools.chain(
+            [response_head, http_head], iter(lambda: body.read(READ_CHUNK_SIZE), b""), [b"\r\n\r\n"]
+        ))
+        _, request_record = _format_record(
+            "request", url, "application/http; msgtype=request",
+            _format_http_head(f"GET {target} HTTP/1.1", request_headers),
+            {"WARC-Concurrent-To": response_id}
+        )
+
+        with self._lock:
+            self._append(itertools.chain(response_record, [request_record]))
+
+
+class TeeStream(io.RawIOBase):
+    """
+    Readable stream over body chunks that keeps a copy of what is read.
+
+    The copy stays in memory up to SPOOL_SIZE and is spooled to a temporary
+    file beyond that. Once the chunks run out, or the stream is closed
+    early, on_finish is called with the copy and whether the whole body was
+    read.
+    """
+
+    def __init__(self, chunks: Iterator[bytes], on_finish: Callable[[BinaryIO, bool], None]):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks: Body chunks
+            on_finish: Called once with the copy and whether the body was read to its end
+        """
+        self._chunks = chunks
+        self._on_finish = on_finish
+        self._copy = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self._buffer = b""
+        self._finished = False
+
+    def readable(self) -> bool:
+        """Report that the stream can be read."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Fill a buffer from the chunks, copying the bytes read; 0 means the body ended."""
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._finish(True)
+                return 0
+            self._buffer = chunk
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._copy.write(self._buffer[:size])
+        self._buffer = self._buffer[size:]
+        return size
+
+    def _finish(self, complete: bool) -> None:
+        """Hand the copy to on_finish once, then discard it."""
+        if self._finished:
+            return
+        self._finished = True
+        try:
+            self._on_finish(self._copy, complete)
+        finally:
+            self._copy.close()
+
+    def close(self) -> None:
+        """Close the stream, finishing it with what was read so far."""
+        if not self.closed:
+            try:
+                self._finish(False)
+            finally:
+                super().close()
+
+
+class WarcArchive:
+    """Read-only index of the response records in a directory of .warc.gz files."""
+
+    def __init__(self, directory: str):
+        """
+        Index every .warc.gz file in a directory.
+
+        Files are read in name order, so for URLs recorded more than once the
+        latest recording wins.
+
+        Args:
+            directory: Directory containing the archives
+        """
+        self.directory = directory
+        self._index: Dict[str, Tuple[str, int]] = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*.warc.gz"))):
+            self._index_file(path)
+
+    def _index_file(self, path: str) -> None:
+        """
+        Add the response records of one file to the index.
+
+        Args:
+            path: Path of the .warc.gz file
+        """
+        with open(path, "rb") as f:
+            for offset, data in _iter_members(f):
+                headers, _ = _parse_record(data)
+                if headers.get("WARC-Type") == "response":
+                    self._index[headers.get("WARC-Target-URI", "")] = (path, offset)
+
+    def __len__(self) -> int:
+        """Get the number of archived URLs."""
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL has an archived response."""
+        return url in self._index
+
+    def get_response(self, url: str) -> Optional[ArchivedResponse]:
+        """
+        Read the archived response for a URL.
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            Optional[ArchivedResponse]: Status code, reason, headers and body,
+                or None if the URL was not recorded
+        """
+        location = self._index.get(url)
+        if location is None:
+            return None
+
+        path, offset = location
+        with open(path, "rb") as f:
+            _, data = next(_iter_members(f, offset))
+        _, block = _parse_record(data)
+        return _parse_http_response(block)
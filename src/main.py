@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 import src.utils.config as config
 from src.crawlers.crawler_factory import CrawlerFactory
 from src.news_api.news_api_client import NewsApiClient
+from src.storage.local_storage import LocalStorage
 from src.storage.s3_storage import S3Storage
 from src.utils.logger import CrawlerLogger
 
@@ -43,8 +44,8 @@ def crawl_websites(website_names: Optional[List[str]] = None) -> Dict[str, Any]:
         "failed_crawls": 0
     }
     
-    # Initialize S3 storage
-    s3_storage = S3Storage()
+    # Initialize S3 storage; a replay runs offline and writes local files
+    s3_storage = LocalStorage() if config.FETCH_MODE == "replay" else S3Storage()
     
     # Create crawler factory
     factory = CrawlerFactory()
@@ -180,8 +181,14 @@ def main():
     parser.add_argument("--websites", nargs="*", help="List of website names to crawl (optional)")
     parser.add_argument("--news", action="store_true", help="Fetch news from APIs")
     parser.add_argument("--all", action="store_true", help="Crawl all websites and fetch news")
+    parser.add_argument("--fetch-mode", choices=["live", "record", "replay"], default=config.FETCH_MODE,
+                        help="Fetch live, record responses to WARC archives, or replay them offline")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume each website's crawl from its last checkpoint")
     
     args = parser.parse_args()
+    config.FETCH_MODE = args.fetch_mode
+    config.RESUME = args.resume
     
     # Default to all if no options specified
     if not (args.websites or args.news or args.all):
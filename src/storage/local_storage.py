@@ -0,0 +1,171 @@
+import os
+import json
+import datetime
+import logging
+from typing import Dict, Any, Optional
+
+import src.utils.config as config
+
+
+class LocalStorage:
+    """
+    Class to store crawler data in local files instead of S3.
+    
+    It has the methods of S3Storage that the crawlers use, so a replayed
+    crawl can run offline. Streamed data is written as JSON lines, one
+    file per stream, under a directory per source.
+    """
+    
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize local storage.
+        
+        Args:
+            directory: Root directory of the stored files (default: config.REPLAY_OUTPUT_DIR)
+        """
+        self.logger = logging.getLogger("local_storage")
+        self.directory = directory or config.REPLAY_OUTPUT_DIR
+    
+    def _generate_path(self, source: str, filename: str) -> str:
+        """
+        Generate the path of a file, creating its directory.
+        
+        Args:
+            source: Data source (e.g., website name)
+            filename: Filename
+        
+        Returns:
+            str: Path of the file
+        """
+        directory = os.path.join(self.directory, source)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, filename)
+    
+    def stream_raw_data(self, source: str, data_generator, filename: Optional[str] = None) -> str:
+        """
+        Write raw data to a JSON lines file as it's collected.
+        
+        Args:
+            source: Data source (e.g., website name)
+            data_generator: Generator yielding data chunks
+            filename: Optional filename (default: source_timestamp.jsonl)
+        
+        Returns:
+            str: Path where data was stored
+        """
+        if not filename:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+            filename = f"{source}_{timestamp}.jsonl"
+        
+        path = self._generate_path(source, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in data_generator:
+                f.write(json.dumps(chunk) + "\n")
+        
+        self.logger.info(f"Stored raw data at {path}")
+        return path
+    
+    def store_processed_data(self, source: str, data: Dict[str, Any],
+                             format: str = 'json', filename: Optional[str] = None) -> str:
+        """
+        Store processed data in a local file.
+        
+        Args:
+            source: Data source (e.g., website name)
+            data: Processed data to store
+            format: Storage format (only 'json' is supported)
+            filename: Optional filename (default: source_timestamp.json)
+        
+        Returns:
+            str: Path where data was stored
+        
+        Raises:
+            ValueError: If the format is not 'json'
+        """
+        if format != 'json':
+            raise ValueError(f"Unsupported format for local storage: {format}")
+        
+        if not filename:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+            filename = f"{source}_{timestamp}.json"
+        
+        # Serialize first so a failure leaves no partial file
+        json_data = json.dumps(data)
+        path = self._generate_path(source, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json_data)
+        
+        self.logger.info(f"Stored processed data at {path}")
+        return path
+    
+    def stream_processed_text_data(self, source: str, data_generator, filename: Optional[str] = None,
+                                   upload_state: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Write processed text data to a JSON lines file as it's collected.
+        
+        Args:
+            source: Data source (e.g., website name)
+            data_generator: Generator yielding processed text data chunks
+            filename: Optional filename (default: source_timestamp_text.jsonl)
+            upload_state: Dictionary kept up to date with the file's path and the
+                length written so far, so a checkpoint can capture it; if it
+                already holds a path, that file is cut back to the recorded
+                length and continued
+        
+        Returns:
+            str: Path where data was stored
+        """
+        if upload_state is None:
+            upload_state = {}
+        
+        if upload_state.get("key"):
+            path = upload_state["key"]
+            f = open(path, "r+b")
+            # Lines written after the checkpoint are written again
+            f.truncate(upload_state["offset"])
+            f.seek(upload_state["offset"])
+            self.logger.info(f"Resuming {path} at byte {upload_state['offset']}")
+        else:
+            if not filename:
+                timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+                filename = f"{source}_{timestamp}_text.jsonl"
+            path = self._generate_path(source, filename)
+            f = open(path, "wb")
+            upload_state.update({"key": path, "offset": 0})
+        
+        with f:
+            for chunk in data_generator:
+                f.write(json.dumps(chunk).encode('utf-8') + b"\n")
+                f.flush()
+                upload_state["offset"] = f.tell()
+        upload_state["completed"] = True
+        
+        self.logger.info(f"Stored text data at {path}")
+        return path
+    
+    def check_multipart_upload(self, upload_state: Dict[str, Any]) -> bool:
+        """
+        Check whether a file saved in a checkpoint can be continued.
+        
+        Args:
+            upload_state: Upload state filled in by stream_processed_text_data
+        
+        Returns:
+            bool: True if the file still holds everything recorded in the state
+        """
+        try:
+            return os.path.getsize(upload_state["key"]) >= upload_state["offset"]
+        except OSError:
+            return False
+    
+    def abort_multipart_upload(self, upload_state: Dict[str, Any]) -> None:
+        """
+        Delete a partly written file, ignoring failures.
+        
+        Args:
+            upload_state: Upload state filled in by stream_processed_text_data
+        """
+        try:
+            os.remove(upload_state["key"])
+        except OSError:
+            pass
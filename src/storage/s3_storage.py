@@ -404,7 +404,8 @@ class S3Storage:
             print(f"Error storing processed text data: {str(e)}")
             raise
 
-    def stream_processed_text_data(self, source: str, data_generator, filename: Optional[str] = None) -> str:
+    def stream_processed_text_data(self, source: str, data_generator, filename: Optional[str] = None,
+                                   upload_state: Optional[Dict[str, Any]] = None) -> str:
         """
         Stream processed text data to S3 as it's collected.
         
@@ -412,54 +413,73 @@ class S3Storage:
             source: Data source (e.g., website name)
             data_generator: Generator yielding processed text data chunks
             filename: Optional filename (default: source_timestamp_text.json.gz)
+            upload_state: Dictionary kept up to date with the multipart upload's key,
+                upload id, uploaded parts and buffered chunks, so a checkpoint can
+                capture it; if it already holds an upload id, that upload is continued
             
         Returns:
             str: S3 key where data was stored
         """
-        if not filename:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            filename = f"{source}_{timestamp}_text.json.gz"
+        if upload_state is None:
+            upload_state = {}
         
-        # Generate S3 key
-        s3_key = self._generate_key(source, "text_processed", filename)
+        if upload_state.get("upload_id"):
+            s3_key = upload_state["key"]
+            # Chunks restored from a checkpoint are JSON text
+            upload_state["buffer"] = [
+                chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in upload_state["buffer"]
+            ]
+        else:
+            if not filename:
+                timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+                filename = f"{source}_{timestamp}_text.json.gz"
+            
+            # Generate S3 key
+            s3_key = self._generate_key(source, "text_processed", filename)
         
         try:
-            self.logger.info(f"Starting multipart upload to s3://{self.bucket_name}/{s3_key}")
-            
-            # Initialize multipart upload
-            mpu = self.s3_client.create_multipart_upload(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                ContentType='application/json',
-                ContentEncoding='gzip'
-            )
+            if upload_state.get("upload_id"):
+                self.logger.info(f"Resuming multipart upload to s3://{self.bucket_name}/{s3_key} "
+                                 f"after {len(upload_state['parts'])} parts")
+            else:
+                self.logger.info(f"Starting multipart upload to s3://{self.bucket_name}/{s3_key}")
+                
+                # Initialize multipart upload
+                mpu = self.s3_client.create_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    ContentType='application/json',
+                    ContentEncoding='gzip'
+                )
+                upload_state.update({"key": s3_key, "upload_id": mpu['UploadId'], "parts": [], "buffer": []})
             
-            parts = []
-            part_number = 1
-            buffer = []
-            buffer_size = 0
+            upload_id = upload_state["upload_id"]
+            parts = upload_state["parts"]
+            part_number = len(parts) + 1
+            buffer = upload_state["buffer"]
+            buffer_size = sum(len(chunk) for chunk in buffer)
             max_buffer_size = 5 * 1024 * 1024  # 5MB buffer
             
             # Process each chunk
             for chunk in data_generator:
-                # Add chunk to buffer
-                buffer.append(chunk)
-                buffer_size += len(str(chunk))
+                # Serialize each chunk once; the encoded size drives buffering
+                encoded_chunk = json.dumps(chunk).encode('utf-8')
+                buffer.append(encoded_chunk)
+                buffer_size += len(encoded_chunk)
                 
                 # If buffer is full, upload it
                 if buffer_size >= max_buffer_size:
                     self.logger.debug(f"Uploading part {part_number} (size: {buffer_size} bytes)")
                     
                     # Compress buffer
-                    json_data = json.dumps(buffer).encode('utf-8')
-                    compressed_data = gzip.compress(json_data)
+                    compressed_data = gzip.compress(self._join_json_array(buffer))
                     
                     # Upload part
                     part = self.s3_client.upload_part(
                         Bucket=self.bucket_name,
                         Key=s3_key,
                         PartNumber=part_number,
-                        UploadId=mpu['UploadId'],
+                        UploadId=upload_id,
                         Body=compressed_data
                     )
                     
@@ -469,8 +489,8 @@ class S3Storage:
                     })
                     part_number += 1
                     
-                    # Clear buffer
-                    buffer = []
+                    # Clear buffer (in place, so upload_state follows)
+                    buffer.clear()
                     buffer_size = 0
                     
                     # Force garbage collection
@@ -479,14 +499,13 @@ class S3Storage:
             # Upload remaining buffer if any
             if buffer:
                 self.logger.debug(f"Uploading final part {part_number} (size: {buffer_size} bytes)")
-                json_data = json.dumps(buffer).encode('utf-8')
-                compressed_data = gzip.compress(json_data)
+                compressed_data = gzip.compress(self._join_json_array(buffer))
                 
                 part = self.s3_client.upload_part(
                     Bucket=self.bucket_name,
                     Key=s3_key,
                     PartNumber=part_number,
-                    UploadId=mpu['UploadId'],
+                    UploadId=upload_id,
                     Body=compressed_data
                 )
                 
@@ -494,29 +513,24 @@ class S3Storage:
                     'PartNumber': part_number,
                     'ETag': part['ETag']
                 })
+                buffer.clear()
             
             # Complete multipart upload
             self.s3_client.complete_multipart_upload(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                UploadId=mpu['UploadId'],
+                UploadId=upload_id,
                 MultipartUpload={'Parts': parts}
             )
+            upload_state["completed"] = True
             
             self.logger.info(f"Successfully uploaded data to s3://{self.bucket_name}/{s3_key}")
             return s3_key
             
         except ClientError as e:
             # Abort multipart upload on error
-            if 'UploadId' in locals():
-                try:
-                    self.s3_client.abort_multipart_upload(
-                        Bucket=self.bucket_name,
-                        Key=s3_key,
-                        UploadId=mpu['UploadId']
-                    )
-                except Exception as abort_error:
-                    self.logger.error(f"Failed to abort multipart upload: {str(abort_error)}")
+            if upload_state.get("upload_id"):
+                self.abort_multipart_upload(upload_state)
             
             self.logger.error(f"Error streaming data to S3: {str(e)}")
             raise
@@ -524,6 +538,60 @@ class S3Storage:
             self.logger.error(f"Unexpected error during S3 upload: {str(e)}")
             raise
     
+    def check_multipart_upload(self, upload_state: Dict[str, Any]) -> bool:
+        """
+        Check whether a multipart upload saved in a checkpoint can be continued.
+        
+        Args:
+            upload_state: Upload state filled in by stream_processed_text_data
+            
+        Returns:
+            bool: True if the upload is still open and holds every recorded part
+        """
+        try:
+            uploaded = {}
+            paginator = self.s3_client.get_paginator('list_parts')
+            for page in paginator.paginate(Bucket=self.bucket_name, Key=upload_state["key"],
+                                           UploadId=upload_state["upload_id"]):
+                for part in page.get('Parts', []):
+                    uploaded[part['PartNumber']] = part['ETag']
+        except ClientError as e:
+            self.logger.warning(f"Cannot resume multipart upload {upload_state['upload_id']}: {str(e)}")
+            return False
+        return all(uploaded.get(part['PartNumber']) == part['ETag'] for part in upload_state["parts"])
+    
+    def abort_multipart_upload(self, upload_state: Dict[str, Any]) -> None:
+        """
+        Abort a multipart upload, ignoring failures.
+        
+        Args:
+            upload_state: Upload state filled in by stream_processed_text_data
+        """
+        try:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=upload_state["key"],
+                UploadId=upload_state["upload_id"]
+            )
+        except Exception as abort_error:
+            self.logger.error(f"Failed to abort multipart upload: {str(abort_error)}")
+    
+    @staticmethod
+    def _join_json_array(encoded_items: List[bytes]) -> bytes:
+        """
+        Join already JSON-encoded items into a JSON array.
+        
+        The output is byte-for-byte what json.dumps would produce for the list
+        of decoded items.
+        
+        Args:
+            encoded_items: UTF-8 encoded JSON values
+            
+        Returns:
+            bytes: UTF-8 encoded JSON array
+        """
+        return b"[" + b", ".join(encoded_items) + b"]"
+    
     def check_file_exists(self, key: str) -> bool:
         """
         Check if a file exists in S3.
@@ -41,8 +41,157 @@ USER_AGENTS = [
 ]
 
 REQUEST_DELAY = 1  # Delay between requests in seconds
+REQUEST_BURST = 1  # Requests a host may receive back to back before spacing applies
 MAX_RETRIES = 1    # Maximum number of retries for failed requests
 
+# Retry Settings
+RETRY_BACKOFF_BASE = 1.0  # Upper bound of the first jittered backoff in seconds, doubled per retry
+RETRY_BACKOFF_MAX = 60.0  # Cap on any wait between attempts, including Retry-After
+
+# Circuit Breaker Settings
+CIRCUIT_BREAKER_THRESHOLD = 5       # Consecutive failures that pause a host
+CIRCUIT_BREAKER_COOLDOWN = 30.0     # Seconds a host is paused after its first trip, doubled per trip
+CIRCUIT_BREAKER_MAX_COOLDOWN = 600.0  # Cap on the pause
+CIRCUIT_BREAKER_MAX_TRIPS = 5       # Consecutive trips after which a host is given up
+CIRCUIT_BREAKER_PROBE_TIMEOUT = 60.0  # Seconds before a probe that never reported back is replaced
+
+# Concurrency Settings (can be overridden per website with
+# "max_concurrency" and "per_host_concurrency")
+MAX_CONCURRENT_REQUESTS = 16  # Maximum requests in flight across all hosts
+MAX_REQUESTS_PER_HOST = 4     # Maximum requests in flight to a single host
+
+# Pipeline Settings (fetch -> parse -> NLP -> upload stages joined by bounded queues;
+# override per website with "parse_workers", "nlp_workers" and "pipeline_queue_size")
+PIPELINE_PARSE_WORKERS = 2  # Threads extracting fetched pages
+PIPELINE_NLP_WORKERS = 1    # Threads running NLP (each one past the first loads its own spaCy model)
+PIPELINE_QUEUE_SIZE = 8     # Pages waiting in front of each stage before the stage before it blocks
+
+# Frontier Settings
+FRONTIER_STRATEGY = "bfs"  # "bfs", "dfs" or "priority" (override per website with "frontier")
+FRONTIER_BACKEND = "memory"  # "memory" or "disk" (override per website with "frontier_backend")
+FRONTIER_DIR = "cache/frontier"  # SQLite files of the disk backend
+FRONTIER_HOT_WINDOW = 1000  # URLs per host kept in memory by the disk backend
+FRONTIER_COMMIT_INTERVAL = 10000  # Rows the disk backend writes between commits (bounds its write-ahead log)
+
+# Visited Set Settings
+VISITED_SET = "exact"  # "exact" or "bloom" (compact, probabilistic; override per website with "visited_set")
+VISITED_SET_CAPACITY = 1000000  # URLs the first Bloom filter is sized for (it grows beyond that)
+VISITED_SET_FALSE_POSITIVE_RATE = 0.001  # Target false positive rate of the Bloom filter
+
+# Sitemap Settings
+USE_SITEMAPS = True  # Seed the frontier from sitemaps (override per website with "sitemaps")
+SITEMAP_MAX_URLS = 10000  # Seeds taken from sitemaps, most recently modified first (at most page_limit)
+SITEMAP_MAX_SITEMAPS = 50  # Sitemap files read per website, including those listed in indexes
+SITEMAP_MAX_ENTRIES = 100000  # Page entries scanned per website before seeding stops reading sitemaps
+SITEMAP_MAX_BYTES = 52428800  # Bytes read per sitemap (the protocol's own 50MB limit)
+
+# Crawler Trap Settings (override per website with a "trap_detection" dict)
+TRAP_DETECTION_RULES = {
+    "enabled": True,
+    "max_path_depth": 12,         # Most path segments a URL may have
+    "max_segment_repeats": 2,     # Most times one path segment may occur in a URL
+    "max_query_variants": 50,     # Most distinct query strings crawled per path
+    "min_siblings": 5,            # Most recent pages of a URL space its content is judged by
+    "duplicate_ratio": 0.8,       # Share of those pages near-identical to a sibling that marks a trap
+    "simhash_distance": 3         # Most differing fingerprint bits (of 64) between near-identical pages
+}
+
+# URL Template Settings (per website: "url_templates" maps templates such as
+# "/news/<slug>" to settings, "url_template_default" applies to learned templates)
+URL_TEMPLATE_MIN_VARIANTS = 10  # Distinct leaf values of a path position before they become a variable
+URL_TEMPLATE_DEFAULT = {
+    "budget": None,     # Most URLs of a template crawled (None: no limit)
+    "share": None,      # Most URLs of a template crawled as a fraction of page_limit (None: no limit)
+    "sample_rate": 1.0  # Fraction of a template's URLs crawled at all
+}
+
+# Focused Crawl Settings (per website: "focused" enables it, "focus_keywords"
+# sets the topic, which defaults to NEWS_KEYWORDS)
+FOCUSED_CRAWL = False  # Crawl the links most relevant to the topic first (implies the "priority" frontier)
+FOCUSED_CRAWL_WEIGHTS = {
+    "anchor": 0.4,   # Anchor text of the link
+    "context": 0.2,  # Text around the link
+    "url": 0.25,     # Words of the link's URL
+    "parent": 0.15   # Keywords of the page linking to it
+}
+FOCUSED_CRAWL_CONTEXT_CHARS = 300  # Characters of text around a link that are scored
+
+# Checkpoint Settings
+CHECKPOINT_DIR = "cache/checkpoints"  # One directory per website
+CHECKPOINT_INTERVAL = 100  # Pages handled between checkpoints, 0 disables (override per website with "checkpoint_interval")
+RESUME = False  # Resume each website from its last checkpoint (set by --resume)
+
+# URL Canonicalization Settings (override individual rules per website with "canonicalization")
+CANONICAL_URL_RULES = {
+    "strip_fragment": True,  # Drop #fragments
+    "sort_query": True,  # Order query parameters by name
+    # Query and path parameters dropped (shell-style patterns, case-insensitive)
+    "drop_query_params": [
+        "utm_*", "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga",
+        "sessionid", "session_id", "sid", "jsessionid", "phpsessid", "aspsessionid*", "cfid", "cftoken"
+    ],
+    "trailing_slash": "strip",  # "strip", "add" or "keep"
+    "lowercase_path": False,  # Treat paths as case-insensitive
+    "index_files": ["index.html", "index.htm", "index.php", "default.aspx"],  # Reduced to their directory
+    "honor_rel_canonical": True  # Record pages under their <link rel="canonical"> URL
+}
+
+# Transport Settings (one transport and its connection pools are shared by all crawlers)
+HTTP_TRANSPORT = "auto"  # "requests" (HTTP/1.1), "http2" (needs httpx[http2]) or "auto"
+TRANSPORT_MAX_HOSTS = 64  # Hosts whose keep-alive pools are kept open at once
+
+# HTML Parser Settings
+HTML_PARSER = "auto"  # "html.parser", "lxml", "selectolax" or "auto" (the fastest installed; override per website with "parser")
+
+# Main Content Settings (text sent to NLP; override per website with "main_content")
+MAIN_CONTENT_EXTRACTION = True  # Send only the main content of pages, without boilerplate, to NLP
+MAIN_CONTENT_MIN_WORDS = 25     # Fewer words of main content than this and the whole page text is used
+
+# Download Settings
+MAX_PAGE_BYTES = 5 * 1024 * 1024  # Maximum bytes read per page (override per website with "max_page_bytes")
+DOWNLOAD_CHUNK_SIZE = 64 * 1024   # Bytes read per chunk when streaming a page
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+NON_HTML_EXTENSIONS = frozenset([
+    ".pdf", ".zip", ".gz", ".tgz", ".tar", ".rar", ".7z", ".bz2", ".xz",
+    ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico", ".bmp", ".tif", ".tiff",
+    ".mp3", ".mp4", ".m4a", ".avi", ".mov", ".wmv", ".webm", ".ogg", ".wav", ".flac",
+    ".exe", ".dmg", ".iso", ".bin", ".msi", ".apk", ".deb", ".rpm",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".odt", ".csv", ".json", ".xml",
+    ".css", ".js", ".woff", ".woff2", ".ttf", ".eot", ".epub", ".mobi", ".txt"
+])
+
+# Streaming Extraction Settings (pages past the threshold are tokenized while they
+# download instead of being held in memory; override per website with
+# "stream_threshold", 0 to always buffer, and "stream_max_page_bytes")
+STREAM_THRESHOLD_BYTES = 1024 * 1024        # Page size from which the static crawler streams
+STREAM_MAX_PAGE_BYTES = 64 * 1024 * 1024    # Maximum bytes read per streamed page
+STREAM_TEXT_CHUNK_CHARS = 64 * 1024         # Characters of page text emitted per chunk
+STREAM_MAX_TEXT_CHARS = 1000000             # Characters of text kept per streamed page
+STREAM_MAX_BUFFER_CHARS = 1024 * 1024       # Longest unfinished token buffered by the tokenizer
+
+# robots.txt Settings
+ROBOTS_USER_AGENT = "*"          # User agent token matched against robots.txt groups
+ROBOTS_CACHE_DIR = "cache/robots"  # On-disk cache of compiled robots.txt rules
+ROBOTS_CACHE_TTL = 24 * 60 * 60  # Seconds a fetched robots.txt stays valid
+ROBOTS_ERROR_TTL = 5 * 60        # Seconds to wait before retrying an unreachable robots.txt
+
+# Conditional Re-crawl Settings
+VALIDATOR_CACHE_PATH = "cache/validators.db"  # ETag/Last-Modified store for re-crawls
+VALIDATOR_MAX_HEURISTIC_LIFETIME = 24 * 60 * 60  # Cap on freshness guessed from Last-Modified
+
+# Revisit Settings
+REVISIT_SCHEDULING = True  # Re-fetch only known pages likely to have changed (override per website with "revisit_scheduling")
+REVISIT_INDEX_PATH = "cache/revisit.db"  # Change history of crawled pages
+REVISIT_BUDGET = None  # Known pages re-fetched per run (None: the website's page_limit; override with "revisit_budget")
+REVISIT_MIN_CHANGE_PROBABILITY = 0.5  # Lowest estimated probability of a change worth a re-fetch
+REVISIT_DEFAULT_INTERVAL = 24 * 60 * 60  # Expected seconds between changes of a page seen only once
+REVISIT_MAX_INTERVAL = 30 * 24 * 60 * 60  # Pages never seen changing are still assumed to change this often
+
+# Record/Replay Settings
+FETCH_MODE = "live"    # "live", "record" (also write WARC archives) or "replay" (serve from archives only)
+WARC_DIR = "cache/warc"  # Archives are kept in one subdirectory per website
+REPLAY_OUTPUT_DIR = "cache/replay"  # Replayed crawls write their results here instead of S3
+
 # Logging Settings
 LOG_LEVEL = "INFO"
 LOG_DIR = "logs"
@@ -0,0 +1,141 @@
+"""
+Cheap character encoding detection for downloaded HTML.
+"""
+import codecs
+import re
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Only the start of the document is searched for a <meta> charset declaration
+META_SNIFF_BYTES = 4096
+
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)",
+    re.IGNORECASE
+)
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """
+    Resolve an encoding label to a Python codec name.
+
+    Args:
+        name: Encoding label from a header or meta tag
+
+    Returns:
+        Optional[str]: Codec name or None if the label is unknown
+    """
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().lower()).name
+    except LookupError:
+        return None
+
+
+def _get_declared_encoding(body: bytes, content_type: Optional[str]) -> Optional[str]:
+    """
+    Find the encoding declared by a byte order mark, the Content-Type header or a <meta> tag.
+
+    Args:
+        body: Raw document bytes
+        content_type: Content-Type header value (optional)
+
+    Returns:
+        Optional[str]: Codec name or None if nothing is declared
+    """
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding
+
+    if content_type:
+        match = _HEADER_CHARSET_RE.search(content_type)
+        encoding = _normalize_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding
+
+    match = _META_CHARSET_RE.search(body, 0, META_SNIFF_BYTES)
+    return _normalize_encoding(match.group(1).decode("ascii", "ignore")) if match else None
+
+
+def decode_html(body: bytes, content_type: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Decode an HTML document exactly once, without statistical encoding guessing.
+
+    A byte order mark wins, then the Content-Type charset, then a <meta>
+    charset in the first few KB. Without any declaration the body is decoded
+    as UTF-8 if valid, otherwise as Windows-1252.
+
+    Args:
+        body: Raw document bytes
+        content_type: Content-Type header value (optional)
+
+    Returns:
+        Tuple[str, str]: Decoded text and the codec name used
+    """
+    encoding = _get_declared_encoding(body, content_type)
+    if encoding:
+        return body.decode(encoding, errors="replace"), encoding
+
+    try:
+        return body.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return body.decode("cp1252", errors="replace"), "cp1252"
+
+
+def iter_decoded(chunks: Iterable[bytes], content_type: Optional[str] = None) -> Tuple[str, Iterator[str]]:
+    """
+    Decode an HTML document incrementally as its bytes arrive.
+
+    The encoding is chosen like decode_html's from the first few KB only:
+    without a declaration, UTF-8 is used unless those bytes are not valid
+    UTF-8, in which case Windows-1252 is used. Later invalid bytes are replaced.
+
+    Args:
+        chunks: Raw document bytes in pieces
+        content_type: Content-Type header value (optional)
+
+    Returns:
+        Tuple[str, Iterator[str]]: Codec name and the decoded text in pieces
+    """
+    chunks = iter(chunks)
+    head = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= META_SNIFF_BYTES:
+            break
+    head = b"".join(head)
+
+    encoding = _get_declared_encoding(head, content_type)
+    if not encoding:
+        try:
+            # A character cut off at the end of the head does not count
+            codecs.getincrementaldecoder("utf-8")().decode(head)
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            encoding = "cp1252"
+
+    def _decode() -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        text = decoder.decode(head)
+        if text:
+            yield text
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+    return encoding, _decode()
@@ -1,7 +1,9 @@
 import spacy
 import hashlib
-from typing import Dict, List, Set, Any, Generator
+import threading
+from typing import Dict, List, Set, Any, Generator, Optional, Tuple
 from collections import defaultdict
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 import gc
@@ -27,17 +29,47 @@ class TextProcessor:
         self.content_hashes: Set[str] = set()
         self.max_hashes = 10000  # Increased from 1000 to allow more unique content
         self.similarity_threshold = 0.95  # Increased from 0.85 to be less strict
+        self._hashes_lock = threading.Lock()
+        
+        # Neither the spaCy pipeline nor the vectorizer may be used by two
+        # threads at once, so each concurrent call of process_text borrows a
+        # pair of its own; extra pairs are created on demand and kept
+        self._idle_models: List[Tuple[Any, TfidfVectorizer]] = [(self.nlp, self.tfidf)]
+        self._models_lock = threading.Lock()
     
     def _cleanup_memory(self):
         """Force garbage collection to free memory."""
         gc.collect()
     
-    def extract_entities(self, text: str) -> Dict[str, List[str]]:
+    def _acquire_models(self) -> Tuple[Any, TfidfVectorizer]:
+        """
+        Borrow a spaCy pipeline and TF-IDF vectorizer no other thread is using.
+        
+        Returns:
+            Tuple[Any, TfidfVectorizer]: spaCy pipeline and vectorizer
+        """
+        with self._models_lock:
+            if self._idle_models:
+                return self._idle_models.pop()
+        return spacy.load("en_core_web_sm", disable=['parser', 'textcat']), clone(self.tfidf)
+    
+    def _release_models(self, models: Tuple[Any, TfidfVectorizer]) -> None:
+        """
+        Return a borrowed spaCy pipeline and vectorizer.
+        
+        Args:
+            models: Pair from _acquire_models
+        """
+        with self._models_lock:
+            self._idle_models.append(models)
+    
+    def extract_entities(self, text: str, nlp: Optional[Any] = None) -> Dict[str, List[str]]:
         """
         Extract named entities from text using spaCy.
         
         Args:
             text: Text to process
+            nlp: spaCy pipeline to use (default: the processor's own)
             
         Returns:
             Dict[str, List[str]]: Dictionary of entity types and their values
@@ -45,10 +77,11 @@ class TextProcessor:
         # Process text in chunks to save memory
         chunk_size = 100000  # Process 100KB at a time
         entities = defaultdict(list)
+        nlp = nlp or self.nlp
         
         for i in range(0, len(text), chunk_size):
             chunk = text[i:i + chunk_size]
-            doc = self.nlp(chunk)
+            doc = nlp(chunk)
             
             for ent in doc.ents:
                 entities[ent.label_].append(ent.text)
@@ -59,17 +92,19 @@ class TextProcessor:
         
         return dict(entities)
     
-    def extract_keywords(self, text: str, top_n: int = 10) -> List[str]:
+    def extract_keywords(self, text: str, top_n: int = 10, tfidf: Optional[TfidfVectorizer] = None) -> List[str]:
         """
         Extract keywords using TF-IDF with memory optimization.
         
         Args:
             text: Text to process
             top_n: Number of top keywords to return
+            tfidf: Vectorizer to use (default: the processor's own)
             
         Returns:
             List[str]: List of top keywords
         """
+        tfidf = tfidf or self.tfidf
         try:
             # Process text in chunks
             chunk_size = 100000
@@ -79,10 +114,10 @@ class TextProcessor:
                 chunk = text[i:i + chunk_size]
                 
                 # Fit and transform the chunk
-                tfidf_matrix = self.tfidf.fit_transform([chunk])
+                tfidf_matrix = tfidf.fit_transform([chunk])
                 
                 # Get feature names (words)
-                feature_names = self.tfidf.get_feature_names_out()
+                feature_names = tfidf.get_feature_names_out()
                 
                 # Get top keywords
                 scores = tfidf_matrix.toarray()[0]
@@ -142,38 +177,58 @@ class TextProcessor:
         Returns:
             bool: True if duplicate, False otherwise
         """
-        content_hash = self.calculate_content_hash(text)
-        
-        # Implement LRU-like behavior for hash storage
-        if len(self.content_hashes) >= self.max_hashes:
-            # Remove oldest hashes if we exceed the limit
-            self.content_hashes = set(list(self.content_hashes)[-self.max_hashes:])
-        
-        if content_hash in self.content_hashes:
-            return True
+        return self._is_duplicate_hash(self.calculate_content_hash(text))
+    
+    def _is_duplicate_hash(self, content_hash: str) -> bool:
+        """
+        Check if a content hash has been seen before and remember it.
         
-        self.content_hashes.add(content_hash)
-        return False
+        Args:
+            content_hash: Hash from calculate_content_hash
+            
+        Returns:
+            bool: True if duplicate, False otherwise
+        """
+        with self._hashes_lock:
+            # Implement LRU-like behavior for hash storage
+            if len(self.content_hashes) >= self.max_hashes:
+                # Remove oldest hashes if we exceed the limit
+                self.content_hashes = set(list(self.content_hashes)[-self.max_hashes:])
+            
+            if content_hash in self.content_hashes:
+                return True
+            
+            self.content_hashes.add(content_hash)
+            return False
     
     def process_text(self, text: str) -> Dict[str, Any]:
         """
         Process text with NER, keyword extraction, and deduplication.
         
+        Safe to call from several threads at once.
+        
         Args:
             text: Text to process
             
         Returns:
             Dict[str, Any]: Processed text data
         """
+        # Hash once and reuse it for both deduplication and the result
+        content_hash = self.calculate_content_hash(text)
+        
         # Check for duplicates
-        if self.is_duplicate(text):
+        if self._is_duplicate_hash(content_hash):
             return None
         
-        # Extract entities
-        entities = self.extract_entities(text)
-        
-        # Extract keywords
-        keywords = self.extract_keywords(text)
+        nlp, tfidf = models = self._acquire_models()
+        try:
+            # Extract entities
+            entities = self.extract_entities(text, nlp)
+            
+            # Extract keywords
+            keywords = self.extract_keywords(text, tfidf=tfidf)
+        finally:
+            self._release_models(models)
         
         # Clean up memory
         self._cleanup_memory()
@@ -181,5 +236,5 @@ class TextProcessor:
         return {
             "entities": entities,
             "keywords": keywords,
-            "content_hash": self.calculate_content_hash(text)
+            "content_hash": content_hash
         } 
\ No newline at end of file
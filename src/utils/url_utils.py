@@ -0,0 +1,134 @@
+"""
+URL helper functions shared by the crawler components.
+"""
+import fnmatch
+import posixpath
+import re
+import urllib.parse
+from typing import Any, Dict, Optional
+
+import src.utils.config as config
+
+
+def get_host(url: str) -> str:
+    """
+    Get the host key for a URL.
+
+    Args:
+        url: URL to inspect
+
+    Returns:
+        str: Lowercased network location (host and optional port)
+    """
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+# Characters that never need percent-encoding (RFC 3986 section 2.3)
+_UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+_PERCENT_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def _normalize_escapes(text: str) -> str:
+    """Decode percent-escapes of unreserved characters and uppercase the others."""
+    def _replace(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in _UNRESERVED else "%" + match.group(1).upper()
+
+    return _PERCENT_ESCAPE.sub(_replace, text)
+
+
+class URLCanonicalizer:
+    """
+    Rewrites URLs to one canonical form so that variants of a page are fetched once.
+
+    Scheme and host are always lowercased, default ports dropped, percent-escapes
+    normalized and dot segments resolved. Everything else is controlled by rules
+    (see config.CANONICAL_URL_RULES), which a website can override key by key.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the canonicalizer.
+
+        Args:
+            rules: Rules overriding config.CANONICAL_URL_RULES
+
+        Raises:
+            ValueError: If the trailing slash rule is unknown
+        """
+        self.rules = {**config.CANONICAL_URL_RULES, **(rules or {})}
+        if self.rules["trailing_slash"] not in ("strip", "add", "keep"):
+            raise ValueError(f"Unknown trailing slash rule: {self.rules['trailing_slash']}")
+        self._drop_params = [pattern.lower() for pattern in self.rules["drop_query_params"]]
+        self._index_files = set(self.rules["index_files"])
+
+    def _drops(self, name: str) -> bool:
+        """Check whether a query or path parameter is dropped."""
+        name = name.lower()
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self._drop_params)
+
+    def _canonical_path(self, path: str) -> str:
+        """Apply the path rules."""
+        # Session ids are also passed as path parameters (/page;jsessionid=...)
+        segments = []
+        for segment in path.split("/"):
+            name, *params = segment.split(";")
+            params = [param for param in params if not self._drops(param.split("=", 1)[0])]
+            segments.append(";".join([name] + params))
+        path = posixpath.normpath("/".join(segments)) + ("/" if path.endswith("/") else "")
+        path = "/" + path.lstrip("/") if path not in ("/", "//") else "/"
+        path = _normalize_escapes(path)
+
+        if self.rules["lowercase_path"]:
+            path = path.lower()
+        head, _, last = path.rpartition("/")
+        if last in self._index_files:
+            path = head + "/"
+        if path != "/":
+            if self.rules["trailing_slash"] == "strip":
+                path = path.rstrip("/")
+            elif self.rules["trailing_slash"] == "add" and not path.endswith("/") and "." not in last:
+                path += "/"
+        return path
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Get the canonical form of an absolute URL.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            str: Canonical URL (the input unchanged if it is not http or https)
+        """
+        parts = urllib.parse.urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        if scheme not in _DEFAULT_PORTS:
+            return url
+
+        netloc = (parts.hostname or "").rstrip(".")
+        if ":" in netloc:
+            netloc = f"[{netloc}]"
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        if port is not None and str(port) != _DEFAULT_PORTS[scheme]:
+            netloc = f"{netloc}:{port}"
+
+        query = [
+            (name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+            if not self._drops(name)
+        ]
+        if self.rules["sort_query"]:
+            query.sort()
+        fragment = "" if self.rules["strip_fragment"] else parts.fragment
+
+        return urllib.parse.urlunsplit((
+            scheme,
+            netloc,
+            self._canonical_path(parts.path or "/"),
+            urllib.parse.urlencode(query, quote_via=urllib.parse.quote),
+            fragment
+        ))
@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.bandwidth import BandwidthMeter
+
+
+class TestBandwidthMeter(unittest.TestCase):
+    """Tests for the BandwidthMeter class."""
+
+    def test_totals_by_host_and_content_type(self):
+        """Test that bytes are summed per run, host and content type."""
+        meter = BandwidthMeter()
+        meter.record("a.com", "text/html", 100, 400, "br")
+        meter.record("a.com", "text/html", 50, 200, "gzip")
+        meter.record("b.com", "text/plain", 30, 30)
+
+        stats = meter.get_stats()
+
+        self.assertEqual(stats["total"]["wire_bytes"], 180)
+        self.assertEqual(stats["total"]["decoded_bytes"], 630)
+        self.assertEqual(stats["hosts"]["a.com"]["responses"], 2)
+        self.assertEqual(stats["hosts"]["a.com"]["compression_ratio"], 0.25)
+        self.assertEqual(stats["hosts"]["a.com"]["encodings"], {"br": 1, "gzip": 1})
+        self.assertEqual(stats["content_types"]["text/plain"]["encodings"], {"identity": 1})
+
+    def test_empty(self):
+        """Test that an unused meter reports zeros."""
+        stats = BandwidthMeter().get_stats()
+
+        self.assertEqual(stats["total"]["wire_bytes"], 0)
+        self.assertIsNone(stats["total"]["compression_ratio"])
+        self.assertEqual(stats["hosts"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.checkpoint import CheckpointStore, PageSpool, dump_url_set, load_url_set
+from src.crawlers.disk_frontier import DiskFrontier, DiskURLSet
+from src.crawlers.frontier import Frontier
+from src.crawlers.url_set import BloomURLSet
+
+
+class TestCheckpointStore(unittest.TestCase):
+    """Tests for the CheckpointStore and PageSpool classes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(os.path.join(self.tmp_dir.name, "site"))
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def test_save_and_load(self):
+        """Test that a saved checkpoint replaces the previous one."""
+        self.assertIsNone(self.store.load())
+
+        self.store.save({"pages_processed": 1})
+        self.store.save({"pages_processed": 2})
+
+        self.assertEqual(self.store.load()["pages_processed"], 2)
+        self.assertEqual(os.listdir(self.store.directory), ["checkpoint.json"])
+
+    def test_unusable_checkpoint_is_ignored(self):
+        """Test that corrupt checkpoints and other versions are not loaded."""
+        os.makedirs(self.store.directory)
+        with open(self.store.path, "w") as f:
+            json.dump({"version": 0}, f)
+        self.assertIsNone(self.store.load())
+
+        with open(self.store.path, "w") as f:
+            f.write('{"version": 1, "trunc')
+        self.assertIsNone(self.store.load())
+
+    def test_spool_resumes_at_offset(self):
+        """Test that pages spooled after a checkpoint are dropped on resume."""
+        spool = PageSpool(self.store.spool_path)
+        spool.append({"url": "https://a.com/1"})
+        offset = spool.offset()
+        spool.append({"url": "https://a.com/2"})
+        spool.close()
+
+        spool = PageSpool(self.store.spool_path, offset)
+        spool.append({"url": "https://a.com/3"})
+
+        self.assertEqual([page["url"] for page in spool.load()], ["https://a.com/1", "https://a.com/3"])
+        spool.close()
+        self.store.clear()
+        self.assertFalse(os.path.exists(self.store.directory))
+
+
+class TestCrawlStateRoundTrip(unittest.TestCase):
+    """Tests for saving and restoring frontiers and URL sets."""
+
+    def _round_trip(self, state):
+        """Pass a state through JSON like a checkpoint does."""
+        return json.loads(json.dumps(state))
+
+    def test_frontier_round_trip(self):
+        """Test that a restored frontier continues in the same order."""
+        for strategy in ("bfs", "dfs", "priority"):
+            frontier = Frontier(strategy)
+            for i in range(6):
+                frontier.push(f"https://h{i % 2}.com/{i}", priority=i % 3)
+            frontier.pop()
+
+            state = self._round_trip(frontier.get_state())
+            restored = Frontier.from_state(state, seen=load_url_set(state["seen"]))
+
+            self.assertFalse(restored.push("https://h0.com/0"))
+            restored.push("https://h0.com/new")
+            frontier.push("https://h0.com/new")
+            self.assertEqual([restored.pop() for _ in range(6)], [frontier.pop() for _ in range(6)], strategy)
+
+    def test_url_sets_round_trip(self):
+        """Test that exact and Bloom URL sets survive a checkpoint."""
+        bloom = BloomURLSet(capacity=10, false_positive_rate=0.01)
+        bloom.update(f"https://a.com/{i}" for i in range(25))
+
+        exact = load_url_set(self._round_trip(dump_url_set({"https://a.com/1"})))
+        restored = load_url_set(self._round_trip(dump_url_set(bloom)))
+
+        self.assertEqual(exact, {"https://a.com/1"})
+        self.assertEqual(len(restored), 25)
+        self.assertTrue(all(f"https://a.com/{i}" in restored for i in range(25)))
+
+    def test_disk_state_rolls_back_to_last_checkpoint(self):
+        """Test that disk-backed stores reopen as of their last flush."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            frontier = DiskFrontier(os.path.join(tmp_dir, "frontier.db"), "bfs", hot_window=2)
+            visited = DiskURLSet(os.path.join(tmp_dir, "visited.db"), hot_window=2)
+            frontier.extend(f"https://a.com/{i}" for i in range(4))
+            frontier_state = frontier.get_state()
+            visited_state = dump_url_set(visited)
+
+            # Work done after the checkpoint is lost in a crash
+            visited.add(frontier.pop())
+            frontier.push("https://a.com/late")
+            frontier.close(flush=False)
+            visited.close(flush=False)
+
+            frontier = DiskFrontier(frontier_state["path"], frontier_state["strategy"], reset=False)
+            visited = load_url_set(visited_state)
+
+            self.assertEqual(len(visited), 0)
+            self.assertNotIn("https://a.com/late", frontier)
+            self.assertEqual(frontier.pop(), "https://a.com/0")
+            self.assertEqual(len(frontier), 3)
+            frontier.close()
+            visited.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import json
 import os
 import sys
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import requests
@@ -11,6 +15,11 @@ from src.crawlers.base_crawler import BaseCrawler
 from src.crawlers.static.static_crawler import StaticCrawler
 from src.crawlers.dynamic.dynamic_crawler import DynamicCrawler
 from src.crawlers.crawler_factory import CrawlerFactory
+from src.crawlers.frontier import Frontier
+from src.crawlers.retry_policy import CircuitBreaker, RetryPolicy
+from src.crawlers.revisit import RevisitIndex
+from src.crawlers.validator_cache import ValidatorStore
+from src.crawlers.warc import WarcArchive, WarcWriter
 
 
 class MockResponse:
@@ -45,9 +54,9 @@ class TestBaseCrawler(unittest.TestCase):
             "dynamic": False
         }
         
-        # Create a mock session
+        # Create a mock transport
         self.mock_session = MagicMock()
-        self.patcher = patch('requests.Session', return_value=self.mock_session)
+        self.patcher = patch('src.crawlers.base_crawler.get_transport', return_value=self.mock_session)
         self.patcher.start()
         self.crawler = self.crawler_cls(self.website_config)
     
@@ -69,6 +78,9 @@ class TestBaseCrawler(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.text = "test content"
         mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
+        mock_response.encoding = "utf-8"
+        mock_response.iter_content.return_value = [b"test ", b"content"]
         self.mock_session.get.return_value = mock_response
         
         # Call the method
@@ -89,6 +101,196 @@ class TestBaseCrawler(unittest.TestCase):
         # Verify the result is None
         self.assertIsNone(result)
     
+    def test_fetch_page_not_modified(self):
+        """Test that a 304 response is reported as unchanged with the stored links."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = ValidatorStore(os.path.join(tmp_dir, "validators.db"))
+            self.crawler._validator_store = store
+            url = "https://example.com/page"
+            store.update(self.crawler._get_url_hash(url), url, {"ETag": '"v1"'}, "hash", ["https://example.com/a"])
+            
+            mock_response = MagicMock()
+            mock_response.status_code = 304
+            mock_response.headers = {}
+            self.mock_session.get.return_value = mock_response
+            
+            result = self.crawler.fetch_page(url, conditional=True)
+            store.close()
+        
+        self.assertTrue(result["not_modified"])
+        self.assertIsNone(result["html"])
+        self.assertEqual(result["links"], ["https://example.com/a"])
+        self.assertEqual(self.mock_session.get.call_args[1]["headers"],
+                         {"If-None-Match": '"v1"', "User-Agent": self.crawler.user_agent})
+    
+    def test_fetch_page_defers_revisit(self):
+        """Test that known pages not due for a revisit are served without a request."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = ValidatorStore(os.path.join(tmp_dir, "validators.db"))
+            index = RevisitIndex(os.path.join(tmp_dir, "revisit.db"))
+            self.crawler._validator_store = store
+            self.crawler._revisit_index = index
+            url = "https://example.com/page"
+            store.update(self.crawler._get_url_hash(url), url, {"ETag": '"v1"'}, "hash", ["https://example.com/a"])
+            index.record(self.crawler._get_url_hash(url), url, "hash")
+        
+            self.assertEqual(self.crawler.select_revisits(10), [])
+            result = self.crawler.fetch_page(url, conditional=True)
+            store.close()
+            index.close()
+        
+        self.assertTrue(result["not_modified"])
+        self.assertTrue(result["cached"])
+        self.assertEqual(result["links"], ["https://example.com/a"])
+        self.assertEqual(self.crawler.metrics["revisits_deferred"], 1)
+        self.mock_session.get.assert_not_called()
+    
+    def test_fetch_page_skips_non_html_extension(self):
+        """Test that obvious non-HTML URLs are skipped without a request."""
+        result = self.crawler.fetch_page("https://example.com/report.PDF")
+        
+        self.assertEqual(result["skipped"], "non-HTML extension")
+        self.mock_session.get.assert_not_called()
+    
+    def test_fetch_page_skips_non_html_content_type(self):
+        """Test that non-HTML responses are skipped before the body is read."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "application/pdf"}
+        self.mock_session.get.return_value = mock_response
+        
+        result = self.crawler.fetch_page("https://example.com/download")
+        
+        self.assertEqual(result["skipped"], "content type application/pdf")
+        mock_response.iter_content.assert_not_called()
+        mock_response.close.assert_called_once()
+    
+    def test_fetch_page_truncates_at_byte_limit(self):
+        """Test that bodies are cut off at the page byte limit."""
+        self.crawler.max_page_bytes = 8
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "text/html"}
+        mock_response.encoding = "utf-8"
+        mock_response.iter_content.return_value = [b"<html>", b"<body>", b"</body>"]
+        self.mock_session.get.return_value = mock_response
+        
+        result = self.crawler.fetch_page("https://example.com/big")
+        
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["html"], "<html><b")
+    
+    def test_fetch_page_retries_server_errors(self):
+        """Test that 5xx responses are retried and counted as failed attempts."""
+        self.crawler.retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+        self.crawler.circuit_breaker = CircuitBreaker(failure_threshold=5)
+        error_response = MagicMock()
+        error_response.status_code = 503
+        error_response.headers = {}
+        ok_response = MagicMock()
+        ok_response.status_code = 200
+        ok_response.headers = {"Content-Type": "text/html"}
+        ok_response.iter_content.return_value = [b"ok"]
+        self.mock_session.get.side_effect = [error_response, ok_response]
+        
+        result = self.crawler.fetch_page("https://example.com/flaky")
+        
+        self.assertEqual(result["html"], "ok")
+        self.assertEqual(self.crawler.metrics["failed_attempts"], 1)
+        self.assertNotIn("failed_crawls", self.crawler.metrics)
+    
+    def test_fetch_page_does_not_retry_client_errors(self):
+        """Test that a 404 fails the URL without retrying."""
+        self.crawler.retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_response.headers = {}
+        self.mock_session.get.return_value = mock_response
+        
+        result = self.crawler.fetch_page("https://example.com/missing")
+        
+        self.assertIsNone(result)
+        self.mock_session.get.assert_called_once()
+        self.assertEqual(self.crawler.metrics["failed_crawls"], 1)
+    
+    def test_fetch_page_circuit_breaker(self):
+        """Test that a failing host is paused once the breaker trips."""
+        self.crawler.circuit_breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+        self.mock_session.get.side_effect = requests.exceptions.ConnectionError("down")
+        
+        for _ in range(3):
+            self.assertIsNone(self.crawler.fetch_page("https://example.com/page"))
+        
+        self.assertEqual(self.mock_session.get.call_count, 2)
+        self.assertEqual(self.crawler.metrics["breaker_trips"], 1)
+        self.assertEqual(self.crawler.metrics["failed_crawls"], 3)
+    
+    def test_fetch_page_probe_resolved_on_permanent_error(self):
+        """Test that a probe failing with a malformed request does not block the host."""
+        self.crawler.circuit_breaker = CircuitBreaker(failure_threshold=1, cooldown=0.01)
+        self.crawler.retry_policy = RetryPolicy(max_attempts=1)
+        self.mock_session.get.side_effect = requests.exceptions.ConnectionError("down")
+        self.assertIsNone(self.crawler.fetch_page("https://example.com/page"))
+        time.sleep(0.02)
+        
+        self.mock_session.get.side_effect = requests.exceptions.InvalidURL("bad")
+        self.assertIsNone(self.crawler.fetch_page("https://example.com/bad"))
+        
+        self.assertFalse(self.crawler.circuit_breaker.is_probing("https://example.com/page"))
+        self.assertIsNone(self.crawler.fetch_page("https://example.com/bad"))
+        self.assertEqual(self.mock_session.get.call_count, 3)
+    
+    def test_fetch_page_replay(self):
+        """Test that replay mode serves recorded pages without network requests."""
+        with tempfile.TemporaryDirectory() as tmp_dir, patch("src.utils.config.WARC_DIR", tmp_dir):
+            WarcWriter(os.path.join(tmp_dir, "test_website", "rec.warc.gz")).write_exchange(
+                "https://example.com/page", [], 200, "OK", [("Content-Type", "text/html")], b"<p>recorded</p>"
+            )
+            crawler = self.crawler_cls({**self.website_config, "fetch_mode": "replay"})
+            
+            result = crawler.fetch_page("https://example.com/page")
+            missing = crawler.fetch_page("https://example.com/other")
+        
+        self.assertEqual(result["html"], "<p>recorded</p>")
+        self.assertIsNone(missing)
+        self.mock_session.get.assert_not_called()
+    
+    def test_record_streams_auxiliary_files(self):
+        """Test that record mode archives sitemaps as they are streamed rather than reading them up front."""
+        with tempfile.TemporaryDirectory() as tmp_dir, patch("src.utils.config.WARC_DIR", tmp_dir):
+            crawler = self.crawler_cls({**self.website_config, "fetch_mode": "record"})
+            responses = []
+            for chunks in ([b"<urlset>", b"</urlset>"], [b"<urlset>", b"<url>"]):
+                live_response = MagicMock()
+                live_response.status_code = 200
+                live_response.reason = "OK"
+                live_response.headers = {"Content-Type": "application/xml", "Content-Encoding": "gzip"}
+                live_response.request = None
+                live_response.iter_content.return_value = iter(chunks)
+                responses.append(live_response)
+            self.mock_session.get.side_effect = responses
+            warc_dir = os.path.join(tmp_dir, "test_website")
+            
+            response = crawler._send_request("https://example.com/sitemap.xml", page=False)
+            self.assertFalse(os.path.exists(warc_dir))
+            self.assertEqual(b"".join(response.iter_content(chunk_size=4)), b"<urlset></urlset>")
+            response.close()
+            
+            response = crawler._send_request("https://example.com/big.xml", page=False)
+            self.assertEqual(next(response.iter_content(chunk_size=8)), b"<urlset>")
+            response.close()
+            
+            archive = WarcArchive(warc_dir)
+            complete = archive.get_response("https://example.com/sitemap.xml")
+            truncated = archive.get_response("https://example.com/big.xml")
+        
+        self.assertEqual(complete[3], b"<urlset></urlset>")
+        self.assertIn(("Content-Length", "17"), complete[2])
+        self.assertNotIn(("Content-Encoding", "gzip"), complete[2])
+        self.assertEqual(truncated[3], b"<urlset>")
+        for live_response in responses:
+            live_response.close.assert_called_once()
+    
     def test_get_metadata(self):
         """Test adding metadata to crawled data."""
         crawler = self.crawler_cls(self.website_config)
@@ -113,9 +315,9 @@ class TestStaticCrawler(unittest.TestCase):
             "dynamic": False
         }
         
-        # Create a mock session
+        # Create a mock transport
         self.mock_session = MagicMock()
-        self.patcher = patch('requests.Session', return_value=self.mock_session)
+        self.patcher = patch('src.crawlers.base_crawler.get_transport', return_value=self.mock_session)
         self.patcher.start()
         
         # Initialize the crawler
@@ -153,6 +355,43 @@ class TestStaticCrawler(unittest.TestCase):
         self.assertIn("https://example.com/page2", links)
         self.assertNotIn("https://external.com", links)
     
+    def test_extract_link_contexts(self):
+        """Test extracting links with their anchor text and surrounding text."""
+        crawler = StaticCrawler(self.website_config)
+        html = """
+        <html><body>
+            <p>Port delays hit <a href="/freight">the freight market</a> again.</p>
+            <ul><li><a href="/about" title="About us"></a></li></ul>
+            <a href="https://external.com/shipping">Shipping</a>
+        </body></html>
+        """
+        links = crawler.extract_link_contexts(html, "https://example.com")
+        
+        self.assertEqual(links, [
+            {"url": "https://example.com/freight", "anchor": "the freight market",
+             "context": "Port delays hit the freight market again."},
+            {"url": "https://example.com/about", "anchor": "About us", "context": ""}
+        ])
+    
+    def test_focused_enqueue_orders_by_relevance(self):
+        """Test that a focused crawl queues the most relevant links first."""
+        crawler = StaticCrawler({**self.website_config, "focused": True, "focus_keywords": ["freight", "shipping"]})
+        self.assertEqual(crawler.frontier_strategy, "priority")
+        frontier = Frontier(crawler.frontier_strategy)
+        link_contexts = [
+            {"url": "https://example.com/about", "anchor": "About us", "context": ""},
+            {"url": "https://example.com/news/freight-rates", "anchor": "Freight rates", "context": ""},
+            {"url": "https://example.com/a1", "anchor": "Read more", "context": "Shipping lines add capacity"}
+        ]
+        
+        with patch.object(crawler, "_respect_robots_txt", return_value=True):
+            crawler._enqueue_links([link["url"] for link in link_contexts], frontier,
+                                   crawler._score_links(link_contexts, ["freight"]))
+        
+        self.assertEqual([frontier.pop(), frontier.pop(), frontier.pop()], [
+            "https://example.com/news/freight-rates", "https://example.com/a1", "https://example.com/about"
+        ])
+    
     def test_extract_images(self):
         """Test extracting images from HTML."""
         crawler = StaticCrawler(self.website_config)
@@ -178,6 +417,134 @@ class TestStaticCrawler(unittest.TestCase):
         self.assertEqual(metadata["title"], "Test Page")
         self.assertEqual(metadata["description"], "Test description")
     
+    def test_parse_sends_main_content_to_nlp(self):
+        """Test that only the main content of a page is processed with NLP."""
+        crawler = StaticCrawler(self.website_config)
+        crawler.text_processor.process_text = MagicMock(
+            return_value={"entities": {}, "keywords": [], "content_hash": "hash"}
+        )
+        with open(os.path.join(os.path.dirname(__file__), "fixtures", "html", "boilerplate.html")) as f:
+            html = f.read()
+        
+        page_data = crawler.parse(html)
+        nlp_text = crawler.text_processor.process_text.call_args[0][0]
+        
+        self.assertIn("Port of Rotterdam opened its newest container terminal", nlp_text)
+        self.assertNotIn("cookies", nlp_text)
+        self.assertNotIn("Most read", nlp_text)
+        self.assertIn("Most read", page_data["text"])
+        self.assertEqual(crawler.metrics["main_content_pages"], 1)
+    
+    def test_enqueue_links_canonicalizes(self):
+        """Test that link variants enter the frontier once and are counted as prevented duplicates."""
+        frontier = Frontier("bfs")
+        links = [
+            "https://example.com/a?utm_source=news",
+            "https://example.com/a",
+            "https://example.com/a/#comments",
+            "https://example.com/a?utm_source=news",
+            "https://example.com/b?sid=42"
+        ]
+        
+        with patch.object(self.crawler, "_respect_robots_txt", return_value=True):
+            self.crawler._enqueue_links(links, frontier)
+        
+        self.assertEqual([frontier.pop(), frontier.pop(), frontier.pop()],
+                         ["https://example.com/a", "https://example.com/b", None])
+        self.assertEqual(self.crawler.metrics["duplicates_prevented"], 2)
+    
+    def test_sitemap_seeding_keeps_most_recent(self):
+        """Test that the newest sitemap entries are seeded, wherever they are listed."""
+        self.crawler.page_limit = 3
+        frontier = Frontier("bfs")
+        frontier.push("https://example.com/")
+        index = ("<sitemapindex><sitemap><loc>https://example.com/a.xml</loc></sitemap>"
+                 "<sitemap><loc>https://example.com/b.xml</loc></sitemap></sitemapindex>")
+        urlset = "<urlset>" + "".join(
+            f"<url><loc>https://example.com/a{i}</loc><lastmod>2024-01-0{i + 1}</lastmod></url>" for i in range(5)
+        ) + "</urlset>"
+        bodies = {"https://example.com/sitemap.xml": index, "https://example.com/a.xml": urlset}
+        
+        def fetch(url):
+            return [bodies[url].encode("utf-8")] if url in bodies else None
+        
+        with patch.object(self.crawler, "_fetch_sitemap", side_effect=fetch), \
+                patch.object(self.crawler, "_respect_robots_txt", return_value=True), \
+                patch.object(self.crawler, "_get_robots_rules", return_value=MagicMock(sitemaps=["https://example.com/sitemap.xml"])):
+            self.crawler._seed_from_sitemaps(frontier)
+        
+        self.assertEqual([frontier.pop() for _ in range(4)],
+                         ["https://example.com/", "https://example.com/a4", "https://example.com/a3", None])
+        self.assertEqual(self.crawler.metrics["sitemap_seeds"], 2)
+    
+    def test_crawl_replay_offline(self):
+        """Test that a replayed crawl runs without network or AWS credentials and writes local files."""
+        first_page = b'<html><head><title>Home</title></head><body><a href="/page1">Page 1</a></body></html>'
+        page1 = b"<html><head><title>Page 1</title></head><body><p>Content of page 1</p></body></html>"
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch.multiple("src.utils.config", WARC_DIR=os.path.join(tmp_dir, "warc"),
+                               REPLAY_OUTPUT_DIR=os.path.join(tmp_dir, "replay"),
+                               CHECKPOINT_DIR=os.path.join(tmp_dir, "checkpoints"),
+                               ROBOTS_CACHE_DIR=os.path.join(tmp_dir, "robots"),
+                               REVISIT_INDEX_PATH=os.path.join(tmp_dir, "revisit.db"),
+                               AWS_ACCESS_KEY_ID="", AWS_SECRET_ACCESS_KEY=""), \
+                patch("boto3.client") as boto3_client:
+            writer = WarcWriter(os.path.join(tmp_dir, "warc", "test_website", "rec.warc.gz"))
+            for url, body in [("https://example.com/", first_page), ("https://example.com/page1", page1)]:
+                writer.write_exchange(url, [], 200, "OK", [("Content-Type", "text/html")], body)
+            self.mock_session.get_stats.return_value = {}
+            self.mock_session.accept_encoding = "gzip"
+            crawler = StaticCrawler({**self.website_config, "fetch_mode": "replay"})
+            
+            pages = crawler.crawl()
+            
+            output_dir = os.path.join(tmp_dir, "replay", "test_website")
+            text_files = [name for name in os.listdir(output_dir) if name.endswith("_text.jsonl")]
+            with open(os.path.join(output_dir, text_files[0]), encoding="utf-8") as f:
+                text_data = [json.loads(line) for line in f]
+            outputs = set(os.listdir(output_dir))
+        
+        self.assertEqual([page["url"] for page in pages], ["https://example.com/", "https://example.com/page1"])
+        self.assertEqual([item["url"] for item in text_data], ["https://example.com/", "https://example.com/page1"])
+        self.assertIn("test_website_summary.json", outputs)
+        self.mock_session.get.assert_not_called()
+        boto3_client.assert_not_called()
+    
+    def test_enqueue_links_checks_robots_outside_state_lock(self):
+        """Test that other workers can take the state lock while robots.txt is checked."""
+        lock_free = []
+        
+        def take_state_lock():
+            acquired = self.crawler._state_lock.acquire(timeout=1)
+            if acquired:
+                self.crawler._state_lock.release()
+            lock_free.append(acquired)
+        
+        def respect_robots_txt(url):
+            worker = threading.Thread(target=take_state_lock)
+            worker.start()
+            worker.join()
+            return url != "https://example.com/private"
+        
+        frontier = Frontier("bfs")
+        with patch.object(self.crawler, "_respect_robots_txt", side_effect=respect_robots_txt):
+            self.crawler._enqueue_links(["https://example.com/a", "https://example.com/private"], frontier)
+        
+        self.assertEqual(lock_free, [True, True])
+        self.assertEqual([frontier.pop(), frontier.pop()], ["https://example.com/a", None])
+    
+    def test_extract_canonical_url(self):
+        """Test honoring same-site rel=canonical declarations."""
+        html = '<html><head><link rel="canonical" href="/story?utm_medium=rss"></head></html>'
+        offsite = '<html><head><link rel="canonical" href="https://other.com/story"></head></html>'
+        
+        self.assertEqual(self.crawler.extract_canonical_url(html, "https://example.com/amp/story"),
+                         "https://example.com/story")
+        self.assertEqual(self.crawler.extract_canonical_url(offsite, "https://example.com/story"),
+                         "https://example.com/story")
+        self.assertEqual(self.crawler.extract_canonical_url(self.sample_html, "https://example.com/page1"),
+                         "https://example.com/page1")
+    
     def test_crawl(self):
         """Test crawling a website."""
         # Sample HTML for the first page with links to other pages
@@ -0,0 +1,132 @@
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.disk_frontier import DiskFrontier, DiskURLSet
+from src.crawlers.frontier import Frontier
+
+
+class TestDiskFrontier(unittest.TestCase):
+    """Tests for the DiskFrontier class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "frontier.db")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def test_matches_memory_frontier(self):
+        """Test that a tiny hot window yields the same order as the in-memory frontier."""
+        for strategy in ("bfs", "dfs", "priority"):
+            rng = random.Random(7)
+            memory = Frontier(strategy)
+            disk = DiskFrontier(self.path, strategy, hot_window=3, commit_interval=5)
+            memory_order, disk_order = [], []
+
+            for i in range(600):
+                if rng.random() < 0.6:
+                    url = f"https://h{rng.randint(0, 2)}.com/{rng.randint(0, 300)}"
+                    priority = rng.choice([0.1, 0.5, 0.9])
+                    self.assertEqual(memory.push(url, priority), disk.push(url, priority))
+                else:
+                    memory_order.append(memory.pop())
+                    disk_order.append(disk.pop())
+                self.assertEqual(len(memory), len(disk))
+
+            while memory:
+                memory_order.append(memory.pop())
+                disk_order.append(disk.pop())
+
+            self.assertEqual(disk_order, memory_order, strategy)
+            self.assertIsNone(disk.pop())
+            self.assertLessEqual(disk.get_stats()["in_memory"], 6 * 3)
+            disk.close()
+
+    def test_reopen_after_flush(self):
+        """Test that a flushed frontier can be reopened with its queue and seen-set."""
+        frontier = DiskFrontier(self.path, "bfs", hot_window=2)
+        frontier.extend(f"https://a.com/{i}" for i in range(5))
+        frontier.pop()
+        frontier.close()
+
+        frontier = DiskFrontier(self.path, "bfs", hot_window=2, reset=False)
+
+        self.assertEqual(len(frontier), 4)
+        self.assertIn("https://a.com/0", frontier)
+        self.assertFalse(frontier.push("https://a.com/0"))
+        self.assertEqual([frontier.pop() for _ in range(4)], [f"https://a.com/{i}" for i in range(1, 5)])
+        frontier.close()
+
+    def test_commits_between_flushes(self):
+        """Test that changes are committed without a flush and rolled back on reopen."""
+        frontier = DiskFrontier(self.path, "bfs", hot_window=2, commit_interval=4)
+        frontier.extend(f"https://a.com/{i}" for i in range(3))
+        frontier.pop()
+        frontier.flush()
+
+        frontier.extend(f"https://a.com/{i}" for i in range(3, 20))
+        for _ in range(10):
+            frontier.pop()
+
+        # Another connection sees the committed rows
+        conn = sqlite3.connect(self.path)
+        self.assertGreaterEqual(conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0], 16)
+        conn.close()
+        frontier.close(flush=False)
+
+        frontier = DiskFrontier(self.path, "bfs", hot_window=2, reset=False)
+
+        self.assertEqual(len(frontier), 2)
+        self.assertNotIn("https://a.com/3", frontier)
+        self.assertEqual([frontier.pop() for _ in range(2)], ["https://a.com/1", "https://a.com/2"])
+        frontier.close()
+
+
+class TestDiskURLSet(unittest.TestCase):
+    """Tests for the DiskURLSet class."""
+
+    def test_set_operations(self):
+        """Test adding, membership, size and iteration across the buffer and disk."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            urls = DiskURLSet(os.path.join(tmp_dir, "visited.db"), hot_window=2)
+            for i in range(5):
+                urls.add(f"https://a.com/{i}")
+            urls.add("https://a.com/0")
+
+            self.assertEqual(len(urls), 5)
+            self.assertIn("https://a.com/4", urls)
+            self.assertNotIn("https://a.com/5", urls)
+            self.assertEqual(sorted(urls), sorted(f"https://a.com/{i}" for i in range(5)))
+            urls.close()
+
+    def test_commits_between_flushes(self):
+        """Test that URLs are committed without a flush and rolled back on reopen."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "visited.db")
+            urls = DiskURLSet(path, hot_window=2, commit_interval=4)
+            urls.add("https://a.com/0")
+            urls.flush()
+            for i in range(1, 10):
+                urls.add(f"https://a.com/{i}")
+
+            conn = sqlite3.connect(path)
+            self.assertGreaterEqual(conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 5)
+            conn.close()
+            urls.close(flush=False)
+
+            urls = DiskURLSet(path, reset=False)
+            self.assertEqual(sorted(urls), ["https://a.com/0"])
+            urls.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import codecs
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.encoding import decode_html, iter_decoded
+
+
+class TestDecodeHtml(unittest.TestCase):
+    """Tests for decode_html."""
+
+    def test_header_charset(self):
+        """Test that the Content-Type charset is used."""
+        text, encoding = decode_html("<p>café</p>".encode("latin-1"), "text/html; charset=ISO-8859-1")
+
+        self.assertEqual(text, "<p>café</p>")
+        self.assertEqual(encoding, "iso8859-1")
+
+    def test_meta_charset(self):
+        """Test that a <meta charset> declaration is used when the header has none."""
+        body = '<html><head><meta charset="windows-1252"></head><p>€</p>'.encode("cp1252")
+
+        text, encoding = decode_html(body, "text/html")
+
+        self.assertIn("€", text)
+        self.assertEqual(encoding, "cp1252")
+
+    def test_meta_http_equiv(self):
+        """Test that a <meta http-equiv> content charset is used."""
+        body = b'<meta http-equiv="Content-Type" content="text/html; charset=utf-8"><p>\xc3\xa9</p>'
+
+        text, encoding = decode_html(body)
+
+        self.assertIn("é", text)
+        self.assertEqual(encoding, "utf-8")
+
+    def test_bom_wins(self):
+        """Test that a byte order mark overrides the header."""
+        text, encoding = decode_html(codecs.BOM_UTF8 + "é".encode("utf-8"), "text/html; charset=latin-1")
+
+        self.assertEqual(text, "é")
+        self.assertEqual(encoding, "utf-8-sig")
+
+    def test_undeclared_fallbacks(self):
+        """Test UTF-8 and Windows-1252 fallbacks for undeclared documents."""
+        self.assertEqual(decode_html("<p>é</p>".encode("utf-8")), ("<p>é</p>", "utf-8"))
+        self.assertEqual(decode_html("<p>é</p>".encode("cp1252")), ("<p>é</p>", "cp1252"))
+
+    def test_unknown_charset_is_ignored(self):
+        """Test that unknown charset labels fall through to the next source."""
+        text, encoding = decode_html("é".encode("utf-8"), "text/html; charset=bogus")
+
+        self.assertEqual((text, encoding), ("é", "utf-8"))
+
+
+class TestIterDecoded(unittest.TestCase):
+    """Tests for iter_decoded."""
+
+    def test_split_characters(self):
+        """Test that characters split between chunks are decoded whole."""
+        body = ("<meta charset=\"utf-8\"><p>" + "café " * 2000 + "</p>").encode("utf-8")
+        encoding, pieces = iter_decoded([body[i:i + 3] for i in range(0, len(body), 3)], "text/html")
+
+        self.assertEqual(encoding, "utf-8")
+        self.assertEqual("".join(pieces), body.decode("utf-8"))
+
+    def test_undeclared_fallbacks(self):
+        """Test that undeclared documents are decoded like decode_html does."""
+        for body in ("<p>é</p>".encode("utf-8"), "<p>é</p>".encode("cp1252")):
+            encoding, pieces = iter_decoded([body[:4], body[4:]])
+            self.assertEqual(("".join(pieces), encoding), decode_html(body))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import sys
+import time
+import threading
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.fetch_engine import AsyncFetchEngine, iterate_async
+
+
+class ConcurrencyProbe:
+    """Blocking fetch function that records how many calls overlap."""
+
+    def __init__(self, duration=0.05):
+        self.duration = duration
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.peak_total = 0
+
+    def __call__(self, url):
+        host = url.split("/")[2]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+        time.sleep(self.duration)
+        with self.lock:
+            self.active[host] -= 1
+        return f"<html>{url}</html>"
+
+
+class TestAsyncFetchEngine(unittest.TestCase):
+    """Tests for the AsyncFetchEngine class."""
+
+    def _fetch_all(self, engine, urls, fetch):
+        async def fetch_all():
+            return await asyncio.gather(*(engine.run(url, fetch) for url in urls))
+
+        try:
+            return asyncio.run(fetch_all())
+        finally:
+            engine.close()
+
+    def test_per_host_cap(self):
+        """Test that requests to one host never exceed the per-host cap."""
+        engine = AsyncFetchEngine(max_concurrency=8, per_host_concurrency=2)
+        probe = ConcurrencyProbe()
+        urls = [f"https://a.example.com/{i}" for i in range(6)]
+
+        results = self._fetch_all(engine, urls, probe)
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0], "<html>https://a.example.com/0</html>")
+        self.assertEqual(probe.peak["a.example.com"], 2)
+
+    def test_global_cap(self):
+        """Test that the global cap bounds requests across hosts."""
+        engine = AsyncFetchEngine(max_concurrency=3, per_host_concurrency=3)
+        probe = ConcurrencyProbe()
+        urls = [f"https://host{i % 4}.example.com/{i}" for i in range(12)]
+
+        self._fetch_all(engine, urls, probe)
+
+        self.assertLessEqual(probe.peak_total, 3)
+        self.assertGreater(probe.peak_total, 1)
+
+    def test_per_host_cap_limited_by_global_cap(self):
+        """Test that the per-host cap never exceeds the global cap."""
+        engine = AsyncFetchEngine(max_concurrency=2, per_host_concurrency=10)
+
+        self.assertEqual(engine.per_host_concurrency, 2)
+
+    def test_iterate_async(self):
+        """Test driving an async generator from synchronous code."""
+        async def numbers():
+            for i in range(3):
+                yield i
+
+        self.assertEqual(list(iterate_async(numbers())), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
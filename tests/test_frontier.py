@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.frontier import Frontier
+
+
+class TestFrontier(unittest.TestCase):
+    """Tests for the Frontier class."""
+
+    def _drain(self, frontier):
+        """Pop every queued URL."""
+        urls = []
+        while frontier:
+            urls.append(frontier.pop())
+        return urls
+
+    def test_bfs_order(self):
+        """Test first-in first-out order."""
+        frontier = Frontier("bfs")
+        frontier.extend(["https://a.com/1", "https://a.com/2", "https://a.com/3"])
+
+        self.assertEqual(self._drain(frontier), ["https://a.com/1", "https://a.com/2", "https://a.com/3"])
+        self.assertIsNone(frontier.pop())
+
+    def test_dfs_order(self):
+        """Test last-in first-out order."""
+        frontier = Frontier("dfs")
+        frontier.extend(["https://a.com/1", "https://a.com/2", "https://a.com/3"])
+
+        self.assertEqual(self._drain(frontier), ["https://a.com/3", "https://a.com/2", "https://a.com/1"])
+
+    def test_priority_order(self):
+        """Test that higher priorities come first and ties keep insertion order."""
+        frontier = Frontier("priority")
+        frontier.push("https://a.com/low", 0.1)
+        frontier.push("https://a.com/high", 0.9)
+        frontier.push("https://a.com/tie1", 0.5)
+        frontier.push("https://a.com/tie2", 0.5)
+
+        self.assertEqual(self._drain(frontier), [
+            "https://a.com/high", "https://a.com/tie1", "https://a.com/tie2", "https://a.com/low"
+        ])
+
+    def test_hosts_round_robin(self):
+        """Test that hosts take turns."""
+        frontier = Frontier("bfs")
+        frontier.extend(["https://a.com/1", "https://a.com/2", "https://a.com/3", "https://b.com/1"])
+
+        self.assertEqual(self._drain(frontier), [
+            "https://a.com/1", "https://b.com/1", "https://a.com/2", "https://a.com/3"
+        ])
+
+    def test_urls_are_added_once(self):
+        """Test that URLs are never queued twice, even after being popped."""
+        frontier = Frontier()
+
+        self.assertTrue(frontier.push("https://a.com/1"))
+        self.assertFalse(frontier.push("https://a.com/1"))
+        frontier.pop()
+
+        self.assertFalse(frontier.push("https://a.com/1"))
+        self.assertIn("https://a.com/1", frontier)
+        self.assertEqual(len(frontier), 0)
+        self.assertEqual(frontier.get_stats()["seen"], 1)
+
+    def test_unknown_strategy(self):
+        """Test that unknown strategies are rejected."""
+        with self.assertRaises(ValueError):
+            Frontier("random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import difflib
+import glob
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.html_extractor import HTMLExtractor, LexborHTMLParser, clean_text, extract_page, lxml_html
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "html", "*.html")))
+
+# Tolerance of the backend equivalence test: the text may differ in a few
+# words where the parsers keep whitespace differently; everything else must
+# match, except the text around links in documents whose broken markup each
+# parser repairs differently (html.parser does not close <p> or <li> implicitly)
+TEXT_SIMILARITY = 0.98
+REPAIRED_FIXTURES = {"malformed.html"}
+
+
+class TestExtractPage(unittest.TestCase):
+    """Tests for single-pass page extraction."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.html = """
+        <!DOCTYPE html>
+        <html>
+            <head>
+                <title>Test Page</title>
+                <meta name="description" content="Test description">
+                <meta property="og:type" content="article">
+                <link rel="Canonical" href="/story">
+                <style>p { color: red; }</style>
+                <script>var links = '<a href="/hidden">';</script>
+            </head>
+            <body>
+                <!-- a comment -->
+                <h1>Hello, World!</h1>
+                <p>Read about <a href="freight">freight rates</a> and <a href="#top">more</a>.</p>
+                <a href="/page2" title="Second page"><img src="/image.jpg" alt="Test Image"></a>
+                <a href="https://external.com">External</a>
+                <a href="javascript:void(0)">Script</a>
+            </body>
+        </html>
+        """
+
+    def test_extract_page(self):
+        """Test extracting every field from one parse."""
+        page = extract_page(self.html, "https://example.com/news/", "https://example.com")
+
+        self.assertEqual(page["text"], "Test Page\nHello, World!\nRead about freight rates and more.\nExternal\nScript")
+        self.assertEqual(page["links"], ["https://example.com/news/freight", "https://example.com/page2"])
+        self.assertIsNone(page["link_contexts"])
+        self.assertEqual(page["images"], [{"url": "https://example.com/image.jpg", "alt_text": "Test Image"}])
+        self.assertEqual(page["metadata"], {
+            "title": "Test Page", "description": "Test description", "og:type": "article"
+        })
+        self.assertEqual(page["canonical_url"], "https://example.com/story")
+
+    def test_link_contexts(self):
+        """Test extracting the anchor text and surrounding text of links."""
+        page = extract_page(self.html, "https://example.com/news/", "https://example.com", context_chars=20)
+
+        self.assertEqual(page["link_contexts"], [
+            {"url": "https://example.com/news/freight", "anchor": "freight rates", "context": "Read about freight r"},
+            {"url": "https://example.com/page2", "anchor": "Second page",
+             "context": "Hello, World! Read a"}
+        ])
+
+    def test_clean_text(self):
+        """Test normalizing text to one phrase per line."""
+        self.assertEqual(clean_text("  Title \n\n  first  second \n"), "Title\nfirst\nsecond")
+
+
+class TestParserBackends(unittest.TestCase):
+    """Tests that the parser backends extract the same data as html.parser."""
+
+    def assert_equivalent(self, parser):
+        """Compare a backend's extraction of each fixture with html.parser's."""
+        reference = HTMLExtractor("html.parser")
+        extractor = HTMLExtractor(parser)
+        for path in FIXTURES:
+            name = os.path.basename(path)
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+            with self.subTest(fixture=name):
+                expected = reference.extract(html, "https://example.com/news/story", "https://example.com", 80)
+                page = extractor.extract(html, "https://example.com/news/story", "https://example.com", 80)
+
+                similarity = difflib.SequenceMatcher(None, expected["text"].split(), page["text"].split()).ratio()
+                self.assertGreaterEqual(similarity, TEXT_SIMILARITY)
+                for field in ("links", "images", "metadata", "canonical_url"):
+                    self.assertEqual(page[field], expected[field], field)
+                if name in REPAIRED_FIXTURES:
+                    self.assertEqual([(link["url"], link["anchor"]) for link in page["link_contexts"]],
+                                     [(link["url"], link["anchor"]) for link in expected["link_contexts"]])
+                else:
+                    self.assertEqual(page["link_contexts"], expected["link_contexts"])
+        self.assertEqual(extractor.get_stats(), {"parser": parser, "pages": len(FIXTURES), "fallbacks": 0})
+
+    @unittest.skipIf(lxml_html is None, "lxml is not installed")
+    def test_lxml(self):
+        """Test the lxml backend against the fixtures."""
+        self.assert_equivalent("lxml")
+
+    @unittest.skipIf(LexborHTMLParser is None, "selectolax is not installed")
+    def test_selectolax(self):
+        """Test the selectolax backend against the fixtures."""
+        self.assert_equivalent("selectolax")
+
+    @unittest.skipIf(lxml_html is None, "lxml is not installed")
+    def test_fallback(self):
+        """Test that documents a backend rejects are extracted with html.parser."""
+        extractor = HTMLExtractor("lxml")
+        html = '<?xml version="1.0" encoding="utf-8"?><html><body><a href="/a">A</a></body></html>'
+        page = extractor.extract(html, "https://example.com/", "https://example.com")
+
+        self.assertEqual(page["links"], ["https://example.com/a"])
+        self.assertEqual(extractor.extract("", "https://example.com/", "https://example.com")["text"], "")
+        self.assertEqual(extractor.get_stats()["fallbacks"], 2)
+
+    def test_unknown_parser(self):
+        """Test that an unknown parser is rejected."""
+        with self.assertRaises(ValueError):
+            HTMLExtractor("html5lib")
+
+
+if __name__ == "__main__":
+    unittest.main()
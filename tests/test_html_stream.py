@@ -0,0 +1,75 @@
+import glob
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.html_extractor import extract_page
+from src.crawlers.html_stream import HTMLStreamExtractor, extract_stream
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "html", "*.html")))
+
+
+def split(text, size):
+    """Split a document into pieces of a given size."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestExtractStream(unittest.TestCase):
+    """Tests for incremental page extraction."""
+
+    def test_matches_extract_page(self):
+        """Test that streaming a fixture in pieces extracts the same data as one parse."""
+        for path in FIXTURES:
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+            expected = extract_page(html, "https://example.com/news/story", "https://example.com", 80,
+                                    main_content=True)
+            for size in (1, 7, 4096):
+                with self.subTest(fixture=os.path.basename(path), size=size):
+                    page = extract_stream(split(html, size), "https://example.com/news/story",
+                                          "https://example.com", 80, main_content=True)
+
+                    for field in expected:
+                        self.assertEqual(page[field], expected[field], field)
+                    self.assertFalse(page["text_truncated"])
+                    self.assertFalse(page["buffer_truncated"])
+
+    def test_text_chunks(self):
+        """Test that text is emitted in chunks cut at line ends while the page is fed."""
+        extractor = HTMLStreamExtractor("https://example.com/", "https://example.com", chunk_chars=100)
+        events = extractor.push("<html><body>")
+        for i in range(50):
+            events += extractor.push(f'<p>Paragraph {i}</p>\n<a href="/p{i}">Link {i}</a>\n')
+        chunks = [value for kind, value in events if kind == "text"]
+        links = [value for kind, value in events if kind == "link"]
+        events = extractor.finish()
+
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(len(chunk) < 150 for chunk in chunks))
+        self.assertEqual(len(links), 50)
+        chunks += [value for kind, value in events if kind == "text"]
+        self.assertEqual("\n".join(chunks), "\n".join(f"Paragraph {i}\nLink {i}" for i in range(50)))
+
+    def test_limits(self):
+        """Test that the kept text and the tokenizer's buffer are bounded."""
+        html = "<p>" + "word " * 1000 + "</p><a href=\"/after\">After</a>"
+        page = extract_stream(split(html, 100), "https://example.com/", "https://example.com", max_text_chars=50)
+
+        self.assertEqual(len(page["text"]), 50)
+        self.assertTrue(page["text_truncated"])
+        self.assertEqual(page["links"], ["https://example.com/after"])
+
+        extractor = HTMLStreamExtractor("https://example.com/", "https://example.com", max_buffer_chars=1000)
+        events = extractor.push('<a href="/before">Before</a><!-- ' + "x" * 2000)
+        events += extractor.push('--><a href="/after">After</a>')
+        events += extractor.finish()
+
+        self.assertTrue(extractor.truncated)
+        self.assertEqual([value for kind, value in events if kind == "link"], ["https://example.com/before"])
+
+
+if __name__ == "__main__":
+    unittest.main()
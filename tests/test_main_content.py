@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.html_extractor import HTMLExtractor, LexborHTMLParser, extract_page, lxml_html
+from src.crawlers.main_content import MainContentExtractor
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+def read_fixture(name):
+    """Read an HTML fixture."""
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class TestMainContent(unittest.TestCase):
+    """Tests for main-content extraction."""
+
+    def test_boilerplate_removed(self):
+        """Test that navigation, banners, sidebars, comments and footers are left out."""
+        page = extract_page(read_fixture("boilerplate.html"), "https://example.com/news/rotterdam",
+                            "https://example.com", main_content=True)
+        main_text = page["main_text"]
+
+        self.assertTrue(main_text.startswith("Port of Rotterdam opens new container terminal\n"))
+        self.assertTrue(main_text.endswith("diverting ships around the Cape of Good Hope."))
+        for boilerplate in ("cookies", "Subscribe", "Most read", "inbox", "Rotterdam Terminals",
+                            "3 comments", "All rights reserved"):
+            self.assertNotIn(boilerplate, main_text)
+            self.assertIn(boilerplate, page["text"])
+
+    def test_no_main_content(self):
+        """Test that pages without enough article text have no main content."""
+        page = extract_page(read_fixture("listing.html"), "https://example.com/ports", "https://example.com",
+                            main_content=True)
+
+        self.assertIsNone(page["main_text"])
+        self.assertIsNone(extract_page(read_fixture("boilerplate.html"), "https://example.com/",
+                                       "https://example.com")["main_text"])
+
+    def test_events(self):
+        """Test classifying blocks fed as element and text events."""
+        extractor = MainContentExtractor(min_words=5)
+        attributes = {"class": "sidebar"}
+        extractor.start_element("body", {}, dict.get)
+        for name, attrs, text in (("div", attributes, "Sidebar text that is long enough to be kept " * 3),
+                                  ("p", {}, "A paragraph of article text long enough to count as content " * 3),
+                                  ("p", {}, "Another paragraph of article text in the main body " * 3),
+                                  ("footer", {}, "Copyright")):
+            extractor.start_element(name, attrs, dict.get)
+            extractor.add_text(text)
+            extractor.end_element(name)
+        extractor.end_element("body")
+        extractor.finish()
+
+        self.assertEqual(extractor.get_text().splitlines(), [
+            ("A paragraph of article text long enough to count as content " * 3).strip(),
+            ("Another paragraph of article text in the main body " * 3).strip()
+        ])
+
+    @unittest.skipIf(lxml_html is None or LexborHTMLParser is None, "lxml or selectolax is not installed")
+    def test_backends_agree(self):
+        """Test that every parser backend finds the same main content."""
+        html = read_fixture("boilerplate.html")
+        expected = extract_page(html, "https://example.com/", "https://example.com", main_content=True)
+        for parser in ("lxml", "selectolax"):
+            page = HTMLExtractor(parser).extract(html, "https://example.com/", "https://example.com",
+                                                 main_content=True)
+            self.assertEqual(page["main_text"], expected["main_text"], parser)
+
+
+if __name__ == "__main__":
+    unittest.main()
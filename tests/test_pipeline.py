@@ -0,0 +1,132 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.pipeline import Pipeline
+
+
+class ConcurrencyProbe:
+    """Stage handler that records how many calls overlap."""
+
+    def __init__(self, duration=0.05):
+        self.duration = duration
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, item):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.duration)
+        with self.lock:
+            self.active -= 1
+        return item
+
+
+class TestPipeline(unittest.TestCase):
+    """Tests for the Pipeline class."""
+
+    def test_items_flow_through_stages(self):
+        """Test that every item passes each stage in turn and None drops it."""
+        pipeline = Pipeline(queue_size=2)
+        pipeline.add_stage("double", lambda n: n * 2)
+        pipeline.add_stage("odd", lambda n: None if n % 4 == 0 else n + 1)
+
+        outputs = list(pipeline.run(range(10)))
+
+        self.assertEqual(outputs, [3, 7, 11, 15, 19])
+        stats = pipeline.get_stats()["stages"]
+        self.assertEqual(list(stats), ["source", "double", "odd", "sink"])
+        self.assertEqual(stats["double"]["items"], 10)
+        self.assertEqual(stats["odd"]["dropped"], 5)
+        self.assertEqual(stats["sink"]["items"], 5)
+
+    def test_stage_workers_run_concurrently(self):
+        """Test that a stage runs as many items at once as it has workers."""
+        probe = ConcurrencyProbe()
+        pipeline = Pipeline(queue_size=8)
+        pipeline.add_stage("slow", probe, workers=3)
+
+        outputs = list(pipeline.run(range(9)))
+
+        self.assertEqual(sorted(outputs), list(range(9)))
+        self.assertEqual(probe.peak, 3)
+        self.assertEqual(pipeline.get_stats()["stages"]["slow"]["workers"], 3)
+
+    def test_backpressure(self):
+        """Test that a slow sink stops the source from running ahead of it."""
+        produced = []
+
+        def source():
+            for i in range(30):
+                produced.append(i)
+                yield i
+
+        pipeline = Pipeline(queue_size=2)
+        pipeline.add_stage("pass", lambda n: n)
+
+        ahead = 0
+        for count, _ in enumerate(pipeline.run(source()), 1):
+            time.sleep(0.01)
+            ahead = max(ahead, len(produced) - count)
+
+        # Two queues of two items, one item held by the stage and one by the source
+        self.assertLessEqual(ahead, 6)
+        self.assertGreater(pipeline.get_stats()["stages"]["source"]["blocked"], 0)
+
+    def test_bottleneck(self):
+        """Test that the busiest stage is reported as the bottleneck."""
+        pipeline = Pipeline(queue_size=4)
+        pipeline.add_stage("fast", lambda n: n)
+        pipeline.add_stage("slow", ConcurrencyProbe(0.02))
+
+        list(pipeline.run(range(10)))
+
+        stats = pipeline.get_stats()
+        self.assertEqual(stats["bottleneck"], "slow")
+        self.assertGreater(stats["stages"]["slow"]["utilisation"], 0.5)
+        self.assertGreater(stats["stages"]["fast"]["blocked"], 0)
+        self.assertLessEqual(stats["stages"]["slow"]["queue"]["max_depth"], 4)
+
+    def test_stage_error_is_raised(self):
+        """Test that an exception in a stage stops the pipeline and reaches the caller."""
+        def fail(n):
+            if n == 3:
+                raise ValueError("bad item")
+            return n
+
+        pipeline = Pipeline(queue_size=2)
+        pipeline.add_stage("fail", fail, workers=2)
+
+        with self.assertRaises(ValueError):
+            list(pipeline.run(range(100)))
+
+    def test_close_stops_source(self):
+        """Test that closing the output early stops the source and every worker."""
+        stopped = threading.Event()
+
+        def source():
+            while not stopped.is_set():
+                yield 1
+                time.sleep(0.01)
+
+        pipeline = Pipeline(queue_size=2)
+        pipeline.add_stage("pass", lambda n: n, workers=2)
+        threads = threading.active_count()
+
+        outputs = pipeline.run(source(), stop_source=stopped.set)
+        next(outputs)
+        outputs.close()
+
+        self.assertTrue(stopped.is_set())
+        self.assertEqual(threading.active_count(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.politeness import PolitenessScheduler, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests for the TokenBucket class."""
+
+    @patch("src.crawlers.politeness.time.monotonic", return_value=100.0)
+    def test_burst_then_spacing(self, mock_monotonic):
+        """Test that a full bucket allows a burst and then spaces requests."""
+        bucket = TokenBucket(rate=2.0, burst=2)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    @patch("src.crawlers.politeness.time.monotonic")
+    def test_refill(self, mock_monotonic):
+        """Test that tokens refill over time."""
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=1.0, burst=1)
+        bucket.reserve()
+
+        mock_monotonic.return_value = 101.0
+        self.assertEqual(bucket.reserve(), 0.0)
+
+
+class TestPolitenessScheduler(unittest.TestCase):
+    """Tests for the PolitenessScheduler class."""
+
+    @patch("src.crawlers.politeness.time.monotonic", return_value=100.0)
+    def test_hosts_are_independent(self, mock_monotonic):
+        """Test that a busy host does not delay another host."""
+        scheduler = PolitenessScheduler(default_rate=1.0, default_burst=1)
+
+        self.assertEqual(scheduler.reserve("https://a.example.com/1"), 0.0)
+        self.assertAlmostEqual(scheduler.reserve("https://a.example.com/2"), 1.0)
+        self.assertEqual(scheduler.reserve("https://b.example.com/1"), 0.0)
+
+    @patch("src.crawlers.politeness.time.monotonic", return_value=100.0)
+    def test_configure_and_limit_rate(self, mock_monotonic):
+        """Test per-host rate settings and rate limiting."""
+        scheduler = PolitenessScheduler(default_rate=1.0, default_burst=1)
+        scheduler.configure("a.example.com", rate=10.0, burst=3)
+
+        for _ in range(3):
+            self.assertEqual(scheduler.reserve("https://a.example.com/"), 0.0)
+        self.assertAlmostEqual(scheduler.reserve("https://a.example.com/"), 0.1)
+
+        scheduler.limit_rate("a.example.com", 0.5)
+        self.assertEqual(scheduler.get_stats()["a.example.com"]["rate"], 0.5)
+
+    @patch("src.crawlers.politeness.time.sleep")
+    @patch("src.crawlers.politeness.time.monotonic", return_value=100.0)
+    def test_wait_stats(self, mock_monotonic, mock_sleep):
+        """Test that waits are reported per host."""
+        scheduler = PolitenessScheduler(default_rate=2.0, default_burst=1)
+
+        scheduler.wait("https://a.example.com/1")
+        scheduler.wait("https://a.example.com/2")
+
+        mock_sleep.assert_called_once_with(0.5)
+        stats = scheduler.get_stats(["a.example.com"])["a.example.com"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["total_wait"], 0.5)
+        self.assertEqual(stats["max_wait"], 0.5)
+        self.assertEqual(stats["avg_wait"], 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.relevance import RelevanceScorer
+
+
+class TestRelevanceScorer(unittest.TestCase):
+    """Tests for the RelevanceScorer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.scorer = RelevanceScorer(["logistics", "supply chain", "freight", "shipping"])
+
+    def test_score_text(self):
+        """Test that each distinct keyword raises a text's score."""
+        self.assertEqual(self.scorer.score_text("Celebrity gossip"), 0.0)
+        self.assertEqual(self.scorer.score_text("Freight rates rise"), 0.5)
+        self.assertEqual(self.scorer.score_text("Freights, freight and shipping"), 0.75)
+        # Keywords match as whole words only
+        self.assertEqual(self.scorer.score_text("Chains supplied"), 0.0)
+
+    def test_score_url(self):
+        """Test scoring the words of a URL."""
+        self.assertEqual(self.scorer.score_url("https://example.com/news/supply-chain-risks"), 0.5)
+        self.assertEqual(self.scorer.score_url("https://example.com/search?q=supply+chain"), 0.5)
+        self.assertEqual(self.scorer.score_url("https://example.com/shippingcontainers"), 0.0)
+
+    def test_score_keywords(self):
+        """Test scoring a page by its extracted keywords."""
+        self.assertEqual(self.scorer.score_keywords(["global supply", "chain", "ports"]), 0.0)
+        self.assertEqual(self.scorer.score_keywords(["supply chains", "logistics", "ports"]), 0.75)
+
+    def test_score_link(self):
+        """Test that a link's signals are combined by their weights."""
+        scorer = RelevanceScorer(["freight"], {"anchor": 2, "context": 1, "url": 1, "parent": 0})
+        self.assertEqual(scorer.score_link("https://example.com/a", "Freight news"), 0.25)
+        self.assertEqual(scorer.score_link("https://example.com/freight", "Freight", "freight", 1.0), 0.5)
+        self.assertEqual(scorer.score_link("https://example.com/about", "About us"), 0.0)
+
+    def test_stats(self):
+        """Test the statistics of crawled pages."""
+        self.scorer.record_page("Freight and shipping news")
+        self.scorer.record_page("Nothing relevant")
+        stats = self.scorer.get_stats()
+        self.assertEqual(stats["pages"], 2)
+        self.assertEqual(stats["relevant_pages"], 1)
+        self.assertEqual(stats["mean_relevance"], 0.375)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+from email.utils import formatdate
+
+import requests
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.retry_policy import CircuitBreaker, HTTPStatusError, RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Tests for the RetryPolicy class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=10.0)
+
+    def test_retryable_errors(self):
+        """Test that transient errors are retried and permanent ones are not."""
+        self.assertTrue(self.policy.is_retryable(requests.exceptions.Timeout()))
+        self.assertTrue(self.policy.is_retryable(requests.exceptions.ConnectionError()))
+        self.assertTrue(self.policy.is_retryable(HTTPStatusError(429)))
+        self.assertTrue(self.policy.is_retryable(HTTPStatusError(503)))
+        self.assertFalse(self.policy.is_retryable(HTTPStatusError(404)))
+        self.assertFalse(self.policy.is_retryable(requests.exceptions.MissingSchema()))
+
+    def test_host_responses(self):
+        """Test that permanent answers of the host are told apart from host failures."""
+        self.assertTrue(self.policy.is_host_response(HTTPStatusError(404)))
+        self.assertTrue(self.policy.is_host_response(requests.exceptions.TooManyRedirects()))
+        self.assertFalse(self.policy.is_host_response(HTTPStatusError(503)))
+        self.assertFalse(self.policy.is_host_response(requests.exceptions.InvalidURL()))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay within the doubling window and the cap."""
+        for attempt in range(6):
+            delay = self.policy.get_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(10.0, 2 ** attempt))
+
+    def test_retry_after_is_a_lower_bound(self):
+        """Test that Retry-After is honoured up to the cap."""
+        self.assertGreaterEqual(self.policy.get_delay(0, HTTPStatusError(503, retry_after=5)), 5)
+        self.assertEqual(self.policy.get_delay(0, HTTPStatusError(503, retry_after=500)), 10.0)
+
+    def test_parse_retry_after(self):
+        """Test parsing Retry-After as seconds and as an HTTP date."""
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 60, usegmt=True)), 60, delta=2)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Tests for the CircuitBreaker class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05, max_cooldown=1.0, max_trips=2)
+        self.url = "https://example.com/page"
+
+    def test_trips_after_threshold(self):
+        """Test that consecutive failures open the circuit for the host only."""
+        self.assertFalse(self.breaker.record_failure(self.url))
+        self.assertTrue(self.breaker.record_failure(self.url))
+
+        self.assertFalse(self.breaker.allow_request(self.url))
+        self.assertTrue(self.breaker.allow_request("https://other.com/"))
+        self.assertEqual(self.breaker.get_stats(["example.com"])["example.com"]["state"], "open")
+
+    def test_success_resets_failures(self):
+        """Test that a success in between keeps the circuit closed."""
+        self.breaker.record_failure(self.url)
+        self.breaker.record_success(self.url)
+
+        self.assertFalse(self.breaker.record_failure(self.url))
+        self.assertTrue(self.breaker.allow_request(self.url))
+
+    def test_probe_after_cooldown(self):
+        """Test that a failing probe re-opens the circuit and a host is eventually given up."""
+        self.breaker.record_failure(self.url)
+        self.breaker.record_failure(self.url)
+        asyncio.run(self.breaker.wait_async(self.url))
+
+        self.assertTrue(self.breaker.allow_request(self.url))
+        self.assertTrue(self.breaker.record_failure(self.url))
+        self.assertFalse(self.breaker.allow_request(self.url))
+        self.assertEqual(self.breaker.get_pause(self.url), 0)
+        self.assertEqual(self.breaker.get_stats()["example.com"]["state"], "given_up")
+
+    def test_probe_success_closes(self):
+        """Test that a successful probe closes the circuit."""
+        self.breaker.record_failure(self.url)
+        self.breaker.record_failure(self.url)
+        time.sleep(0.06)
+
+        self.assertTrue(self.breaker.allow_request(self.url))
+        self.breaker.record_success(self.url)
+
+        self.assertFalse(self.breaker.record_failure(self.url))
+        self.assertEqual(self.breaker.get_stats()["example.com"]["trips"], 1)
+
+    def test_half_open_allows_one_probe(self):
+        """Test that a half-open circuit lets exactly one probe through at a time."""
+        self.breaker.record_failure(self.url)
+        self.breaker.record_failure(self.url)
+        time.sleep(0.06)
+
+        self.assertTrue(self.breaker.allow_request(self.url))
+        self.assertFalse(self.breaker.allow_request(self.url))
+        self.assertTrue(self.breaker.is_probing(self.url))
+        self.assertGreater(self.breaker.get_pause(self.url), 0)
+
+        self.breaker.record_success(self.url)
+        self.assertTrue(self.breaker.allow_request(self.url))
+        self.assertTrue(self.breaker.allow_request(self.url))
+
+    def test_released_probe_lets_another_through(self):
+        """Test that a probe without an outcome stops holding back the host once released."""
+        self.breaker.record_failure(self.url)
+        self.breaker.record_failure(self.url)
+        time.sleep(0.06)
+
+        self.assertTrue(self.breaker.allow_request(self.url))
+        started = time.monotonic()
+        self.assertFalse(self.breaker.allow_request(self.url))
+
+        self.breaker.release_probe(self.url, started)
+        self.assertFalse(self.breaker.is_probing(self.url))
+        self.assertTrue(self.breaker.allow_request(self.url))
+        self.assertEqual(self.breaker.get_stats()["example.com"]["state"], "half_open")
+
+    def test_in_flight_failures_do_not_trip_again(self):
+        """Test that failures of requests sent before the circuit opened are ignored."""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05, max_cooldown=1.0, max_trips=3)
+        started = time.monotonic()
+        breaker.record_failure(self.url, started)
+        self.assertTrue(breaker.record_failure(self.url, started))
+
+        # The rest of the host's concurrent requests fail while the circuit is open
+        for _ in range(6):
+            self.assertFalse(breaker.record_failure(self.url, started))
+        time.sleep(0.06)
+
+        # Only the probe's failure counts as another trip
+        self.assertTrue(breaker.allow_request(self.url))
+        self.assertFalse(breaker.record_failure(self.url, started))
+        self.assertTrue(breaker.record_failure(self.url, time.monotonic()))
+        self.assertEqual(breaker.get_stats()["example.com"]["trips"], 2)
+        self.assertEqual(breaker.get_stats()["example.com"]["state"], "open")
+
+
+if __name__ == "__main__":
+    unittest.main()
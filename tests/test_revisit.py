@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.revisit import RevisitIndex, change_probability, estimate_change_rate
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+class TestChangeRate(unittest.TestCase):
+    """Tests for the change rate estimator."""
+
+    def test_default_without_history(self):
+        """Test that pages seen once use the default interval."""
+        self.assertEqual(estimate_change_rate(0, 0, 0, default_interval=DAY), 1 / DAY)
+
+    def test_estimate(self):
+        """Test that frequently changing pages get higher rates."""
+        hourly = estimate_change_rate(10, 10, 10 * HOUR)
+        sometimes = estimate_change_rate(10, 3, 10 * HOUR)
+        self.assertGreater(hourly, sometimes)
+        # Half of the checks found a change: about ln 2 changes per interval
+        self.assertAlmostEqual(estimate_change_rate(100, 50, 100 * HOUR) * HOUR, 0.69, delta=0.01)
+
+    def test_floor_for_unchanged_pages(self):
+        """Test that pages never seen changing are still revisited eventually."""
+        self.assertEqual(estimate_change_rate(20, 0, 20 * DAY, max_interval=30 * DAY), 1 / (30 * DAY))
+
+    def test_change_probability(self):
+        """Test the probability of a change since the last check."""
+        self.assertEqual(change_probability(1 / HOUR, 0), 0)
+        self.assertAlmostEqual(change_probability(1 / HOUR, HOUR), 0.632, places=3)
+
+
+class TestRevisitIndex(unittest.TestCase):
+    """Tests for the RevisitIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = RevisitIndex(os.path.join(self.tmp_dir.name, "revisit.db"))
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def test_record(self):
+        """Test that changes of the content hash are counted."""
+        self.assertFalse(self.index.record("h1", "https://example.com/a", "v1", checked_at=0))
+        self.assertTrue(self.index.record("h1", "https://example.com/a", "v2", checked_at=HOUR))
+        self.assertFalse(self.index.record("h1", "https://example.com/a", None, checked_at=2 * HOUR))
+        self.assertFalse(self.index.record("h1", "https://example.com/a", "v2", checked_at=3 * HOUR))
+
+        entry = self.index.get("h1")
+        self.assertEqual((entry["checks"], entry["changes"]), (3, 1))
+        self.assertEqual(entry["observed_seconds"], 3 * HOUR)
+        self.assertEqual(entry["content_hash"], "v2")
+        self.assertIn("h1", self.index)
+        self.assertNotIn("h2", self.index)
+
+    def test_select_due(self):
+        """Test that the pages most likely to have changed are picked within the budget."""
+        for i in range(24):
+            self.index.record("index", "https://example.com/", f"v{i}", checked_at=i * HOUR)
+        for i in range(24):
+            self.index.record("doc", "https://example.com/doc", "same", checked_at=i * HOUR)
+        self.index.record("other", "https://other.com/", "v", checked_at=0)
+
+        now = 24 * HOUR
+        self.assertEqual([url for url, _ in self.index.select_due("https://example.com", 10, 0.5, now)],
+                         ["https://example.com/"])
+        due = self.index.select_due("https://example.com", 1, 0.0, now)
+        self.assertEqual([url for url, _ in due], ["https://example.com/"])
+
+        stats = self.index.get_stats("https://example.com")
+        self.assertEqual((stats["tracked_urls"], stats["checks"], stats["changes"]), (2, 46, 23))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.robots import RobotsCache, RobotsRules
+
+
+SAMPLE_ROBOTS = """
+# Example robots.txt
+User-agent: *
+Disallow: /private/
+Disallow: /*.pdf$
+Disallow: /search
+Allow: /private/public/
+Crawl-delay: 2
+
+User-agent: specialbot
+Disallow: /
+
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+class TestRobotsRules(unittest.TestCase):
+    """Tests for the RobotsRules class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rules = RobotsRules.parse(SAMPLE_ROBOTS)
+
+    def test_prefix_rules(self):
+        """Test plain prefix allow and disallow rules."""
+        self.assertTrue(self.rules.is_allowed("https://example.com/"))
+        self.assertFalse(self.rules.is_allowed("https://example.com/private/data"))
+        self.assertFalse(self.rules.is_allowed("https://example.com/search?q=freight"))
+
+    def test_longest_match_wins(self):
+        """Test that the most specific rule takes precedence."""
+        self.assertTrue(self.rules.is_allowed("https://example.com/private/public/page"))
+
+    def test_wildcard_and_anchor(self):
+        """Test '*' wildcards and '$' end anchors."""
+        self.assertFalse(self.rules.is_allowed("https://example.com/docs/report.pdf"))
+        self.assertTrue(self.rules.is_allowed("https://example.com/docs/report.pdf.html"))
+
+    def test_crawl_delay_and_sitemaps(self):
+        """Test that Crawl-delay and Sitemap lines are read."""
+        self.assertEqual(self.rules.crawl_delay, 2.0)
+        self.assertEqual(self.rules.sitemaps, ["https://example.com/sitemap.xml"])
+
+    def test_specific_user_agent_group(self):
+        """Test that a matching user-agent group overrides the '*' group."""
+        rules = RobotsRules.parse(SAMPLE_ROBOTS, user_agent="SpecialBot/1.0")
+
+        self.assertFalse(rules.is_allowed("https://example.com/"))
+        self.assertTrue(rules.is_allowed("https://example.com/robots.txt"))
+
+
+class TestRobotsCache(unittest.TestCase):
+    """Tests for the RobotsCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.fetch = MagicMock(return_value=(200, SAMPLE_ROBOTS))
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def test_fetches_once_per_host(self):
+        """Test that robots.txt is downloaded once per host."""
+        cache = RobotsCache(cache_dir=self.tmp_dir.name, ttl=60)
+
+        self.assertTrue(cache.is_allowed("https://example.com/a", self.fetch))
+        self.assertFalse(cache.is_allowed("https://example.com/private/b", self.fetch))
+
+        self.fetch.assert_called_once_with("https://example.com/robots.txt")
+
+    def test_disk_cache_shared_between_instances(self):
+        """Test that a new cache instance reuses rules stored on disk."""
+        RobotsCache(cache_dir=self.tmp_dir.name, ttl=60).get_rules("https://example.com/", self.fetch)
+        other_fetch = MagicMock()
+
+        rules = RobotsCache(cache_dir=self.tmp_dir.name, ttl=60).get_rules("https://example.com/", other_fetch)
+
+        other_fetch.assert_not_called()
+        self.assertEqual(rules.crawl_delay, 2.0)
+
+    def test_disk_cache_is_per_user_agent(self):
+        """Test that rules cached for one user agent are not reused for another."""
+        RobotsCache(cache_dir=self.tmp_dir.name, ttl=60).get_rules("https://example.com/", self.fetch)
+        other_fetch = MagicMock(return_value=(200, SAMPLE_ROBOTS))
+
+        cache = RobotsCache(cache_dir=self.tmp_dir.name, ttl=60, user_agent="SpecialBot/1.0")
+
+        self.assertFalse(cache.is_allowed("https://example.com/a", other_fetch))
+        other_fetch.assert_called_once_with("https://example.com/robots.txt")
+
+    def test_expired_entry_is_refetched(self):
+        """Test that entries past their TTL are downloaded again."""
+        cache = RobotsCache(cache_dir=self.tmp_dir.name, ttl=0)
+
+        cache.get_rules("https://example.com/", self.fetch)
+        cache.get_rules("https://example.com/", self.fetch)
+
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_missing_robots_allows_everything(self):
+        """Test that a 404 robots.txt imposes no restrictions."""
+        cache = RobotsCache(cache_dir=self.tmp_dir.name, ttl=60)
+
+        self.assertTrue(cache.is_allowed("https://example.com/private/", MagicMock(return_value=(404, ""))))
+
+    def test_unreachable_robots_disallows_everything(self):
+        """Test that an unreachable robots.txt disallows crawling."""
+        cache = RobotsCache(cache_dir=self.tmp_dir.name, ttl=60)
+
+        self.assertFalse(cache.is_allowed("https://example.com/", MagicMock(return_value=None)))
+
+
+if __name__ == "__main__":
+    unittest.main()
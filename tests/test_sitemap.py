@@ -0,0 +1,130 @@
+import gzip
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.sitemap import SitemapReader, iter_sitemap, open_sitemap, parse_lastmod, select_recent
+
+URLSET = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/old</loc><lastmod>2023-01-01</lastmod></url>
+  <url><loc> https://example.com/new </loc><lastmod>2024-05-01T10:00:00Z</lastmod></url>
+  <url><loc>https://example.com/undated</loc></url>
+</urlset>"""
+
+INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/pages.xml.gz</loc></sitemap>
+  <sitemap><loc>https://example.com/index.xml</loc></sitemap>
+</sitemapindex>"""
+
+
+def chunked(data, size=7):
+    """Split a body into small chunks like a streamed response."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestSitemap(unittest.TestCase):
+    """Tests for the sitemap reader."""
+
+    def test_parse_lastmod(self):
+        """Test W3C datetime formats."""
+        self.assertEqual(parse_lastmod("2024"), parse_lastmod("2024-01-01"))
+        self.assertEqual(parse_lastmod("2024-05"), parse_lastmod("2024-05-01T00:00:00Z"))
+        self.assertEqual(parse_lastmod("2024-05-01T12:00:00+02:00"), parse_lastmod("2024-05-01T10:00:00Z"))
+        self.assertIsNone(parse_lastmod("yesterday"))
+        self.assertIsNone(parse_lastmod(None))
+
+    def test_iter_gzipped_urlset(self):
+        """Test that gzipped sitemaps are detected and parsed in chunks."""
+        stream = open_sitemap(chunked(gzip.compress(URLSET.encode("utf-8"))))
+        entries = list(iter_sitemap(stream))
+        self.assertEqual([loc for _, loc, _ in entries], [
+            "https://example.com/old", "https://example.com/new", "https://example.com/undated"
+        ])
+        self.assertEqual(entries[1], ("url", "https://example.com/new", "2024-05-01T10:00:00Z"))
+
+    def test_iter_text_sitemap(self):
+        """Test that text sitemaps list one URL per line."""
+        stream = open_sitemap([b"https://example.com/a\n\nnot a url\nhttps://example.com/b\n"])
+        self.assertEqual([loc for _, loc, _ in iter_sitemap(stream)], [
+            "https://example.com/a", "https://example.com/b"
+        ])
+
+    def test_reader_follows_indexes(self):
+        """Test that sitemap indexes are followed once each."""
+        bodies = {
+            "https://example.com/index.xml": INDEX.encode("utf-8"),
+            "https://example.com/pages.xml.gz": gzip.compress(URLSET.encode("utf-8"))
+        }
+        fetched = []
+
+        def fetch(url):
+            fetched.append(url)
+            return chunked(bodies[url]) if url in bodies else None
+
+        reader = SitemapReader(fetch)
+        urls = [url for url, _ in reader.read(["https://example.com/index.xml", "https://example.com/missing.xml"])]
+        self.assertEqual(len(urls), 3)
+        self.assertEqual(fetched.count("https://example.com/index.xml"), 1)
+        self.assertEqual(reader.get_stats(), {"sitemaps": 2, "failed": 1, "urls": 3})
+
+    def test_reader_keeps_entries_of_truncated_sitemap(self):
+        """Test that entries before a parse error are kept."""
+        body = URLSET.encode("utf-8")
+        reader = SitemapReader(lambda url: [body[:body.index(b"<url><loc>https://example.com/undated")]])
+        urls = [url for url, _ in reader.read(["https://example.com/sitemap.xml"])]
+        self.assertEqual(urls, ["https://example.com/old", "https://example.com/new"])
+        self.assertEqual(reader.get_stats()["failed"], 1)
+
+    def test_reader_byte_limit(self):
+        """Test that reading stops at the byte limit."""
+        body = URLSET.encode("utf-8")
+        reader = SitemapReader(lambda url: chunked(body), max_bytes=body.index(b"<url><loc> https"))
+        urls = [url for url, _ in reader.read(["https://example.com/sitemap.xml"])]
+        self.assertEqual(urls, ["https://example.com/old"])
+
+    def test_reader_entry_budget(self):
+        """Test that reading stops at the entry budget, skipping the sitemaps left."""
+        fetched = []
+
+        def fetch(url):
+            fetched.append(url)
+            return chunked(URLSET.encode("utf-8"))
+
+        reader = SitemapReader(fetch, max_entries=2)
+        urls = [url for url, _ in reader.read(["https://example.com/a.xml", "https://example.com/b.xml"])]
+        self.assertEqual(urls, ["https://example.com/old", "https://example.com/new"])
+        self.assertEqual(fetched, ["https://example.com/a.xml"])
+
+    def test_reader_reads_recent_sitemaps_first(self):
+        """Test that the sitemaps of an index are read most recently modified first."""
+        index = """<sitemapindex>
+          <sitemap><loc>https://example.com/2022.xml</loc><lastmod>2022-01-01</lastmod></sitemap>
+          <sitemap><loc>https://example.com/undated.xml</loc></sitemap>
+          <sitemap><loc>https://example.com/2024.xml</loc><lastmod>2024-01-01</lastmod></sitemap>
+        </sitemapindex>"""
+        fetched = []
+
+        def fetch(url):
+            fetched.append(url)
+            return [index.encode("utf-8")] if url.endswith("index.xml") else None
+
+        list(SitemapReader(fetch).read(["https://example.com/index.xml"]))
+        self.assertEqual(fetched, [
+            "https://example.com/index.xml", "https://example.com/2024.xml",
+            "https://example.com/2022.xml", "https://example.com/undated.xml"
+        ])
+
+    def test_select_recent(self):
+        """Test that the most recently modified entries come first."""
+        entries = [("a", 1.0), ("b", None), ("c", 3.0), ("d", 2.0), ("e", 3.0)]
+        self.assertEqual(select_recent(entries, 3), [("c", 3.0), ("e", 3.0), ("d", 2.0)])
+        self.assertEqual([url for url, _ in select_recent(entries, 10)], ["c", "e", "d", "a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,17 @@
 import os
 import sys
+import tempfile
 import unittest
 import json
 import gzip
 from unittest.mock import patch, MagicMock, ANY
 from datetime import datetime
-from io import BytesIO
 from botocore.exceptions import ClientError
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from src.storage.local_storage import LocalStorage
 from src.storage.s3_storage import S3Storage
 
 
@@ -125,6 +126,53 @@ class TestS3Storage(unittest.TestCase):
                 ContentEncoding='gzip'
             )
     
+    @patch("boto3.client")
+    def test_stream_processed_text_data_resumes_upload(self, mock_boto3_client):
+        """Test continuing a multipart upload saved in a checkpoint."""
+        mock_client = MagicMock()
+        mock_client.upload_part.return_value = {"ETag": "e2"}
+        mock_boto3_client.return_value = mock_client
+        upload_state = {
+            "key": "text_processed/test/test_text.json.gz",
+            "upload_id": "upload-1",
+            "parts": [{"PartNumber": 1, "ETag": "e1"}],
+            "buffer": ['{"url": "a"}']
+        }
+        
+        s3_storage = S3Storage()
+        key = s3_storage.stream_processed_text_data("test", iter([{"url": "b"}]), upload_state=upload_state)
+        
+        self.assertEqual(key, "text_processed/test/test_text.json.gz")
+        mock_client.create_multipart_upload.assert_not_called()
+        part_args = mock_client.upload_part.call_args[1]
+        self.assertEqual((part_args["PartNumber"], part_args["UploadId"]), (2, "upload-1"))
+        self.assertEqual(json.loads(gzip.decompress(part_args["Body"])), [{"url": "a"}, {"url": "b"}])
+        mock_client.complete_multipart_upload.assert_called_once_with(
+            Bucket=s3_storage.bucket_name,
+            Key=key,
+            UploadId="upload-1",
+            MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": "e1"}, {"PartNumber": 2, "ETag": "e2"}]}
+        )
+        self.assertTrue(upload_state["completed"])
+    
+    @patch("boto3.client")
+    def test_check_multipart_upload(self, mock_boto3_client):
+        """Test checking whether a saved multipart upload can be continued."""
+        mock_client = MagicMock()
+        mock_client.get_paginator.return_value.paginate.return_value = [
+            {"Parts": [{"PartNumber": 1, "ETag": "e1"}]}
+        ]
+        mock_boto3_client.return_value = mock_client
+        upload_state = {"key": "k", "upload_id": "upload-1", "parts": [{"PartNumber": 1, "ETag": "e1"}]}
+        
+        s3_storage = S3Storage()
+        
+        self.assertTrue(s3_storage.check_multipart_upload(upload_state))
+        mock_client.get_paginator.return_value.paginate.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchUpload", "Message": "gone"}}, "ListParts"
+        )
+        self.assertFalse(s3_storage.check_multipart_upload(upload_state))
+    
     @patch("boto3.client")
     def test_check_file_exists_true(self, mock_boto3_client):
         """Test checking if a file exists (file exists)."""
@@ -276,5 +324,50 @@ class TestS3Storage(unittest.TestCase):
             self.fail(f"S3 connection test failed: {str(e)}")
 
 
+
+class TestLocalStorage(unittest.TestCase):
+    """Tests for the LocalStorage class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.storage = LocalStorage(self.tmp_dir.name)
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+    
+    def test_stream_processed_text_data_resumes(self):
+        """Test that a resumed stream drops the lines written after the checkpoint."""
+        upload_state = {}
+        
+        def interrupted():
+            yield {"url": "a"}
+            checkpoint.update(upload_state)
+            yield {"url": "b"}
+            raise RuntimeError("crash")
+        
+        checkpoint = {}
+        with self.assertRaises(RuntimeError):
+            self.storage.stream_processed_text_data("site", interrupted(), upload_state=upload_state)
+        
+        self.assertTrue(self.storage.check_multipart_upload(checkpoint))
+        path = self.storage.stream_processed_text_data("site", iter([{"url": "c"}]), upload_state=checkpoint)
+        
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line)["url"] for line in f], ["a", "c"])
+        self.assertTrue(checkpoint["completed"])
+    
+    def test_store_processed_data(self):
+        """Test storing processed data as a JSON file."""
+        path = self.storage.store_processed_data("site", {"pages": 2}, filename="site_summary.json")
+        
+        self.assertEqual(path, os.path.join(self.tmp_dir.name, "site", "site_summary.json"))
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"pages": 2})
+        with self.assertRaises(ValueError):
+            self.storage.store_processed_data("site", {"pages": 2}, format="parquet")
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,120 @@
+import gzip
+import os
+import socket
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers import transport
+from src.crawlers.transport import HttpxTransport, RequestsTransport, create_transport, get_wire_bytes
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler that keeps connections open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = f"<html>{self.path}</html>".encode() * 100
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        if self.path.startswith("/compressed"):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransports(unittest.TestCase):
+    """Tests for the pooled transports."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a local keep-alive server."""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.host = f"127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _check_reuse(self, client):
+        """Send sequential requests and check that one connection served them all."""
+        for i in range(3):
+            response = client.get(f"http://{self.host}/page{i}", stream=True)
+            body = b"".join(response.iter_content(chunk_size=256))
+            response.close()
+            self.assertEqual(body, f"<html>/page{i}</html>".encode() * 100)
+
+        stats = client.get_stats([self.host])[self.host]
+        client.close()
+
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["new_connections"], 1)
+        self.assertAlmostEqual(stats["reuse_rate"], 2 / 3)
+
+    def test_requests_transport_reuses_connections(self):
+        """Test that the requests transport keeps connections alive."""
+        self._check_reuse(RequestsTransport(pool_size=2))
+
+    @unittest.skipIf(transport.httpx is None, "httpx is not installed")
+    def test_httpx_transport_reuses_connections(self):
+        """Test that the httpx transport adapts streamed responses and keeps connections alive."""
+        self._check_reuse(HttpxTransport(pool_size=2, http2=False))
+
+    @unittest.skipIf(transport.httpx is None, "httpx is not installed")
+    def test_httpx_errors_are_requests_errors(self):
+        """Test that httpx errors surface as requests exceptions."""
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        client = HttpxTransport(pool_size=1, http2=False)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.get(f"http://127.0.0.1:{port}/")
+        client.close()
+
+    def _check_wire_bytes(self, client):
+        """Fetch a gzip-encoded page and compare wire and decoded sizes."""
+        response = client.get(f"http://{self.host}/compressed", stream=True)
+        body = b"".join(response.iter_content(chunk_size=256))
+        wire_bytes = get_wire_bytes(response)
+        response.close()
+        client.close()
+
+        self.assertIn("gzip", client.accept_encoding)
+        self.assertEqual(body, b"<html>/compressed</html>" * 100)
+        self.assertEqual(wire_bytes, len(gzip.compress(body)))
+
+    def test_requests_transport_wire_bytes(self):
+        """Test that compressed bytes are measured before decoding."""
+        self._check_wire_bytes(RequestsTransport(pool_size=1))
+
+    @unittest.skipIf(transport.httpx is None, "httpx is not installed")
+    def test_httpx_transport_wire_bytes(self):
+        """Test that the httpx transport reports compressed bytes before decoding."""
+        self._check_wire_bytes(HttpxTransport(pool_size=1, http2=False))
+
+    def test_unknown_transport(self):
+        """Test that unknown transport names are rejected."""
+        with self.assertRaises(ValueError):
+            create_transport("carrier-pigeon")
+
+
+if __name__ == "__main__":
+    unittest.main()
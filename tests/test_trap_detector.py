@@ -0,0 +1,88 @@
+import os
+import random
+import string
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.trap_detector import TrapDetector, get_url_space, simhash
+
+
+def random_text(seed, words=300):
+    """Build a text of random letter-only words."""
+    rng = random.Random(seed)
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=8)) for _ in range(words))
+
+
+class TestTrapDetector(unittest.TestCase):
+    """Tests for the TrapDetector class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.detector = TrapDetector({"max_path_depth": 4, "max_query_variants": 3, "min_siblings": 3})
+
+    def test_simhash(self):
+        """Test that near-identical texts get close fingerprints."""
+        base = random_text(0)
+        near = bin(simhash(base + " May") ^ simhash(base + " June")).count("1")
+        far = bin(simhash(base) ^ simhash(random_text(1))).count("1")
+        self.assertLessEqual(near, 3)
+        self.assertGreater(far, 10)
+        # Numbers are generalized
+        self.assertEqual(simhash(base + " 2024/05"), simhash(base + " 2025/11"))
+
+    def test_get_url_space(self):
+        """Test that sibling URLs share a URL space."""
+        self.assertEqual(get_url_space("https://example.com/calendar/2024/05"),
+                         get_url_space("https://example.com/calendar/2025/01"))
+        self.assertEqual(get_url_space("https://example.com/search?q=a&page=2"),
+                         get_url_space("https://example.com/search?page=9&q=b"))
+        self.assertNotEqual(get_url_space("https://example.com/search?q=a"),
+                            get_url_space("https://example.com/search?q=a&sort=new"))
+
+    def test_path_signals(self):
+        """Test pruning of deep paths and repeated segments."""
+        self.assertIsNone(self.detector.check("https://example.com/a/b/c/d"))
+        self.assertTrue(self.detector.check("https://example.com/a/b/c/d/e").startswith("path depth"))
+        self.assertTrue(self.detector.check("https://example.com/x/x/x").startswith("repeated segments"))
+        self.assertTrue(self.detector.check("https://example.com/a/b/a/b").startswith("repeated segments"))
+        self.assertEqual(self.detector.get_stats()["pruned"], {"path depth": 1, "repeated segments": 2})
+
+    def test_query_variants(self):
+        """Test that each path gets a limited number of query strings."""
+        for i in range(3):
+            self.assertIsNone(self.detector.check(f"https://example.com/search?page={i}"))
+        self.assertIsNone(self.detector.check("https://example.com/search?page=0"))
+        self.assertTrue(self.detector.check("https://example.com/search?page=3").startswith("query variants"))
+        self.assertIsNone(self.detector.check("https://example.com/other?page=3"))
+
+    def test_near_duplicate_siblings(self):
+        """Test that a URL space of near-identical pages is pruned."""
+        text = random_text(0)
+        self.assertIsNone(self.detector.record_page("https://example.com/cal/2024/01", text + " January"))
+        self.assertIsNone(self.detector.record_page("https://example.com/cal/2024/02", text + " February"))
+        self.assertIsNone(self.detector.record_page("https://example.com/cal/2024/03", text + " March"))
+        # The first page had nothing to match; the last three pages all did
+        self.assertEqual(self.detector.record_page("https://example.com/cal/2024/04", None), "example.com/cal/0/")
+
+        self.assertTrue(self.detector.check("https://example.com/cal/2031/07").startswith("near-duplicate"))
+        self.assertIsNotNone(self.detector.check_queued("https://example.com/cal/1999/12"))
+        self.assertIsNone(self.detector.check_queued("https://example.com/about"))
+
+    def test_distinct_siblings(self):
+        """Test that sibling pages with different content are not pruned."""
+        for i in range(10):
+            text = random_text(i, 200)
+            self.assertIsNone(self.detector.record_page(f"https://example.com/news/{i}", text))
+        self.assertEqual(self.detector.get_stats()["trapped_spaces"], [])
+
+    def test_disabled(self):
+        """Test that a disabled detector prunes nothing."""
+        detector = TrapDetector({"enabled": False})
+        self.assertIsNone(detector.check("https://example.com/x/x/x/x/x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.frontier import Frontier
+from src.crawlers.url_set import BloomURLSet, get_url_set_stats
+
+
+class TestBloomURLSet(unittest.TestCase):
+    """Tests for the BloomURLSet class."""
+
+    def test_no_false_negatives(self):
+        """Test that every added URL is reported as present."""
+        urls = BloomURLSet(capacity=1000, false_positive_rate=0.01)
+        added = [f"https://example.com/page/{i}" for i in range(1000)]
+        urls.update(added)
+        urls.add(added[0])
+
+        # A new URL that collides with earlier ones is counted as already present
+        self.assertGreater(len(urls), 990)
+        self.assertLessEqual(len(urls), 1000)
+        self.assertTrue(all(url in urls for url in added))
+
+    def test_false_positive_rate_within_target(self):
+        """Test that the measured and estimated false positive rates stay near the target."""
+        urls = BloomURLSet(capacity=5000, false_positive_rate=0.01)
+        urls.update(f"https://example.com/page/{i}" for i in range(5000))
+
+        self.assertLess(urls.measure_false_positive_rate(samples=20000), 0.02)
+        self.assertLess(urls.estimated_false_positive_rate(), 0.02)
+
+    def test_grows_beyond_capacity(self):
+        """Test that adding more URLs than the capacity adds filters without raising the rate."""
+        urls = BloomURLSet(capacity=500, false_positive_rate=0.01)
+        urls.update(f"https://example.com/page/{i}" for i in range(3000))
+        stats = urls.get_stats()
+
+        self.assertGreater(stats["filters"], 1)
+        self.assertGreaterEqual(stats["capacity"], 3000)
+        self.assertLess(stats["measured_false_positive_rate"], 0.02)
+
+    def test_invalid_false_positive_rate(self):
+        """Test that false positive rates outside (0, 1) are rejected."""
+        with self.assertRaises(ValueError):
+            BloomURLSet(capacity=10, false_positive_rate=1.5)
+
+    def test_memory_is_compact(self):
+        """Test that a Bloom set uses far less memory per URL than a Python set."""
+        added = [f"https://example.com/articles/2024/some-article-slug-{i}" for i in range(10000)]
+        exact = get_url_set_stats(set(added))
+        bloom = BloomURLSet(capacity=10000, false_positive_rate=0.001)
+        bloom.update(added)
+        compact = get_url_set_stats(bloom)
+
+        self.assertEqual(exact["mode"], "exact")
+        self.assertEqual(compact["mode"], "bloom")
+        self.assertLess(compact["bytes_per_million_urls"] * 20, exact["bytes_per_million_urls"])
+
+    def test_frontier_with_bloom_seen_set(self):
+        """Test that the frontier accepts a Bloom filter as its seen-set."""
+        frontier = Frontier("bfs", seen=BloomURLSet(capacity=100))
+
+        self.assertTrue(frontier.push("https://a.com/1"))
+        self.assertFalse(frontier.push("https://a.com/1"))
+        self.assertIn("https://a.com/1", frontier)
+        self.assertEqual(frontier.pop(), "https://a.com/1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.url_templates import URLTemplates, compile_template
+
+
+def admitted(templates):
+    """Map each template to its admitted URLs."""
+    return {entry["template"]: entry["admitted"] for entry in templates.get_stats()["largest"]}
+
+
+class TestURLTemplates(unittest.TestCase):
+    """Tests for the URLTemplates class."""
+
+    def test_compile_template(self):
+        """Test matching of configured templates."""
+        self.assertTrue(compile_template("/news/<slug>").match("/news/hello-world"))
+        self.assertFalse(compile_template("/news/<slug>").match("/news/2024/hello"))
+        self.assertTrue(compile_template("/wiki/Special:*").match("/wiki/Special:Random/x"))
+
+    def test_learns_templates(self):
+        """Test that many leaf values of a path position become a variable."""
+        templates = URLTemplates(min_variants=5)
+        urls = ["https://example.com/", "https://example.com/news/", "https://example.com/about"]
+        urls += [f"https://example.com/news/story-{i}" for i in range(20)]
+        urls += [f"https://example.com/item/{i}" for i in range(20)]
+        urls += ["https://example.com/search?q=a", "https://example.com/search?q=b&page=2"]
+        for url in urls:
+            self.assertIsNone(templates.admit(url))
+
+        self.assertEqual(admitted(templates), {
+            "/news/<slug>": 20, "/item/<id>": 20, "/": 1, "/news/": 1, "/about": 1,
+            "/search?q": 1, "/search?page&q": 1
+        })
+
+    def test_budgets_and_sampling(self):
+        """Test per-template budgets, shares and sampling rates."""
+        templates = URLTemplates(
+            {"/tag/<tag>": {"sample_rate": 0.2}, "/wiki/Special:*": {"budget": 0}},
+            default={"share": 0.1}, page_limit=100, min_variants=5
+        )
+        results = [templates.admit(f"https://example.com/news/story-{i}") for i in range(50)]
+        self.assertEqual(results.count(None), 10)
+        self.assertIn("budget of 10 pages", results[-1])
+
+        tags = [templates.admit(f"https://example.com/tag/t{i}") for i in range(1000)]
+        self.assertAlmostEqual(tags.count(None) / 1000, 0.2, delta=0.05)
+        # The sample is the same every time
+        self.assertEqual(templates.admit("https://example.com/tag/t0") is None, tags[0] is None)
+
+        self.assertIsNotNone(templates.admit("https://example.com/wiki/Special:Random"))
+
+    def test_state(self):
+        """Test that learned templates and counts survive a checkpoint."""
+        templates = URLTemplates(default={"budget": 8}, min_variants=5)
+        for i in range(6):
+            templates.admit(f"https://example.com/news/story-{i}")
+
+        restored = URLTemplates(default={"budget": 8}, min_variants=5)
+        restored.load_state(json.loads(json.dumps(templates.get_state())))
+        results = [restored.admit(f"https://example.com/news/other-{i}") for i in range(5)]
+        self.assertEqual(results.count(None), 2)
+        self.assertEqual(admitted(restored), {"/news/<slug>": 8})
+
+
+if __name__ == "__main__":
+    unittest.main()
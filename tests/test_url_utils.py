@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.url_utils import URLCanonicalizer, get_host
+
+
+class TestURLCanonicalizer(unittest.TestCase):
+    """Tests for the URLCanonicalizer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.canonicalizer = URLCanonicalizer()
+
+    def test_variants_share_canonical_form(self):
+        """Test that common duplicate variants map to one URL."""
+        variants = [
+            "https://example.com/news/story",
+            "HTTPS://Example.COM:443/news/story",
+            "https://example.com/news/story/",
+            "https://example.com/news/story#comments",
+            "https://example.com/news/story?utm_source=twitter&utm_medium=social",
+            "https://example.com/news/./archive/../story",
+            "https://example.com/news/story;jsessionid=A1B2?PHPSESSID=xyz",
+            "https://example.com/news/st%6Fry"
+        ]
+
+        canonical = {self.canonicalizer.canonicalize(url) for url in variants}
+
+        self.assertEqual(canonical, {"https://example.com/news/story"})
+
+    def test_query_is_sorted_and_kept(self):
+        """Test that meaningful query parameters are kept in a stable order."""
+        self.assertEqual(
+            self.canonicalizer.canonicalize("https://example.com/search?q=a%2fb&page=2&gclid=1"),
+            "https://example.com/search?page=2&q=a%2Fb"
+        )
+
+    def test_root_and_index_files(self):
+        """Test that the root path and index files collapse to a directory."""
+        self.assertEqual(self.canonicalizer.canonicalize("http://example.com"), "http://example.com/")
+        self.assertEqual(self.canonicalizer.canonicalize("http://example.com:8080/index.html"),
+                         "http://example.com:8080/")
+        self.assertEqual(self.canonicalizer.canonicalize("http://example.com/news/index.php"),
+                         "http://example.com/news")
+
+    def test_site_rules(self):
+        """Test that per-site rules override the defaults."""
+        canonicalizer = URLCanonicalizer({
+            "trailing_slash": "add",
+            "lowercase_path": True,
+            "drop_query_params": ["ref"],
+            "sort_query": False
+        })
+
+        self.assertEqual(canonicalizer.canonicalize("https://example.com/News/Story?z=1&ref=home&utm_source=x"),
+                         "https://example.com/news/story/?z=1&utm_source=x")
+        self.assertEqual(canonicalizer.canonicalize("https://example.com/report.PDF"),
+                         "https://example.com/report.pdf")
+
+    def test_unknown_trailing_slash_rule(self):
+        """Test that unknown trailing slash rules are rejected."""
+        with self.assertRaises(ValueError):
+            URLCanonicalizer({"trailing_slash": "sometimes"})
+
+    def test_non_http_urls_unchanged(self):
+        """Test that non-HTTP URLs are returned unchanged."""
+        self.assertEqual(self.canonicalizer.canonicalize("mailto:desk@example.com"), "mailto:desk@example.com")
+
+    def test_get_host(self):
+        """Test that hosts are lowercased with their port."""
+        self.assertEqual(get_host("https://Example.com:8443/a"), "example.com:8443")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from email.utils import formatdate
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.validator_cache import ValidatorStore, get_freshness_lifetime
+
+
+class TestFreshnessLifetime(unittest.TestCase):
+    """Tests for get_freshness_lifetime."""
+
+    def test_max_age(self):
+        """Test that Cache-Control max-age is used."""
+        self.assertEqual(get_freshness_lifetime({"Cache-Control": "public, max-age=600"}), 600)
+
+    def test_no_cache(self):
+        """Test that no-cache responses must always be revalidated."""
+        self.assertEqual(get_freshness_lifetime({"Cache-Control": "no-cache", "Expires": "x"}), 0)
+
+    def test_expires(self):
+        """Test that Expires is measured from the Date header."""
+        now = time.time()
+        headers = {"Date": formatdate(now, usegmt=True), "Expires": formatdate(now + 120, usegmt=True)}
+
+        self.assertAlmostEqual(get_freshness_lifetime(headers), 120, delta=1)
+
+    def test_last_modified_heuristic(self):
+        """Test the 10% of age heuristic for pages with only Last-Modified."""
+        now = time.time()
+        headers = {"Date": formatdate(now, usegmt=True), "Last-Modified": formatdate(now - 1000, usegmt=True)}
+
+        self.assertAlmostEqual(get_freshness_lifetime(headers), 100, delta=1)
+
+    def test_no_headers(self):
+        """Test that responses without caching headers are not reused."""
+        self.assertEqual(get_freshness_lifetime({}), 0)
+
+
+class TestValidatorStore(unittest.TestCase):
+    """Tests for the ValidatorStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = ValidatorStore(os.path.join(self.tmp_dir.name, "validators.db"))
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_update_and_get(self):
+        """Test storing and reading validators."""
+        headers = {"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT", "Cache-Control": "no-cache"}
+        self.store.update("hash1", "https://example.com", headers, "content", ["https://example.com/a"])
+
+        entry = self.store.get("hash1")
+
+        self.assertEqual(entry["etag"], '"abc"')
+        self.assertEqual(entry["content_hash"], "content")
+        self.assertEqual(entry["links"], ["https://example.com/a"])
+        self.assertFalse(self.store.is_fresh(entry))
+        self.assertEqual(self.store.get_conditional_headers(entry), {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"
+        })
+
+    def test_refresh_extends_lifetime(self):
+        """Test that a 304 response extends the entry's freshness."""
+        self.store.update("hash1", "https://example.com", {"ETag": '"abc"'})
+
+        self.store.refresh("hash1", {"Cache-Control": "max-age=60"})
+
+        self.assertTrue(self.store.is_fresh(self.store.get("hash1")))
+
+    def test_persistence(self):
+        """Test that validators survive reopening the store."""
+        self.store.update("hash1", "https://example.com", {"ETag": '"abc"'})
+        self.store.close()
+
+        self.store = ValidatorStore(os.path.join(self.tmp_dir.name, "validators.db"))
+
+        self.assertEqual(self.store.get("hash1")["etag"], '"abc"')
+        self.assertIsNone(self.store.get("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crawlers.warc import TeeStream, WarcArchive, WarcWriter, build_response
+
+
+class TestWarc(unittest.TestCase):
+    """Tests for WarcWriter and WarcArchive."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "test.warc.gz")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that recorded responses are read back unchanged."""
+        writer = WarcWriter(self.path)
+        writer.write_exchange("https://example.com/a", [("User-Agent", "test")], 200, "OK",
+                              [("Content-Type", "text/html")], b"<p>caf\xc3\xa9</p>")
+        writer.write_exchange("https://example.com/b", [], 404, "Not Found", [], b"")
+
+        archive = WarcArchive(self.tmp_dir.name)
+
+        self.assertEqual(len(archive), 2)
+        self.assertEqual(archive.get_response("https://example.com/a"),
+                         (200, "OK", [("Content-Type", "text/html")], b"<p>caf\xc3\xa9</p>"))
+        self.assertEqual(archive.get_response("https://example.com/b")[0], 404)
+        self.assertIsNone(archive.get_response("https://example.com/missing"))
+
+    def test_standard_gzip_warc(self):
+        """Test that the archive is a valid multi-member gzip WARC file."""
+        writer = WarcWriter(self.path)
+        writer.write_exchange("https://example.com/", [], 200, "OK", [], b"body")
+
+        with gzip.open(self.path, "rb") as f:
+            content = f.read()
+
+        self.assertTrue(content.startswith(b"WARC/1.1\r\nWARC-Type: warcinfo"))
+        self.assertIn(b"WARC-Type: response", content)
+        self.assertIn(b"WARC-Type: request", content)
+        self.assertIn(b"GET / HTTP/1.1", content)
+
+    def test_latest_recording_wins(self):
+        """Test that later archives override earlier recordings of a URL."""
+        WarcWriter(os.path.join(self.tmp_dir.name, "a.warc.gz")).write_exchange(
+            "https://example.com/", [], 200, "OK", [], b"old")
+        WarcWriter(os.path.join(self.tmp_dir.name, "b.warc.gz")).write_exchange(
+            "https://example.com/", [], 200, "OK", [], b"new")
+
+        self.assertEqual(WarcArchive(self.tmp_dir.name).get_response("https://example.com/")[3], b"new")
+
+    def test_write_body_from_file(self):
+        """Test that a body spooled by a TeeStream is archived from its file."""
+        writer = WarcWriter(self.path)
+
+        def write_exchange(body, complete):
+            writer.write_exchange("https://example.com/big.xml", [], 200, "OK", [], body, not complete)
+
+        chunks = [b"x" * 1000] * 100
+        response = build_response("https://example.com/big.xml", 200, "OK", [],
+                                  TeeStream(iter(chunks), write_exchange))
+        self.assertEqual(sum(len(chunk) for chunk in response.iter_content(chunk_size=4096)), 100000)
+        response.close()
+
+        self.assertEqual(WarcArchive(self.tmp_dir.name).get_response("https://example.com/big.xml")[3],
+                         b"".join(chunks))
+
+    def test_build_response(self):
+        """Test that built responses stream their body from memory."""
+        response = build_response("https://example.com/", 200, "OK",
+                                  [("Content-Type", "text/html")], b"abcdef")
+
+        self.assertEqual(b"".join(response.iter_content(chunk_size=4)), b"abcdef")
+        self.assertEqual(response.headers["content-type"], "text/html")
+        response.close()
+
+
+if __name__ == "__main__":
+    unittest.main()